@@ -0,0 +1,272 @@
+"""Result cache for the query API.
+
+Keys are the normalized SQL, its parameters and options, and the database
+generation number that ``scripts/seed_data.py`` bumps after every load. A new
+generation drops all older entries, so results from before a reseed are never
+served after it.
+
+Two tiers:
+- memory: an LRU of encoded JSON responses, bounded in bytes
+- disk (optional, ``QUERY_CACHE_DIR``): streamed results as Arrow IPC files,
+  re-encoded to the requested format on a hit
+
+The disk tier is shared by every worker process, so the directory itself is
+its index: lookups stat the file, hits bump its access time, and the byte
+limit is enforced over everything in the directory, least recently used
+first. Another worker may delete a file at any moment; that is a miss.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator
+
+import pyarrow as pa
+
+import metrics
+from database import GENERATION_PATH
+
+CACHE_MAX_BYTES = int(os.getenv("QUERY_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+CACHE_TTL = float(os.getenv("QUERY_CACHE_TTL_SECONDS", "3600"))  # 0 = until the next reseed
+CACHE_DIR = os.getenv("QUERY_CACHE_DIR")
+CACHE_DISK_MAX_BYTES = int(os.getenv("QUERY_CACHE_DISK_MAX_BYTES", str(1024 * 1024 * 1024)))
+
+# Quoted strings/identifiers are kept verbatim; whitespace and comments elsewhere are collapsed
+_SQL_TOKENS = re.compile(r"""('(?:[^']|'')*'|"(?:[^"]|"")*")|(--[^\n]*|/\*.*?\*/)|(\s+)""", re.S)
+
+
+def normalize_sql(sql: str) -> str:
+    def replace(match):
+        quoted, comment, space = match.groups()
+        return quoted if quoted else " "
+    return re.sub(r"\s+", " ", _SQL_TOKENS.sub(replace, sql)).strip().rstrip(";").strip()
+
+
+def make_key(kind: str, sql: str, params=None, **options) -> str:
+    payload = json.dumps([kind, normalize_sql(sql), params, options], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+@dataclass
+class Entry:
+    value: bytes
+    size: int
+    expires: float | None
+
+
+class ResultCache:
+    """Byte-bounded LRU of encoded results plus an optional Arrow IPC disk tier."""
+
+    def __init__(self, max_bytes: int, ttl: float, generation_path: str,
+                 disk_dir: str | None = None, disk_max_bytes: int = 0):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.generation_path = generation_path
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self.disk_max_bytes = disk_max_bytes
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, Entry] = OrderedDict()
+        self._bytes = 0
+        self._generation = 0
+        self._generation_mtime = None
+        self.counters = dict.fromkeys(
+            ["hits", "misses", "disk_hits", "disk_misses", "evictions", "disk_evictions",
+             "expirations", "invalidations", "oversize"], 0)
+        if self.disk_dir:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+
+    def generation(self) -> int:
+        """Current database generation; a change drops every cached entry."""
+        try:
+            mtime = os.stat(self.generation_path).st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        if mtime != self._generation_mtime:
+            try:
+                with open(self.generation_path) as f:
+                    generation = int(f.read().strip() or 0)
+            except (FileNotFoundError, ValueError):
+                generation = 0
+            with self._lock:
+                if generation != self._generation:
+                    self._invalidate(generation)
+                self._generation_mtime = mtime
+        return self._generation
+
+    def _invalidate(self, generation: int):
+        self._generation = generation
+        self._entries.clear()
+        self._bytes = 0
+        self.counters["invalidations"] += 1
+        prefix = f"{generation}-"
+        for name, _ in self._disk_files():
+            if not name.startswith(prefix):
+                (self.disk_dir / name).unlink(missing_ok=True)
+
+    # -- memory tier ---------------------------------------------------------
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires is not None and entry.expires < time.monotonic():
+                self._remove(key)
+                self.counters["expirations"] += 1
+                entry = None
+            if entry is None:
+                self.counters["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.counters["hits"] += 1
+            return entry.value
+
+    def put(self, key: str, value: bytes, generation: int):
+        """Store ``value`` if it was computed under the current generation."""
+        size = len(value)
+        with self._lock:
+            if generation != self._generation:
+                return
+            if size > self.max_bytes // 4:
+                self.counters["oversize"] += 1
+                return
+            if key in self._entries:
+                self._remove(key)
+            expires = time.monotonic() + self.ttl if self.ttl else None
+            self._entries[key] = Entry(value, size, expires)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.counters["evictions"] += 1
+
+    def _remove(self, key: str):
+        self._bytes -= self._entries.pop(key).size
+
+    # -- disk tier -------------------------------------------------------------
+
+    def _file_name(self, key: str, generation: int) -> str:
+        return f"{generation}-{key}.arrow"
+
+    def open_stream(self, key: str, generation: int) -> tuple[pa.Schema, Iterator[pa.RecordBatch]] | None:
+        """Schema and batches of a cached streamed result, or None."""
+        if self.disk_dir is None:
+            return None
+        path = self.disk_dir / self._file_name(key, generation)
+        try:
+            st = path.stat()
+            reader = None
+            if not self.ttl or st.st_mtime + self.ttl > time.time():
+                # Recently used for eviction; the mtime (the TTL's start) stays
+                os.utime(path, ns=(time.time_ns(), st.st_mtime_ns))
+                reader = pa.ipc.open_file(pa.memory_map(str(path)))
+        except FileNotFoundError:  # never written, or evicted by another worker
+            reader = None
+        with self._lock:
+            self.counters["disk_misses" if reader is None else "disk_hits"] += 1
+        if reader is None:
+            return None
+        batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+        return reader.schema, batches
+
+    def tee(self, key: str, generation: int, schema: pa.Schema,
+            batches: Iterator[pa.RecordBatch]) -> Iterator[pa.RecordBatch]:
+        """Pass ``batches`` through, saving them to the disk tier if the stream completes."""
+        if self.disk_dir is None:
+            yield from batches
+            return
+        name = self._file_name(key, generation)
+        tmp = self.disk_dir / f".{name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        limit = self.disk_max_bytes // 4
+        writer = pa.ipc.new_file(str(tmp), schema)
+        complete = False
+        try:
+            for batch in batches:
+                if writer is not None:
+                    writer.write_batch(batch)
+                    if tmp.stat().st_size > limit:
+                        writer.close()
+                        writer = None
+                        with self._lock:
+                            self.counters["oversize"] += 1
+                yield batch
+            complete = writer is not None
+        finally:
+            if writer is not None:
+                writer.close()
+            if complete:
+                self._commit(tmp, name, generation)
+            else:
+                tmp.unlink(missing_ok=True)
+
+    def _commit(self, tmp: Path, name: str, generation: int):
+        with self._lock:
+            if generation != self._generation:
+                tmp.unlink(missing_ok=True)
+                return
+            os.replace(tmp, self.disk_dir / name)
+            # Other workers write here too: count the whole directory against the limit
+            files = self._disk_files()
+            total = sum(st.st_size for _, st in files)
+            for old, st in files:
+                if total <= self.disk_max_bytes:
+                    break
+                (self.disk_dir / old).unlink(missing_ok=True)
+                total -= st.st_size
+                self.counters["disk_evictions"] += 1
+
+    def _disk_files(self) -> list[tuple[str, os.stat_result]]:
+        """Cached files in the directory (from every worker), least recently used first."""
+        if self.disk_dir is None:
+            return []
+        files = []
+        for path in self.disk_dir.glob("*.arrow"):
+            try:
+                files.append((path.name, path.stat()))
+            except FileNotFoundError:  # deleted by another worker since the listing
+                continue
+        return sorted(files, key=lambda f: f[1].st_atime_ns)
+
+    def disk_bytes(self) -> int:
+        return sum(st.st_size for _, st in self._disk_files())
+
+    def stats(self) -> dict:
+        generation = self.generation()
+        files = self._disk_files()
+        with self._lock:
+            lookups = self.counters["hits"] + self.counters["misses"]
+            return {
+                "generation": generation,
+                "memory": {"entries": len(self._entries), "bytes": self._bytes, "max_bytes": self.max_bytes},
+                "disk": {
+                    "enabled": self.disk_dir is not None,
+                    "entries": len(files),
+                    "bytes": sum(st.st_size for _, st in files),
+                    "max_bytes": self.disk_max_bytes,
+                },
+                "ttl_seconds": self.ttl,
+                "hit_ratio": round(self.counters["hits"] / lookups, 4) if lookups else None,
+                **self.counters,
+            }
+
+
+cache = ResultCache(CACHE_MAX_BYTES, CACHE_TTL, GENERATION_PATH, CACHE_DIR, CACHE_DISK_MAX_BYTES)
+
+metrics.registry.add(metrics.Gauge(
+    "fissio_cache_events_total", "Result cache events (hits, misses, evictions...)",
+    lambda: {(name,): value for name, value in cache.counters.items()}, ("event",), kind="counter"))
+metrics.registry.add(metrics.Gauge(
+    "fissio_cache_hit_ratio", "Result cache hits / lookups since start, by tier",
+    lambda: {
+        (tier,): hits / (hits + misses) if hits + misses else None
+        for tier, hits, misses in (
+            ("memory", cache.counters["hits"], cache.counters["misses"]),
+            ("disk", cache.counters["disk_hits"], cache.counters["disk_misses"]),
+        )
+    }, ("tier",)))
+metrics.registry.add(metrics.Gauge(
+    "fissio_cache_bytes", "Result cache size in bytes, by tier",
+    lambda: {("memory",): cache._bytes, ("disk",): cache.disk_bytes()}, ("tier",)))
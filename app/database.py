@@ -0,0 +1,398 @@
+"""Read-only DuckDB access for the query API.
+
+One read-only database handle is opened lazily and shared by a fixed pool of
+cursors. Queries run on a bounded thread pool (one worker per cursor) so they
+never block the event loop, and are interrupted if they exceed the timeout.
+
+``stream`` holds its cursor until the response has been sent, yielding Arrow
+record batches as DuckDB produces them, so large exports never sit in memory.
+"""
+
+import asyncio
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Iterator
+
+import duckdb
+import pyarrow as pa
+
+import metrics
+from rollups import RollupRouter
+from search import SearchIndex
+
+DUCKDB_PATH = os.getenv("DUCKDB_PATH", "/data/fissio.duckdb")
+POOL_SIZE = int(os.getenv("DUCKDB_POOL_SIZE", "4"))
+DUCKDB_THREADS = int(os.getenv("DUCKDB_THREADS", "0"))  # 0 = DuckDB's default (all cores)
+QUERY_TIMEOUT = float(os.getenv("QUERY_TIMEOUT_SECONDS", "30"))
+MAX_ROWS = int(os.getenv("QUERY_MAX_ROWS", "10000"))
+STREAM_MAX_ROWS = int(os.getenv("STREAM_MAX_ROWS", "5000000"))
+STREAM_TIMEOUT = float(os.getenv("STREAM_TIMEOUT_SECONDS", "300"))
+STREAM_BATCH_ROWS = int(os.getenv("STREAM_BATCH_ROWS", "16384"))
+# Written by scripts/seed_data.py after every load that changed data
+GENERATION_PATH = os.getenv("DUCKDB_GENERATION_PATH", os.path.join(os.path.dirname(DUCKDB_PATH), "generation"))
+ROLLUP_ROUTING = os.getenv("QUERY_ROLLUP_ROUTING", "true").lower() == "true"
+
+
+class DatabaseUnavailable(Exception):
+    """The DuckDB file is missing or locked by a writer."""
+
+
+class QueryError(Exception):
+    """The query was rejected or failed."""
+
+
+class QueryTimeout(Exception):
+    """The query ran longer than the timeout and was interrupted."""
+
+
+@dataclass
+class QueryResult:
+    columns: list[dict]
+    rows: list[list]
+    truncated: bool
+    elapsed_ms: float
+    rollup: str | None = None
+
+
+@dataclass
+class QueryStream:
+    schema: pa.Schema
+    batches: Iterator[pa.RecordBatch]
+    close: Callable[[], None]  # releases the cursor; safe to call more than once
+    rollup: str | None = None
+
+
+@dataclass
+class Handle:
+    """One open database file and the cursors borrowed from it."""
+    target: str
+    root: duckdb.DuckDBPyConnection
+    cursors: queue.Queue
+    borrowed: int = 0
+    retired: bool = False
+
+
+class ConnectionPool:
+    """A shared read-only DuckDB handle with a fixed number of cursors.
+
+    ``path`` may be a symlink that ``scripts/seed_data.py`` swaps to a new
+    generation. The next ``acquire`` after a swap opens the new file; the old
+    handle is closed once its last borrowed cursor comes back, so in-flight
+    queries finish on the data they started with.
+    """
+
+    def __init__(self, path: str, size: int):
+        self.path = path
+        self.size = size
+        self._lock = threading.Lock()
+        self._handle: Handle | None = None
+        self._owners: dict[int, Handle] = {}
+        self.executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix="duckdb")
+        # Slow-query plans wait for a cursor here, never on a thread that serves requests
+        self.background = ThreadPoolExecutor(max_workers=1, thread_name_prefix="duckdb-explain")
+        self.in_use = 0
+        self.waiting = 0
+        self.files_opened = 0
+
+    def open(self):
+        """Open the file ``path`` points at, if it isn't open already (done lazily by ``acquire`` otherwise)."""
+        target = os.path.realpath(self.path)
+        if self._handle is not None and self._handle.target == target:
+            return
+        with self._lock:
+            if self._handle is not None and self._handle.target == target:
+                return
+            if not os.path.exists(target):
+                raise DatabaseUnavailable(f"{self.path} not found - run 'make seed'")
+            try:
+                config = {
+                    # API users may only read the seeded database, not the filesystem
+                    "enable_external_access": False,
+                    "lock_configuration": True,
+                }
+                if DUCKDB_THREADS:
+                    config["threads"] = DUCKDB_THREADS
+                # The resolved path: DuckDB caches open databases by path, and the link now means another file
+                root = duckdb.connect(target, read_only=True, config=config)
+            except duckdb.IOException as e:
+                raise DatabaseUnavailable(str(e))
+            handle = Handle(target, root, queue.Queue())
+            for _ in range(self.size):
+                handle.cursors.put(root.cursor())
+            previous, self._handle = self._handle, handle
+            self.files_opened += 1
+            if previous is not None:
+                self._retire(previous)
+
+    def _retire(self, handle: Handle):
+        handle.retired = True
+        while True:
+            try:
+                handle.cursors.get_nowait()
+            except queue.Empty:
+                break
+        # Wake callers blocked on the old queue so they retry on the new one
+        for _ in range(self.waiting + 1):
+            handle.cursors.put(None)
+        if handle.borrowed == 0:
+            handle.root.close()
+
+    def acquire(self) -> duckdb.DuckDBPyConnection:
+        try:
+            self.open()
+        except DatabaseUnavailable:
+            if self._handle is None:
+                raise  # otherwise keep serving the generation that is open
+        start = time.perf_counter()
+        with self._lock:
+            self.waiting += 1
+        try:
+            while True:
+                handle = self._handle
+                cur = handle.cursors.get()
+                with self._lock:
+                    if cur is not None and not handle.retired:
+                        handle.borrowed += 1
+                        self._owners[id(cur)] = handle
+                        self.in_use += 1
+                        break
+        finally:
+            with self._lock:
+                self.waiting -= 1
+        metrics.pool_wait.observe(time.perf_counter() - start)
+        return cur
+
+    def release(self, cur: duckdb.DuckDBPyConnection):
+        with self._lock:
+            self.in_use -= 1
+            handle = self._owners.pop(id(cur))
+            handle.borrowed -= 1
+            if not handle.retired:
+                handle.cursors.put(cur)
+            elif handle.borrowed == 0:
+                handle.root.close()  # closes its cursors and releases the old file
+
+    @contextmanager
+    def cursor(self):
+        """Borrow a cursor for the duration of one query."""
+        cur = self.acquire()
+        try:
+            yield cur
+        finally:
+            self.release(cur)
+
+    def close(self):
+        with self._lock:
+            if self._handle is not None:
+                self._retire(self._handle)
+                self._handle = None
+
+
+pool = ConnectionPool(DUCKDB_PATH, POOL_SIZE)
+router = RollupRouter(GENERATION_PATH)
+search_index = SearchIndex(GENERATION_PATH)
+
+metrics.registry.add(metrics.Gauge(
+    "fissio_duckdb_pool_cursors", "Pooled cursors by state",
+    lambda: {("in_use",): pool.in_use, ("idle",): max(0, pool.size - pool.in_use)}, ("state",)))
+metrics.registry.add(metrics.Gauge(
+    "fissio_duckdb_pool_waiting", "Callers waiting for a pooled cursor", lambda: pool.waiting))
+metrics.registry.add(metrics.Gauge(
+    "fissio_duckdb_files_opened_total", "Database files (generations) opened by the pool",
+    lambda: pool.files_opened, kind="counter"))
+
+
+async def run(fn: Callable[[duckdb.DuckDBPyConnection], Any], timeout: float | None = None) -> Any:
+    """Run ``fn(cursor)`` on the worker pool, interrupting it after ``timeout`` seconds."""
+    timeout = QUERY_TIMEOUT if timeout is None else timeout
+    active: list[duckdb.DuckDBPyConnection] = []
+    timed_out = threading.Event()
+
+    def work():
+        with pool.cursor() as cur:
+            if timed_out.is_set():  # gave up while waiting for the cursor
+                raise QueryTimeout(f"Query exceeded {timeout:g}s")
+            active.append(cur)
+            try:
+                return fn(cur)
+            finally:
+                active.clear()
+
+    future = asyncio.get_running_loop().run_in_executor(pool.executor, work)
+    try:
+        return await asyncio.wait_for(future, timeout)
+    except asyncio.TimeoutError:
+        # Cancelling the future drops work that hasn't started; the flag stops work waiting for a cursor
+        timed_out.set()
+        future.cancel()
+        for cur in active:
+            cur.interrupt()
+        raise QueryTimeout(f"Query exceeded {timeout:g}s")
+
+
+def check_read_only(sql: str):
+    """Allow exactly one SELECT-type statement."""
+    try:
+        statements = duckdb.extract_statements(sql)
+    except duckdb.Error as e:
+        raise QueryError(str(e))
+    if len(statements) != 1:
+        raise QueryError("Exactly one statement is allowed")
+    if statements[0].type != duckdb.StatementType.SELECT:
+        raise QueryError("Only SELECT queries are allowed")
+
+
+def route(cur: duckdb.DuckDBPyConnection, sql: str, params) -> tuple[str, str | None]:
+    """Rewrite ``sql`` against a rollup table if one can answer it."""
+    if not ROLLUP_ROUTING:
+        return sql, None
+    try:
+        routed = router.rewrite(cur, sql, params)
+    except duckdb.Error:
+        routed = None  # let the original query report its own error
+    return routed or (sql, None)
+
+
+def explain_slow(fingerprint: str, sql: str, params, seconds: float):
+    """Log ``EXPLAIN ANALYZE`` of a slow query, run on its own pooled cursor."""
+    def work():
+        with pool.cursor() as cur:
+            timer = threading.Timer(QUERY_TIMEOUT, cur.interrupt)
+            timer.start()
+            try:
+                rows = cur.execute(f"EXPLAIN ANALYZE {sql}", params).fetchall()
+                plan, error = "\n".join(row[-1] for row in rows), None
+            except duckdb.Error as e:
+                plan, error = None, str(e)
+            finally:
+                timer.cancel()
+        metrics.log_slow_query(fingerprint, sql, params, seconds, plan, error)
+
+    pool.background.submit(work)
+
+
+def observe(fingerprint: str, kind: str, sql: str, params, seconds: float):
+    """Record a finished query's latency, and log its plan if it was slow."""
+    metrics.query_latency.observe(seconds, fingerprint=fingerprint, kind=kind)
+    if metrics.is_slow(fingerprint, seconds):
+        explain_slow(fingerprint, sql, params, seconds)
+
+
+def execute(cur: duckdb.DuckDBPyConnection, sql: str, params: list | dict | None, limit: int) -> QueryResult:
+    """Execute ``sql`` and fetch at most ``limit`` rows (the result is streamed, not materialised)."""
+    start = time.perf_counter()
+    fingerprint = metrics.fingerprint(sql)
+    try:
+        sql, rollup = route(cur, sql, params)
+        cur.execute(sql, params)
+        rows = cur.fetchmany(limit + 1)
+    except duckdb.InterruptException:
+        metrics.query_errors.inc(fingerprint=fingerprint, error="timeout")
+        raise QueryTimeout("Query interrupted")
+    except duckdb.Error as e:
+        metrics.query_errors.inc(fingerprint=fingerprint, error=type(e).__name__)
+        raise QueryError(str(e))
+    observe(fingerprint, "query", sql, params, time.perf_counter() - start)
+    columns = [{"name": d[0], "type": str(d[1])} for d in cur.description]
+    return QueryResult(
+        columns=columns,
+        rows=[list(r) for r in rows[:limit]],
+        truncated=len(rows) > limit,
+        elapsed_ms=round((time.perf_counter() - start) * 1000, 2),
+        rollup=rollup,
+    )
+
+
+async def query(sql: str, params: list | dict | None = None, limit: int | None = None) -> QueryResult:
+    """Run a read-only query with the row limit and timeout applied."""
+    check_read_only(sql)
+    limit = MAX_ROWS if limit is None else max(0, min(limit, MAX_ROWS))
+    return await run(lambda cur: execute(cur, sql, params, limit))
+
+
+def _record_batches(cur: duckdb.DuckDBPyConnection, batch_rows: int) -> pa.RecordBatchReader:
+    if hasattr(cur, "to_arrow_reader"):
+        return cur.to_arrow_reader(batch_rows)
+    return cur.fetch_record_batch(batch_rows)  # duckdb < 1.4
+
+
+async def stream(sql: str, params: list | dict | None = None, limit: int | None = None) -> QueryStream:
+    """Start a read-only query and return its result as a stream of Arrow batches.
+
+    The cursor stays checked out until the batches are exhausted or the
+    iterator is closed; the whole stream (not just execution) is interrupted
+    after ``STREAM_TIMEOUT`` seconds.
+    """
+    check_read_only(sql)
+    limit = STREAM_MAX_ROWS if limit is None else max(0, min(limit, STREAM_MAX_ROWS))
+    fingerprint = metrics.fingerprint(sql)
+    state = {}  # cursor, timer and start time, once start() has a cursor
+    released = threading.Lock()
+
+    def finish():
+        if "cursor" in state and released.acquire(blocking=False):
+            state["timer"].cancel()
+            pool.release(state["cursor"])
+
+    def start():
+        # Acquire and execute in one task: a thread holding a cursor never waits behind
+        # threads that are blocked waiting for one
+        cur = pool.acquire()
+        timer = threading.Timer(STREAM_TIMEOUT, cur.interrupt)
+        timer.start()
+        state.update(cursor=cur, timer=timer, started=time.perf_counter())
+        routed, rollup = route(cur, sql, params)
+        cur.execute(routed, params)
+        return _record_batches(cur, STREAM_BATCH_ROWS), routed, rollup
+
+    task = pool.executor.submit(start)
+    try:
+        reader, routed, rollup = await asyncio.wrap_future(task)
+    except duckdb.InterruptException:
+        finish()
+        metrics.query_errors.inc(fingerprint=fingerprint, error="timeout")
+        raise QueryTimeout(f"Query exceeded {STREAM_TIMEOUT:g}s")
+    except duckdb.Error as e:
+        finish()
+        metrics.query_errors.inc(fingerprint=fingerprint, error=type(e).__name__)
+        raise QueryError(str(e))
+    except BaseException:
+        # Cancelled: the cursor goes back once start() is done with it (at once if it never ran)
+        task.add_done_callback(lambda _: finish())
+        raise
+
+    def batches() -> Iterator[pa.RecordBatch]:
+        remaining = limit
+        try:
+            for batch in reader:
+                if remaining <= 0:
+                    break
+                if batch.num_rows > remaining:
+                    batch = batch.slice(0, remaining)
+                remaining -= batch.num_rows
+                yield batch
+            # Only complete streams are timed: includes producing every batch, not sending it
+            observe(fingerprint, "stream", routed, params, time.perf_counter() - state["started"])
+        finally:
+            reader.close()
+            finish()
+
+    return QueryStream(schema=reader.schema, batches=batches(), close=finish, rollup=rollup)
+
+
+async def table_exists(schema: str, table: str) -> bool:
+    def lookup(cur):
+        return cur.execute("""
+            SELECT COUNT(*) FROM information_schema.tables
+            WHERE table_schema = ? AND table_name = ?
+        """, [schema, table]).fetchone()[0] > 0
+    return await run(lookup)
+
+
+def quote_identifier(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
@@ -0,0 +1,140 @@
+"""Streaming response encoders for query results.
+
+Each encoder turns an iterator of Arrow record batches into an iterator of
+bytes, one chunk per batch, so memory use and time-to-first-byte stay flat
+regardless of result size. Arrow IPC is written straight from DuckDB's
+record batches without converting rows to Python objects.
+"""
+
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Iterable, Iterator
+
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+
+MEDIA_TYPES = {
+    "json": "application/json",
+    "arrow": "application/vnd.apache.arrow.stream",
+    "parquet": "application/vnd.apache.parquet",
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+# Accept header values -> format
+ACCEPT = {media_type: name for name, media_type in MEDIA_TYPES.items()}
+ACCEPT.update({
+    "application/x-parquet": "parquet",
+    "application/jsonlines": "ndjson",
+    "application/json-seq": "ndjson",
+})
+
+FILE_EXTENSIONS = {"arrow": "arrows", "parquet": "parquet", "ndjson": "ndjson", "csv": "csv"}
+
+
+def negotiate(accept: str | None, requested: str | None = None) -> str | None:
+    """Pick a response format from ``?format=`` or the Accept header.
+
+    Returns None if nothing acceptable is supported; defaults to JSON.
+    """
+    if requested:
+        return requested if requested in MEDIA_TYPES else None
+    if not accept:
+        return "json"
+    ranges = []
+    for i, part in enumerate(accept.split(",")):
+        media_type, *params = [p.strip() for p in part.split(";")]
+        q = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        ranges.append((-q, i, media_type.lower()))
+    for neg_q, _, media_type in sorted(ranges):
+        if neg_q == 0:
+            break
+        if media_type in ACCEPT:
+            return ACCEPT[media_type]
+        if media_type in ("*/*", "application/*"):
+            return "json"
+    return None
+
+
+class _Drain:
+    """Write-only file object whose contents are taken after every batch."""
+
+    def __init__(self):
+        self.chunks: list[bytes] = []
+        self.closed = False
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def take(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, bytes):
+        return value.hex()
+    return str(value)
+
+
+def encode_arrow(schema: pa.Schema, batches: Iterable[pa.RecordBatch]) -> Iterator[bytes]:
+    sink = _Drain()
+    with pa.ipc.new_stream(sink, schema) as writer:
+        yield sink.take()
+        for batch in batches:
+            writer.write_batch(batch)
+            yield sink.take()
+    yield sink.take()
+
+
+def encode_parquet(schema: pa.Schema, batches: Iterable[pa.RecordBatch]) -> Iterator[bytes]:
+    sink = _Drain()
+    with pq.ParquetWriter(sink, schema, compression="zstd") as writer:
+        for batch in batches:
+            writer.write_batch(batch)  # one row group per batch
+            yield sink.take()
+    yield sink.take()
+
+
+def encode_csv(schema: pa.Schema, batches: Iterable[pa.RecordBatch]) -> Iterator[bytes]:
+    sink = _Drain()
+    with pa_csv.CSVWriter(sink, schema) as writer:
+        for batch in batches:
+            writer.write_batch(batch)
+            yield sink.take()
+    yield sink.take()
+
+
+def encode_ndjson(schema: pa.Schema, batches: Iterable[pa.RecordBatch]) -> Iterator[bytes]:
+    for batch in batches:
+        lines = [json.dumps(row, default=_json_default) for row in batch.to_pylist()]
+        if lines:
+            yield ("\n".join(lines) + "\n").encode()
+
+
+ENCODERS = {
+    "arrow": encode_arrow,
+    "parquet": encode_parquet,
+    "csv": encode_csv,
+    "ndjson": encode_ndjson,
+}
@@ -0,0 +1,95 @@
+"""Production server profile: gunicorn managing uvicorn workers.
+
+    gunicorn -c gunicorn.conf.py main:app
+
+Each worker is one uvicorn event loop (uvloop and httptools, from
+uvicorn[standard]). The app is imported once in the master before forking
+(``preload_app``), so the compressed pages, static assets and templates are
+shared copy-on-write between workers. DuckDB is the exception: a database
+handle and its threads don't survive ``fork()``, so each worker opens its own
+read-only handle right after it starts, before taking requests.
+
+Metrics are kept per worker and merged through ``METRICS_DIR`` (a temporary
+directory unless set): workers save their series there, ``/metrics`` sums
+them, and the master archives the series of workers that exit.
+
+``kill -HUP <master>`` replaces the workers gracefully (in-flight requests
+finish, then each new worker reopens the database); ``kill -TERM`` stops after
+``GRACEFUL_TIMEOUT`` seconds.
+
+Settings (environment):
+    WEB_CONCURRENCY      worker processes (default: CPU count)
+    PORT                 listen port (default 8080)
+    KEEPALIVE_SECONDS    idle keep-alive per connection (default 5)
+    TIMEOUT_SECONDS      restart a worker silent for this long (default 120)
+    GRACEFUL_TIMEOUT     seconds to finish in-flight requests on stop/reload (default 30)
+    MAX_REQUESTS         recycle a worker after this many requests, 0 = never (default 0)
+    BACKLOG              pending connections queue (default 2048)
+    DUCKDB_THREADS       DuckDB threads per worker (default: CPU count / workers)
+    METRICS_DIR          shared directory for worker metrics (default: a new temp dir)
+"""
+
+import os
+import tempfile
+
+cpus = os.cpu_count() or 1
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8080')}"
+workers = int(os.getenv("WEB_CONCURRENCY", str(cpus)))
+worker_class = "uvicorn_worker.UvicornWorker"
+preload_app = True
+
+keepalive = int(os.getenv("KEEPALIVE_SECONDS", "5"))
+timeout = int(os.getenv("TIMEOUT_SECONDS", "120"))
+graceful_timeout = int(os.getenv("GRACEFUL_TIMEOUT", "30"))
+max_requests = int(os.getenv("MAX_REQUESTS", "0"))
+max_requests_jitter = max_requests // 10
+backlog = int(os.getenv("BACKLOG", "2048"))
+
+accesslog = os.getenv("ACCESS_LOG")  # e.g. "-" for stdout; off by default
+errorlog = "-"
+forwarded_allow_ips = os.getenv("FORWARDED_ALLOW_IPS", "127.0.0.1")
+
+# Split the cores between workers instead of every handle starting one DuckDB thread per core.
+# Set before the app is imported, so database.py reads it.
+os.environ.setdefault("DUCKDB_THREADS", str(max(1, cpus // workers)))
+# Same for metrics.py: every worker saves its series here so /metrics covers all of them
+os.environ.setdefault("METRICS_DIR", tempfile.mkdtemp(prefix="fissio-metrics-"))
+
+
+def on_starting(server):
+    """Forget the metrics of a previous run sharing METRICS_DIR."""
+    import metrics
+
+    metrics.registry.clear()
+
+
+def post_worker_init(worker):
+    """Start saving this worker's metrics, then open its DuckDB handle and load the search index."""
+    import database
+    import metrics
+
+    metrics.registry.start_writer()
+
+    try:
+        database.pool.open()
+    except database.DatabaseUnavailable as e:
+        # Not seeded yet: queries return 503 until it is, and the pool retries on demand
+        worker.log.warning("DuckDB not opened in worker %s: %s", worker.pid, e)
+        return
+    with database.pool.cursor() as cur:
+        database.search_index.current(cur)
+
+
+def worker_exit(server, worker):
+    """Save the exiting worker's last metrics (runs in the worker)."""
+    import metrics
+
+    metrics.registry.write()
+
+
+def child_exit(server, worker):
+    """Fold an exited worker's counters into the archive so totals don't drop (runs in the master)."""
+    import metrics
+
+    metrics.registry.collect(worker.pid)
@@ -1,70 +1,512 @@
 """Fissio Base - Central Analytics Platform Frontend"""
 
-from fastapi import FastAPI, Request
-from fastapi.responses import HTMLResponse
-from fastapi.staticfiles import StaticFiles
-from fastapi.templating import Jinja2Templates
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import HTMLResponse, JSONResponse, PlainTextResponse, Response, StreamingResponse
+from pydantic import BaseModel
+from contextlib import asynccontextmanager
+from datetime import date
+from starlette.background import BackgroundTask
 import os
+import time
 
-app = FastAPI(title="Fissio Base", description="Central Analytics & Dashboard Platform")
+import database
+import formats
+import metrics
+import pages
+import proxy
+import upstreams
+from cache import cache, make_key
 
-# Mount static files
-app.mount("/static", StaticFiles(directory="static"), name="static")
 
-# Templates
-templates = Jinja2Templates(directory="templates")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    await upstreams.close()
+
+
+app = FastAPI(title="Fissio Base", description="Central Analytics & Dashboard Platform", lifespan=lifespan)
+app.add_middleware(metrics.MetricsMiddleware)
+
+# One HTTP status per database error, wherever an endpoint lets it propagate
+DATABASE_ERRORS = {database.DatabaseUnavailable: 503, database.QueryTimeout: 504, database.QueryError: 400}
+
+
+async def database_error(request: Request, exc: Exception) -> JSONResponse:
+    status = next(code for error, code in DATABASE_ERRORS.items() if isinstance(exc, error))
+    return JSONResponse({"detail": str(exc)}, status_code=status)
+
+
+for error in DATABASE_ERRORS:
+    app.add_exception_handler(error, database_error)
 
 # Service URLs (can be overridden by environment)
 JUPYTER_URL = os.getenv("JUPYTER_URL", "http://localhost:8888")
 SUPERSET_URL = os.getenv("SUPERSET_URL", "http://localhost:8088")
 DUCKDB_URL = os.getenv("DUCKDB_URL", "http://localhost:5522")
+SERVICE_URLS = {"jupyter_url": JUPYTER_URL, "superset_url": SUPERSET_URL, "duckdb_url": DUCKDB_URL}
+
+if proxy.ENABLED:
+    # Embed Jupyter from this origin; Superset and Duck-UI can't run under a prefix
+    app.include_router(proxy.router)
+    SERVICE_URLS = {**SERVICE_URLS, "jupyter_url": proxy.public_url("jupyter")}
+
+# Render the shell pages at import, so gunicorn's preloaded master shares them with every worker
+for template, path in (("home.html", "/"), ("jupyter.html", "/jupyter"),
+                       ("superset.html", "/superset"), ("duckdb.html", "/duckdb")):
+    pages.render(template, path, SERVICE_URLS)
+
+
+@app.get("/static/{path:path}")
+async def static(path: str, request: Request):
+    """Static assets, immutable under their content-hashed names."""
+    response = pages.static_response(request, path)
+    if response is None:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return response
 
 
 @app.get("/", response_class=HTMLResponse)
 async def home(request: Request):
     """Home dashboard with links to all services."""
-    return templates.TemplateResponse("home.html", {
-        "request": request,
-        "jupyter_url": JUPYTER_URL,
-        "superset_url": SUPERSET_URL,
-        "duckdb_url": DUCKDB_URL,
-    })
+    return pages.page_response(request, "home.html", SERVICE_URLS)
 
 
 @app.get("/jupyter", response_class=HTMLResponse)
 async def jupyter(request: Request):
     """Embedded Jupyter Lab view."""
-    return templates.TemplateResponse("jupyter.html", {
-        "request": request,
-        "jupyter_url": JUPYTER_URL,
-        "superset_url": SUPERSET_URL,
-        "duckdb_url": DUCKDB_URL,
-    })
+    return pages.page_response(request, "jupyter.html", SERVICE_URLS)
 
 
 @app.get("/superset", response_class=HTMLResponse)
 async def superset(request: Request):
     """Embedded Superset view."""
-    return templates.TemplateResponse("superset.html", {
-        "request": request,
-        "jupyter_url": JUPYTER_URL,
-        "superset_url": SUPERSET_URL,
-        "duckdb_url": DUCKDB_URL,
-    })
+    return pages.page_response(request, "superset.html", SERVICE_URLS)
 
 
 @app.get("/duckdb", response_class=HTMLResponse)
 async def duckdb(request: Request):
     """Embedded DuckDB UI view."""
-    return templates.TemplateResponse("duckdb.html", {
-        "request": request,
-        "jupyter_url": JUPYTER_URL,
-        "superset_url": SUPERSET_URL,
-        "duckdb_url": DUCKDB_URL,
-    })
+    return pages.page_response(request, "duckdb.html", SERVICE_URLS)
 
 
 @app.get("/health")
 async def health():
     """Health check endpoint."""
     return {"status": "healthy", "service": "fissio-base"}
+
+
+@app.get("/health/deep")
+async def health_deep():
+    """Every upstream, the DuckDB file and seed age, with timings (cached for a few seconds)."""
+    result = await upstreams.checker.check()
+    return JSONResponse(result, status_code=200 if result["status"] == "healthy" else 503)
+
+
+@app.get("/ready")
+async def ready():
+    """Readiness for load balancers: 200 only if every deep check passes."""
+    result = await upstreams.checker.check()
+    failing = [name for name, check in result["checks"].items() if not check["ok"]]
+    if failing:
+        return JSONResponse({"status": "not ready", "failing": failing}, status_code=503)
+    return {"status": "ready"}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """Request, query, pool, cache and streaming metrics in Prometheus text format."""
+    return PlainTextResponse(metrics.registry.render(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/metrics/queries")
+async def metrics_queries():
+    """The normalized SQL behind each ``fingerprint`` label."""
+    return metrics.fingerprints()
+
+
+# =============================================================================
+# Query API
+# =============================================================================
+
+class QueryRequest(BaseModel):
+    sql: str
+    params: list | dict | None = None
+    limit: int | None = None
+
+
+async def run_query(sql: str, params=None, limit: int | None = None, use_cache: bool = True) -> Response:
+    """Run a read-only query, or serve it from the result cache."""
+    # Read the generation before querying: a reseed that lands mid-query only makes the entry unreachable
+    generation = cache.generation()
+    key = make_key("json", sql, params, limit=limit)
+    if use_cache:
+        body = cache.get(key)
+        if body is not None:
+            return Response(body, media_type="application/json", headers={"X-Cache": "HIT"})
+    result = await database.query(sql, params, limit)
+    response = JSONResponse(jsonable_encoder({
+        "columns": result.columns,
+        "rows": result.rows,
+        "row_count": len(result.rows),
+        "truncated": result.truncated,
+        "elapsed_ms": result.elapsed_ms,
+        "rollup": result.rollup,
+    }), headers={"X-Cache": "MISS"})
+    cache.put(key, response.body, generation)
+    return response
+
+
+def wants_cache(request: Request) -> bool:
+    return "no-cache" not in request.headers.get("cache-control", "")
+
+
+def response_format(request: Request, requested: str | None) -> str:
+    """Negotiate the result format from ``?format=`` or the Accept header."""
+    fmt = formats.negotiate(request.headers.get("accept"), requested)
+    if fmt is None:
+        raise HTTPException(
+            status_code=406,
+            detail=f"Supported formats: {', '.join(formats.MEDIA_TYPES)}",
+        )
+    return fmt
+
+
+async def stream_query(fmt: str, sql: str, params=None, limit: int | None = None,
+                       filename: str = "query", use_cache: bool = True) -> StreamingResponse:
+    """Stream a read-only query as Arrow IPC, Parquet, NDJSON or CSV."""
+    generation = cache.generation()
+    key = make_key("stream", sql, params, limit=limit)
+    cached = cache.open_stream(key, generation) if use_cache else None
+    if cached is not None:
+        schema, batches = cached
+        background, status, rollup = None, "HIT", None
+    else:
+        result = await database.stream(sql, params, limit)
+        schema = result.schema
+        batches = cache.tee(key, generation, schema, result.batches)
+        background, status, rollup = BackgroundTask(result.close), "MISS", result.rollup
+    headers = {
+        "Content-Disposition": f'attachment; filename="{filename}.{formats.FILE_EXTENSIONS[fmt]}"',
+        "X-Cache": status,
+    }
+    if rollup:
+        headers["X-Rollup"] = rollup
+    encode = formats.ENCODERS[fmt]
+    return StreamingResponse(
+        counted(fmt, encode(schema, counted_rows(fmt, batches))),
+        media_type=formats.MEDIA_TYPES[fmt],
+        headers=headers,
+        background=background,
+    )
+
+
+def counted_rows(fmt: str, batches):
+    for batch in batches:
+        metrics.stream_rows.inc(batch.num_rows, format=fmt)
+        yield batch
+
+
+def counted(fmt: str, chunks):
+    for chunk in chunks:
+        metrics.stream_bytes.inc(len(chunk), format=fmt)
+        yield chunk
+
+
+@app.post("/api/query")
+async def api_query(body: QueryRequest, request: Request, format: str | None = None):
+    """Run a read-only SQL query against fissio.duckdb.
+
+    JSON by default; ``?format=arrow|parquet|ndjson|csv`` (or a matching
+    Accept header) streams the full result instead, up to STREAM_MAX_ROWS.
+    """
+    fmt = response_format(request, format)
+    if fmt != "json":
+        return await stream_query(fmt, body.sql, body.params, body.limit, use_cache=wants_cache(request))
+    return await run_query(body.sql, body.params, body.limit, use_cache=wants_cache(request))
+
+
+@app.get("/api/tables")
+async def api_tables():
+    """List queryable tables and views."""
+    return await run_query("""
+        SELECT table_schema, table_name, table_type
+        FROM information_schema.tables
+        WHERE table_schema NOT IN ('information_schema', 'pg_catalog')
+        ORDER BY table_schema, table_name
+    """)
+
+
+@app.get("/api/tables/{schema}/{table}")
+async def api_table(
+    request: Request,
+    schema: str,
+    table: str,
+    limit: int | None = Query(None, ge=0),
+    offset: int = Query(0, ge=0),
+    format: str | None = None,
+):
+    """Page through the rows of one table, or stream all of it in a bulk format."""
+    fmt = response_format(request, format)
+    exists = await database.table_exists(schema, table)
+    if not exists:
+        raise HTTPException(status_code=404, detail=f"Table {schema}.{table} not found")
+    name = f"{database.quote_identifier(schema)}.{database.quote_identifier(table)}"
+    if fmt != "json":
+        sql = f"SELECT * FROM {name}" + (f" LIMIT {limit}" if limit is not None else "") + f" OFFSET {offset}"
+        return await stream_query(fmt, sql, limit=limit, filename=f"{schema}.{table}",
+                                  use_cache=wants_cache(request))
+    limit = 100 if limit is None else limit
+    return await run_query(f"SELECT * FROM {name} LIMIT {limit} OFFSET {offset}", limit=limit,
+                           use_cache=wants_cache(request))
+
+
+# =============================================================================
+# Plant proximity search (grid index + macros from scripts/spatial.py)
+# =============================================================================
+
+# Half the Earth's circumference: every point is within this distance
+MAX_RADIUS_KM = 20_040
+
+
+class PolygonQuery(BaseModel):
+    """A GeoJSON Polygon: an outer ring followed by optional holes, as [lon, lat] pairs."""
+    type: str = "Polygon"
+    coordinates: list[list[list[float]]]
+
+
+def plant_filters(fuel: str | None, country: str | None) -> tuple[str, list]:
+    clauses, params = [], []
+    if fuel:
+        clauses.append("primary_fuel = ?")
+        params.append(fuel)
+    if country:
+        clauses.append("country = ?")
+        params.append(country.upper())
+    return "".join(f" AND {c}" for c in clauses), params
+
+
+async def count_rows(sql: str, params: list) -> int:
+    result = await database.query(f"SELECT COUNT(*) FROM ({sql})", params)
+    return result.rows[0][0]
+
+
+@app.get("/api/plants/nearby")
+async def api_plants_nearby(
+    request: Request,
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    radius_km: float = Query(50, gt=0, le=MAX_RADIUS_KM),
+    k: int | None = Query(None, ge=1, le=1000),
+    fuel: str | None = None,
+    country: str | None = None,
+    limit: int = Query(1000, ge=1),
+    format: str | None = None,
+):
+    """Plants within ``radius_km`` of a point, nearest first.
+
+    With ``k``, returns the k nearest plants instead, widening the search
+    radius (starting at ``radius_km``) until enough are found.
+    """
+    fmt = response_format(request, format)
+    where, params = plant_filters(fuel, country)
+    if k is not None:
+        # Double the radius until it holds k matches; the grid keeps each probe cheap
+        while radius_km < MAX_RADIUS_KM:
+            probe = f"SELECT 1 FROM plants_within(?, ?, ?) WHERE true{where} LIMIT {k}"
+            if await count_rows(probe, [lat, lon, radius_km, *params]) >= k:
+                break
+            radius_km = min(radius_km * 2, MAX_RADIUS_KM)
+        limit = k
+    sql = f"""
+        SELECT * EXCLUDE (cell_lat, cell_lon)
+        FROM plants_within(?, ?, ?)
+        WHERE true{where}
+        ORDER BY distance_km, plant_id
+        LIMIT {limit}
+    """
+    params = [lat, lon, radius_km, *params]
+    if fmt != "json":
+        return await stream_query(fmt, sql, params, filename="plants_nearby", use_cache=wants_cache(request))
+    return await run_query(sql, params, use_cache=wants_cache(request))
+
+
+@app.post("/api/plants/within")
+async def api_plants_within(
+    body: PolygonQuery,
+    request: Request,
+    fuel: str | None = None,
+    country: str | None = None,
+    format: str | None = None,
+):
+    """Plants inside a GeoJSON polygon (holes excluded), largest first."""
+    fmt = response_format(request, format)
+    if body.type != "Polygon" or not body.coordinates:
+        raise HTTPException(status_code=400, detail="Expected a GeoJSON Polygon")
+    for ring in body.coordinates:
+        if len(ring) < 3 or any(len(point) != 2 for point in ring):
+            raise HTTPException(status_code=400, detail="Rings need at least 3 [lon, lat] points")
+    outer, *holes = body.coordinates
+    where, params = plant_filters(fuel, country)
+    where += "".join(" AND NOT point_in_polygon(latitude, longitude, ?::DOUBLE[][])" for _ in holes)
+    sql = f"""
+        SELECT * EXCLUDE (cell_lat, cell_lon)
+        FROM plants_in_polygon(?::DOUBLE[][])
+        WHERE true{where}
+        ORDER BY capacity_mw DESC NULLS LAST, plant_id
+    """
+    params = [outer, *params, *holes]
+    if fmt != "json":
+        return await stream_query(fmt, sql, params, filename="plants_within", use_cache=wants_cache(request))
+    return await run_query(sql, params, use_cache=wants_cache(request))
+
+
+# =============================================================================
+# Reactor power history (scripts/timeseries.py)
+# =============================================================================
+
+POWER_TABLES = {
+    "raw": "regulatory.reactor_power_history",
+    "daily": "regulatory.reactor_power_daily",
+    "weekly": "regulatory.reactor_power_weekly",
+    "monthly": "regulatory.reactor_power_monthly",
+}
+
+
+@app.get("/api/reactors/power")
+async def api_reactor_power(
+    request: Request,
+    unit: str | None = None,
+    start: date | None = None,
+    end: date | None = None,
+    grain: str = Query("raw", pattern="^(raw|daily|weekly|monthly)$"),
+    format: str | None = None,
+):
+    """Reactor power between ``start`` and ``end`` (inclusive).
+
+    ``raw`` returns the daily reports; ``daily``/``weekly``/``monthly`` return
+    capacity-factor downsamples. Without ``unit``, raw returns every unit and
+    the downsamples return fleet totals.
+    """
+    fmt = response_format(request, format)
+    table = POWER_TABLES[grain]
+    column = "report_date" if grain == "raw" else "period_start"
+    clauses, params = [], []
+    if start:
+        clauses.append(f"{column} >= ?")
+        params.append(start)
+    if end:
+        clauses.append(f"{column} <= ?")
+        params.append(end)
+    if unit:
+        clauses.append("unit = ?")
+        params.append(unit)
+    elif grain != "raw":
+        clauses.append("unit IS NULL")
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    columns = "report_date, unit, power_pct" if grain == "raw" else "*"
+    sql = f"SELECT {columns} FROM {table} {where} ORDER BY {column}, unit"
+    if fmt != "json":
+        return await stream_query(fmt, sql, params, filename=f"reactor_power_{grain}",
+                                  use_cache=wants_cache(request))
+    return await run_query(sql, params, use_cache=wants_cache(request))
+
+
+@app.get("/api/reactors/power/as-of")
+async def api_reactor_power_as_of(
+    request: Request,
+    as_of: date = Query(..., alias="date"),
+    unit: str | None = None,
+):
+    """Each unit's last reported power level on or before ``date``."""
+    params = [as_of, as_of]
+    where = ""
+    if unit:
+        where = " AND unit = ?"
+        params.append(unit)
+    sql = f"""
+        SELECT
+            unit,
+            MAX(report_date) AS report_date,
+            arg_max(power_pct, report_date) AS power_pct,
+            ?::DATE - MAX(report_date) AS days_since_report
+        FROM regulatory.reactor_power_history
+        WHERE report_date <= ?{where}
+        GROUP BY unit
+        ORDER BY unit
+    """
+    return await run_query(sql, params, use_cache=wants_cache(request))
+
+
+# =============================================================================
+# Plant search (in-memory trigram index from scripts/search_index.py)
+# =============================================================================
+
+@app.get("/api/search")
+async def api_search(
+    q: str = Query(..., max_length=200),
+    limit: int = Query(10, ge=1, le=50),
+):
+    """Typeahead search over plant names, owners and countries.
+
+    Matches whole words, the prefix being typed and misspellings; plants
+    matching more of the query come first, then better matches, then larger
+    plants. ``matched`` names the field that matched best.
+    """
+    def lookup(cur):
+        start = time.perf_counter()
+        index = database.search_index.current(cur)
+        if index is None:
+            return None
+        results = index.search(q, limit)
+        return {"query": q, "results": results, "elapsed_ms": round((time.perf_counter() - start) * 1000, 2)}
+
+    body = await database.run(lookup)
+    if body is None:
+        raise HTTPException(status_code=503, detail="Search index not built - run 'make seed'")
+    return body
+
+
+# =============================================================================
+# Column catalog (meta.table_stats / meta.column_stats from scripts/catalog.py)
+# =============================================================================
+
+@app.get("/api/catalog")
+async def api_catalog():
+    """Profiled tables with their row and column counts."""
+    return await run_query("""
+        SELECT table_schema, table_name, row_count, column_count, computed_at
+        FROM meta.table_stats
+        ORDER BY table_schema, table_name
+    """)
+
+
+@app.get("/api/catalog/{schema}/{table}")
+async def api_catalog_table(schema: str, table: str, column: str | None = None):
+    """Per-column statistics for filter UIs: null fraction, min/max, distinct
+    estimate, value counts (or top-k) and numeric histograms.
+
+    ``values_complete`` marks columns whose ``top_values`` lists every value,
+    so a dropdown can be filled without querying the table.
+    """
+    exists = await database.table_exists(schema, table)
+    if not exists:
+        raise HTTPException(status_code=404, detail=f"Table {schema}.{table} not found")
+    params = [schema, table]
+    where = ""
+    if column:
+        where = " AND column_name = ?"
+        params.append(column)
+    return await run_query(f"""
+        SELECT column_name, data_type, row_count, null_count, null_fraction, min_value, max_value,
+               approx_distinct, values_complete, top_values, histogram, computed_at
+        FROM meta.column_stats
+        WHERE table_schema = ? AND table_name = ?{where}
+        ORDER BY ordinal
+    """, params)
+
+
+@app.get("/api/cache/stats")
+async def api_cache_stats():
+    """Result cache hit/miss/eviction counters and sizes."""
+    return cache.stats()
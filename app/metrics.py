@@ -0,0 +1,424 @@
+"""Prometheus-style metrics for the frontend, served as text on ``/metrics``.
+
+A small in-process registry (no client library): counters and histograms are
+updated on the hot path under a lock, and gauges that describe other
+components (the connection pool, the result cache) are read when scraped.
+
+Under gunicorn every worker has its own registry. With ``METRICS_DIR`` set
+(``gunicorn.conf.py`` sets it), each worker saves its series there as
+``<pid>.json`` every ``METRICS_FLUSH_SECONDS`` and on exit, and a scrape
+merges the directory: counters and histograms are summed over all workers,
+gauges get a ``pid`` label per live worker. The master folds an exited
+worker's file into ``archive.json`` so totals never go back.
+
+Query timings are labelled with a SQL fingerprint: the statement with
+literals replaced by ``?`` and whitespace collapsed, hashed to 12 hex
+characters. Only the first ``METRICS_MAX_FINGERPRINTS`` fingerprints get
+their own series; later ones are counted as ``other``.
+
+With ``SLOW_QUERY_MS`` set, queries slower than that are re-run under
+``EXPLAIN ANALYZE`` and the plan is logged (and appended as JSON lines to
+``SLOW_QUERY_LOG`` if set), at most once per fingerprint per
+``SLOW_QUERY_INTERVAL_SECONDS``.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Callable
+
+MAX_FINGERPRINTS = int(os.getenv("METRICS_MAX_FINGERPRINTS", "200"))
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "0"))  # 0 = slow-query log off
+SLOW_QUERY_LOG = os.getenv("SLOW_QUERY_LOG")
+SLOW_QUERY_INTERVAL = float(os.getenv("SLOW_QUERY_INTERVAL_SECONDS", "300"))
+METRICS_DIR = os.getenv("METRICS_DIR")  # unset = this process only
+FLUSH_SECONDS = float(os.getenv("METRICS_FLUSH_SECONDS", "5"))
+ARCHIVE = "archive"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30)
+
+logger = logging.getLogger("fissio.slow_query")
+log = logging.getLogger("fissio.metrics")
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(labels.get(n, "") for n in self.labels)
+
+    def values(self) -> dict[tuple, float | list]:
+        """Label values -> this process's value (a list of counts for histograms)."""
+        raise NotImplementedError
+
+    def samples(self, values: dict, labels: tuple[str, ...]) -> list[str]:
+        return [f"{self.name}{_labels(labels, key)} {_number(v)}"
+                for key, v in sorted(values.items()) if v is not None]
+
+    def render(self, values: dict | None = None, labels: tuple[str, ...] | None = None) -> str:
+        values = self.values() if values is None else values
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        return "\n".join(lines + self.samples(values, self.labels if labels is None else labels))
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()):
+        super().__init__(name, help, labels)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def values(self) -> dict[tuple, float]:
+        with self._lock:
+            return dict(self._values)
+
+
+class Gauge(Metric):
+    """A value read when scraped: ``read()`` returns a number, or {label values: number}.
+
+    ``kind="counter"`` exposes a total kept elsewhere (such as the cache's counters).
+    """
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, read: Callable[[], float | dict], labels: tuple[str, ...] = (),
+                 kind: str = "gauge"):
+        super().__init__(name, help, labels)
+        self.read = read
+        self.kind = kind
+
+    def values(self) -> dict[tuple, float]:
+        value = self.read()
+        if not isinstance(value, dict):
+            value = {(): value}
+        return {key: v for key, v in value.items() if v is not None}
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = (), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(buckets) + (float("inf"),)
+        self._series: dict[tuple, list] = {}  # label values -> [bucket counts..., sum, count]
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+                    break
+            series[-2] += value
+            series[-1] += 1
+
+    def values(self) -> dict[tuple, list]:
+        with self._lock:
+            return {key: list(values) for key, values in self._series.items()}
+
+    def samples(self, values: dict, labels: tuple[str, ...]) -> list[str]:
+        lines = []
+        for key, series in sorted(values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                le = f'le="{_number(bound)}"'
+                lines.append(f"{self.name}_bucket{_labels(labels, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(labels, key)} {_number(round(series[-2], 6))}")
+            lines.append(f"{self.name}_count{_labels(labels, key)} {series[-1]}")
+        return lines
+
+
+def _write_json(path: Path, data: dict):
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_text(json.dumps(data, default=str))
+    os.replace(tmp, path)
+
+
+def _read_json(path: Path) -> dict | None:
+    try:
+        return json.loads(path.read_text())
+    except (FileNotFoundError, ValueError):  # folded into the archive meanwhile
+        return None
+
+
+def _sum(snapshots: list[dict], name: str) -> dict[tuple, float | list]:
+    """One metric's series summed over ``snapshots`` (histograms bucket by bucket)."""
+    totals = {}
+    for snapshot in snapshots:
+        for key, value in snapshot["metrics"].get(name, []):
+            key = tuple(key)
+            if key not in totals:
+                totals[key] = value
+            elif isinstance(value, list):
+                totals[key] = [a + b for a, b in zip(totals[key], value)]
+            else:
+                totals[key] += value
+    return totals
+
+
+class Registry:
+    def __init__(self, directory: str | None = None):
+        self.metrics: list[Metric] = []
+        self.directory = Path(directory) if directory else None
+        if self.directory:
+            self.directory.mkdir(parents=True, exist_ok=True)
+
+    def add(self, metric: Metric) -> Metric:
+        self.metrics.append(metric)
+        return metric
+
+    def snapshot(self) -> dict:
+        """This process's series and fingerprints, as saved to the shared directory."""
+        with _fingerprints_lock:
+            known = dict(_fingerprints)
+        return {
+            "metrics": {m.name: [[list(key), v] for key, v in m.values().items()] for m in self.metrics},
+            "fingerprints": known,
+        }
+
+    def write(self):
+        """Save this process's snapshot as ``<pid>.json`` (multiprocess mode only)."""
+        if self.directory is not None:
+            _write_json(self.directory / f"{os.getpid()}.json", self.snapshot())
+
+    def snapshots(self) -> dict[str, dict]:
+        """Every saved snapshot by pid, plus the exited workers' ``archive``."""
+        found = {}
+        for path in sorted(self.directory.glob("*.json")):
+            snapshot = _read_json(path)
+            if snapshot is not None:
+                found[path.stem] = snapshot
+        return found
+
+    def render(self) -> str:
+        if self.directory is None:
+            return "\n".join(m.render() for m in self.metrics) + "\n"
+        self.write()
+        snapshots = self.snapshots()
+        live = {pid: s for pid, s in snapshots.items() if pid != ARCHIVE}
+        out = []
+        for m in self.metrics:
+            if m.kind == "gauge":
+                values = {tuple(key) + (pid,): v for pid, s in live.items() for key, v in s["metrics"].get(m.name, [])}
+                out.append(m.render(values, m.labels + ("pid",)))
+            else:
+                out.append(m.render(_sum(list(snapshots.values()), m.name)))
+        return "\n".join(out) + "\n"
+
+    def collect(self, pid: int):
+        """Fold an exited worker's counters and histograms into the archive (run in the master)."""
+        if self.directory is None:
+            return
+        path = self.directory / f"{pid}.json"
+        exited = _read_json(path)
+        if exited is None:
+            return
+        archive_path = self.directory / f"{ARCHIVE}.json"
+        archive = _read_json(archive_path) or {"metrics": {}, "fingerprints": {}}
+        archive["metrics"] = {
+            m.name: [[list(key), v] for key, v in _sum([archive, exited], m.name).items()]
+            for m in self.metrics if m.kind != "gauge"
+        }
+        archive["fingerprints"] = {**exited["fingerprints"], **archive["fingerprints"]}
+        _write_json(archive_path, archive)
+        path.unlink(missing_ok=True)
+
+    def clear(self):
+        """Drop the snapshots of a previous run (run in the master before forking)."""
+        if self.directory is not None:
+            for path in self.directory.glob("*.json"):
+                path.unlink(missing_ok=True)
+
+    def start_writer(self, interval: float = FLUSH_SECONDS):
+        """Save this worker's snapshot now and every ``interval`` seconds; call after fork."""
+        if self.directory is None:
+            return
+
+        def run():
+            while True:
+                try:
+                    self.write()
+                except OSError as e:
+                    log.warning("Could not save metrics to %s: %s", self.directory, e)
+                time.sleep(interval)
+
+        threading.Thread(target=run, name="metrics-writer", daemon=True).start()
+
+
+registry = Registry(METRICS_DIR)
+
+http_requests = registry.add(Counter(
+    "fissio_http_requests_total", "HTTP requests by route, method and status", ("route", "method", "status")))
+http_latency = registry.add(Histogram(
+    "fissio_http_request_duration_seconds", "Time to the last response byte, by route", ("route", "method")))
+http_bytes = registry.add(Counter(
+    "fissio_http_response_bytes_total", "Response body bytes sent, by route", ("route",)))
+query_latency = registry.add(Histogram(
+    "fissio_duckdb_query_duration_seconds", "DuckDB execution time by SQL fingerprint and kind (query, stream)",
+    ("fingerprint", "kind")))
+query_errors = registry.add(Counter(
+    "fissio_duckdb_query_errors_total", "Failed DuckDB queries by fingerprint and error", ("fingerprint", "error")))
+pool_wait = registry.add(Histogram(
+    "fissio_duckdb_pool_wait_seconds", "Time spent waiting for a pooled cursor", buckets=WAIT_BUCKETS))
+stream_bytes = registry.add(Counter(
+    "fissio_stream_bytes_total", "Encoded bytes of streamed query results, by format", ("format",)))
+stream_rows = registry.add(Counter(
+    "fissio_stream_rows_total", "Rows of streamed query results, by format", ("format",)))
+slow_queries = registry.add(Counter(
+    "fissio_slow_queries_total", f"Queries slower than SLOW_QUERY_MS ({SLOW_QUERY_MS:g})", ("fingerprint",)))
+
+
+# =============================================================================
+# SQL fingerprints
+# =============================================================================
+
+# Quoted identifiers are kept; string and numeric literals become ?
+_LITERALS = re.compile(r"""("(?:[^"]|"")*")|'(?:[^']|'')*'|\b\d+(?:\.\d+)?(?:e[+-]?\d+)?\b|--[^\n]*|/\*.*?\*/""", re.S | re.I)
+_fingerprints: dict[str, str] = {}  # fingerprint -> normalized SQL (first seen)
+_fingerprints_lock = threading.Lock()
+
+
+def normalize(sql: str) -> str:
+    def replace(match):
+        quoted = match.group(1)
+        if quoted:
+            return quoted
+        return " " if match.group(0).startswith(("--", "/*")) else "?"
+    return re.sub(r"\s+", " ", _LITERALS.sub(replace, sql)).strip().rstrip(";").strip()
+
+
+def fingerprint(sql: str) -> str:
+    """Short stable id of ``sql`` with its literals stripped; ``other`` past the series limit."""
+    normalized = normalize(sql)
+    digest = hashlib.sha256(normalized.encode()).hexdigest()[:12]
+    with _fingerprints_lock:
+        if digest in _fingerprints:
+            return digest
+        if len(_fingerprints) >= MAX_FINGERPRINTS:
+            return "other"
+        _fingerprints[digest] = normalized
+    return digest
+
+
+def fingerprints() -> dict[str, str]:
+    """Fingerprint -> normalized SQL, for looking up a series' query (from every worker)."""
+    with _fingerprints_lock:
+        known = dict(_fingerprints)
+    if registry.directory is None:
+        return known
+    merged = {}
+    for snapshot in registry.snapshots().values():
+        merged.update(snapshot["fingerprints"])
+    return {**merged, **known}
+
+
+# =============================================================================
+# Slow-query log
+# =============================================================================
+
+_last_explained: dict[str, float] = {}
+
+
+def is_slow(fingerprint: str, seconds: float) -> bool:
+    """Whether a query this slow should be logged now (rate-limited per fingerprint)."""
+    if not SLOW_QUERY_MS or seconds * 1000 < SLOW_QUERY_MS:
+        return False
+    slow_queries.inc(fingerprint=fingerprint)
+    now = time.monotonic()
+    with _fingerprints_lock:
+        last = _last_explained.get(fingerprint)
+        if last is not None and now - last < SLOW_QUERY_INTERVAL:
+            return False
+        _last_explained[fingerprint] = now
+    return True
+
+
+def log_slow_query(fingerprint: str, sql: str, params, seconds: float, plan: str | None, error: str | None = None):
+    entry = {
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "fingerprint": fingerprint,
+        "elapsed_ms": round(seconds * 1000, 2),
+        "sql": sql,
+        "params": params,
+        "plan": plan,
+        "explain_error": error,
+    }
+    logger.warning("Slow query %s (%.0f ms):\n%s\n%s", fingerprint, seconds * 1000, sql, plan or error)
+    if SLOW_QUERY_LOG:
+        line = json.dumps(entry, default=str, ensure_ascii=False)
+        with _fingerprints_lock, open(SLOW_QUERY_LOG, "a") as f:
+            f.write(line + "\n")
+
+
+# =============================================================================
+# HTTP middleware
+# =============================================================================
+
+class MetricsMiddleware:
+    """ASGI middleware timing every HTTP request until its last body byte is sent.
+
+    Routes are labelled by their path template (``/api/tables/{schema}/{table}``)
+    so the number of series stays bounded; unmatched paths share one label.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        start = time.perf_counter()
+        state = {"status": 500, "bytes": 0}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                state["status"] = message["status"]
+            elif message["type"] == "http.response.body":
+                state["bytes"] += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = getattr(scope.get("route"), "path", None) or scope.get("root_path") or "unmatched"
+            method = scope["method"]
+            http_requests.inc(route=route, method=method, status=state["status"])
+            http_latency.observe(time.perf_counter() - start, route=route, method=method)
+            http_bytes.inc(state["bytes"], route=route)
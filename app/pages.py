@@ -0,0 +1,159 @@
+"""Pre-rendered shell pages and content-hashed static assets.
+
+The shell pages only depend on the service URLs, so each is rendered once
+(``main.py`` does it at import) and kept with its gzip and brotli encodings. Static files
+are read and compressed once at startup and served under content-hashed
+names (``/static/css/app.<hash>.css``) that can be cached forever; templates
+link to them through ``static_url()``.
+
+Every body carries a strong ETag per encoding, and ``If-None-Match`` is
+answered with 304 before anything else happens.
+"""
+
+import gzip
+import hashlib
+import mimetypes
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+from fastapi import Request
+from fastapi.responses import Response
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+STATIC_DIR = Path(__file__).parent / "static"
+TEMPLATE_DIR = Path(__file__).parent / "templates"
+PAGE_CACHE_CONTROL = os.getenv("PAGE_CACHE_CONTROL", "public, max-age=0, must-revalidate")
+IMMUTABLE = "public, max-age=31536000, immutable"
+# Below this, compressing costs more than it saves
+MIN_COMPRESS_BYTES = 512
+
+
+@dataclass
+class Asset:
+    """One body in every encoding it is worth sending in, each with its own strong ETag."""
+    media_type: str
+    bodies: dict[str, bytes]  # encoding ("identity", "gzip", "br") -> body
+    etags: dict[str, str]
+
+    @classmethod
+    def build(cls, body: bytes, media_type: str) -> "Asset":
+        digest = hashlib.sha256(body).hexdigest()[:20]
+        bodies = {"identity": body}
+        if len(body) >= MIN_COMPRESS_BYTES:
+            bodies["gzip"] = gzip.compress(body, compresslevel=9, mtime=0)
+            if brotli is not None:
+                bodies["br"] = brotli.compress(body, quality=11)
+        etags = {enc: f'"{digest}"' if enc == "identity" else f'"{digest}-{enc}"' for enc in bodies}
+        return cls(media_type, bodies, etags)
+
+    def response(self, request: Request, cache_control: str) -> Response:
+        encoding = negotiate_encoding(request.headers.get("accept-encoding", ""), self.bodies)
+        headers = {
+            "ETag": self.etags[encoding],
+            "Cache-Control": cache_control,
+            "Vary": "Accept-Encoding",
+        }
+        if not_modified(request.headers.get("if-none-match"), self.etags.values()):
+            return Response(status_code=304, headers=headers)
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+        return Response(self.bodies[encoding], media_type=self.media_type, headers=headers)
+
+
+def negotiate_encoding(accept_encoding: str, available) -> str:
+    """Best of br > gzip > identity that the client accepts."""
+    accepted = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        if params.strip().startswith("q="):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name.strip()] = q
+    for encoding in ("br", "gzip"):
+        if encoding in available and accepted.get(encoding, accepted.get("*", 0)) > 0:
+            return encoding
+    return "identity"
+
+
+def not_modified(if_none_match: str | None, etags) -> bool:
+    """Whether ``If-None-Match`` names any of our ETags (any encoding of the same content)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    sent = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return not sent.isdisjoint(etags)
+
+
+# =============================================================================
+# Static assets
+# =============================================================================
+
+def hashed_name(path: str, body: bytes) -> str:
+    stem, dot, suffix = path.rpartition(".")
+    digest = hashlib.sha256(body).hexdigest()[:10]
+    return f"{stem}.{digest}.{suffix}" if dot else f"{path}.{digest}"
+
+
+def load_static(directory: Path) -> tuple[dict[str, Asset], dict[str, str]]:
+    """Every file under ``directory``: (served path -> asset, original path -> hashed path)."""
+    assets, urls = {}, {}
+    for file in sorted(p for p in directory.rglob("*") if p.is_file()):
+        path = file.relative_to(directory).as_posix()
+        body = file.read_bytes()
+        media_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        if media_type.startswith("text/"):
+            media_type += "; charset=utf-8"
+        asset = Asset.build(body, media_type)
+        hashed = hashed_name(path, body)
+        assets[path] = assets[hashed] = asset
+        urls[path] = hashed
+    return assets, urls
+
+
+static_assets, static_urls = load_static(STATIC_DIR)
+
+
+def static_url(path: str) -> str:
+    return f"/static/{static_urls.get(path, path)}"
+
+
+def static_response(request: Request, path: str) -> Response | None:
+    """A static asset, cached forever under its hashed name; None if there is no such file."""
+    asset = static_assets.get(path)
+    if asset is None:
+        return None
+    # Unhashed paths (old links, tools) are revalidated instead
+    return asset.response(request, "no-cache" if path in static_urls else IMMUTABLE)
+
+
+# =============================================================================
+# Shell pages
+# =============================================================================
+
+env = Environment(loader=FileSystemLoader(TEMPLATE_DIR), autoescape=select_autoescape())
+env.globals["static_url"] = static_url
+
+_pages: dict[tuple[str, str], Asset] = {}
+
+
+def render(template: str, path: str, context: dict) -> Asset:
+    """Render ``template`` for ``path`` once; later calls return the memoized asset."""
+    page = _pages.get((template, path))
+    if page is None:
+        html = env.get_template(template).render(active=path, **context)
+        page = _pages[template, path] = Asset.build(html.encode(), "text/html; charset=utf-8")
+    return page
+
+
+def page_response(request: Request, template: str, context: dict) -> Response:
+    return render(template, request.url.path, context).response(request, PAGE_CACHE_CONTROL)
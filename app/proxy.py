@@ -0,0 +1,196 @@
+"""Optional reverse proxy: services under ``/svc/<name>/``.
+
+With ``FRONTEND_PROXY=true`` the shell pages embed the proxied services from
+the frontend's own origin instead of other ports, so the browser makes no
+cross-origin requests or extra TLS handshakes.
+
+Only services with a base-path setting are proxied (``PROXIED``): Jupyter,
+with ``base_url=/svc/jupyter/``. Superset's and Duck-UI's browser code
+requests root-relative ``/static/...``, ``/api/v1/...`` and ``/assets/...``
+paths, which would land on the frontend's own routes, so they stay on their
+direct URLs.
+
+- Requests go over the shared keep-alive client (``upstreams.client()``) to
+  ``*_INTERNAL_URL`` with the prefix stripped; a path in the internal URL is
+  kept, so Jupyter with ``base_url=/svc/jupyter/`` maps one to one.
+- Bodies are streamed both ways as raw bytes, without decoding. Responses
+  the upstream sent uncompressed are gzip-compressed on the fly if they are
+  text and the client accepts gzip.
+- ``Location`` headers pointing at the upstream are rewritten under the prefix.
+- WebSockets (Jupyter kernels and terminals) are relayed message by message.
+"""
+
+import asyncio
+import os
+import zlib
+from urllib.parse import urlsplit
+
+import httpx
+from fastapi import APIRouter, HTTPException, Request, WebSocket
+from fastapi.responses import RedirectResponse, StreamingResponse
+from starlette.background import BackgroundTask
+from starlette.websockets import WebSocketDisconnect
+from websockets.asyncio.client import connect
+from websockets.exceptions import ConnectionClosed, InvalidHandshake, InvalidURI
+
+import upstreams
+
+ENABLED = os.getenv("FRONTEND_PROXY", "false").lower() == "true"
+PREFIX = "/svc"
+TIMEOUT = httpx.Timeout(float(os.getenv("PROXY_TIMEOUT_SECONDS", "300")), connect=5)
+
+# Not forwarded in either direction; Host is kept so upstream origin checks see the browser's host
+HOP_BY_HOP = {
+    "connection", "keep-alive", "proxy-authenticate", "proxy-authorization", "te", "trailer",
+    "transfer-encoding", "upgrade",
+}
+COMPRESSIBLE = ("text/", "application/json", "application/javascript", "application/xml", "image/svg+xml")
+MIN_COMPRESS_BYTES = 1024
+
+# Services that can be served under a path prefix
+PROXIED = ("jupyter",)
+
+router = APIRouter()
+
+
+def upstream(service: str) -> str:
+    if service not in PROXIED:
+        raise HTTPException(status_code=404, detail=f"Unknown service {service!r}")
+    return upstreams.UPSTREAMS[service][0].rstrip("/")
+
+
+def public_url(service: str) -> str:
+    """Where the browser reaches ``service`` through the proxy."""
+    return f"{PREFIX}/{service}"
+
+
+def rewrite_location(location: str, service: str, base: str) -> str:
+    """Map a redirect target on the upstream back under the proxy prefix."""
+    prefix = public_url(service)
+    base_path = urlsplit(base).path
+    if location.startswith(base):
+        return prefix + location[len(base):]
+    if location.startswith("/") and not location.startswith(prefix):
+        # Root-relative on the upstream: drop its own base path, if any, and add ours
+        if base_path and location.startswith(base_path):
+            location = location[len(base_path):]
+        return prefix + location
+    return location
+
+
+def should_compress(request: Request, response: httpx.Response) -> bool:
+    if "content-encoding" in response.headers or request.method == "HEAD":
+        return False
+    if not response.headers.get("content-type", "").startswith(COMPRESSIBLE):
+        return False
+    length = response.headers.get("content-length")
+    if length is not None and int(length) < MIN_COMPRESS_BYTES:
+        return False
+    return "gzip" in request.headers.get("accept-encoding", "").lower()
+
+
+async def gzip_stream(chunks):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # 31 = gzip container
+    async for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+@router.get(PREFIX + "/{service}")
+async def service_root(service: str):
+    upstream(service)
+    return RedirectResponse(f"{public_url(service)}/")
+
+
+@router.api_route(PREFIX + "/{service}/{path:path}",
+                  methods=["GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"])
+async def proxy_http(service: str, path: str, request: Request):
+    base = upstream(service)
+    prefix = public_url(service)
+    headers = [(k, v) for k, v in request.headers.raw if k.decode().lower() not in HOP_BY_HOP]
+    headers += [
+        (b"x-forwarded-host", request.headers.get("host", "").encode()),
+        (b"x-forwarded-proto", request.url.scheme.encode()),
+        (b"x-forwarded-prefix", prefix.encode()),
+    ]
+    if request.client:
+        headers.append((b"x-forwarded-for", request.client.host.encode()))
+    client = upstreams.client()
+    upstream_request = client.build_request(
+        request.method,
+        f"{base}/{path}",
+        params=request.url.query or None,
+        headers=headers,
+        content=request.stream() if request.method not in ("GET", "HEAD") else None,
+        timeout=TIMEOUT,
+    )
+    try:
+        response = await client.send(upstream_request, stream=True)
+    except httpx.TimeoutException:
+        raise HTTPException(status_code=504, detail=f"{service} did not respond in time")
+    except httpx.HTTPError as e:
+        raise HTTPException(status_code=502, detail=f"{service} unavailable: {type(e).__name__}")
+
+    out_headers = [(k, v) for k, v in response.headers.multi_items()
+                   if k.lower() not in HOP_BY_HOP and k.lower() != "content-length"]
+    if "location" in response.headers:
+        out_headers = [(k, rewrite_location(v, service, base) if k.lower() == "location" else v)
+                       for k, v in out_headers]
+    body = response.aiter_raw()
+    if should_compress(request, response):
+        body = gzip_stream(body)
+        out_headers.append(("content-encoding", "gzip"))
+        out_headers.append(("vary", "Accept-Encoding"))
+    elif "content-length" in response.headers:
+        out_headers.append(("content-length", response.headers["content-length"]))
+
+    streamed = StreamingResponse(body, status_code=response.status_code, background=BackgroundTask(response.aclose))
+    # Multi-valued headers (Set-Cookie) must survive, so they're set on the raw list
+    streamed.raw_headers = [(k.lower().encode("latin-1"), v.encode("latin-1")) for k, v in out_headers]
+    return streamed
+
+
+@router.websocket(PREFIX + "/{service}/{path:path}")
+async def proxy_websocket(websocket: WebSocket, service: str, path: str):
+    base = upstream(service)
+    url = "ws" + base[len("http"):] + "/" + path
+    if websocket.url.query:
+        url += "?" + websocket.url.query
+    forwarded = {k: v for k, v in websocket.headers.items() if k.lower() in ("cookie", "authorization")}
+    subprotocols = [p.strip() for p in websocket.headers.get("sec-websocket-protocol", "").split(",") if p.strip()]
+    try:
+        upstream_ws = await connect(url, additional_headers=forwarded, subprotocols=subprotocols or None,
+                                    max_size=None, open_timeout=10)
+    except (OSError, InvalidHandshake, InvalidURI, asyncio.TimeoutError):
+        await websocket.close(code=1011)
+        return
+    await websocket.accept(subprotocol=upstream_ws.subprotocol)
+
+    async def client_to_upstream():
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                return
+            await upstream_ws.send(message["bytes"] if message.get("bytes") is not None else message["text"])
+
+    async def upstream_to_client():
+        async for message in upstream_ws:
+            if isinstance(message, bytes):
+                await websocket.send_bytes(message)
+            else:
+                await websocket.send_text(message)
+
+    tasks = [asyncio.create_task(client_to_upstream()), asyncio.create_task(upstream_to_client())]
+    try:
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await upstream_ws.close()
+        try:
+            await websocket.close()
+        except (RuntimeError, WebSocketDisconnect, ConnectionClosed):
+            pass
@@ -0,0 +1,284 @@
+"""Route aggregate queries to pre-aggregated rollup tables.
+
+``scripts/rollups.py`` builds summary tables of ``plants.global_power_plants``
+and records them in ``meta.rollups``. A GROUP BY query against the fact
+table can be answered from any rollup whose dimensions include every
+non-aggregated expression in the query and whose measures cover every
+aggregate. The router parses the query with DuckDB (``json_serialize_sql``),
+checks that shape, and rewrites it against the smallest such rollup:
+
+    SUM(x)   -> SUM(x_sum)                 MIN(x) -> MIN(x_min)
+    COUNT(*) -> SUM(row_count)             MAX(x) -> MAX(x_max)
+    COUNT(x) -> SUM(x_count)               AVG(x) -> SUM(x_sum) / SUM(x_count)
+
+Anything it doesn't understand (joins, subqueries, windows, DISTINCT
+aggregates, filters on measures...) runs unchanged against the fact table.
+Output column names are kept, so callers can't tell the difference.
+"""
+
+import copy
+import json
+import os
+import threading
+from dataclasses import dataclass
+
+import duckdb
+
+# Rewritten aggregate, by function; {m} is the measure name
+REWRITES = {
+    "sum": "sum({m}_sum)",
+    "min": "min({m}_min)",
+    "max": "max({m}_max)",
+    "count": "COALESCE(sum({m}_count), 0)::BIGINT",
+    "avg": "sum({m}_sum) / NULLIF(sum({m}_count), 0)",
+    "count_star": "COALESCE(sum(row_count), 0)::BIGINT",
+}
+# Expressions that can't be answered from pre-aggregated rows
+UNSUPPORTED = {"SUBQUERY", "WINDOW", "STAR", "COLUMNS", "LAMBDA", "POSITIONAL_REFERENCE"}
+
+
+class NotRoutable(Exception):
+    pass
+
+
+@dataclass
+class RollupTable:
+    name: str
+    source: str
+    row_count: int
+    dimensions: dict[str, str]  # normalized expression key -> column name
+    measures: dict[str, str]
+
+
+def _normalize(node):
+    """Expression tree without positions, aliases or table qualifiers, for comparison."""
+    if isinstance(node, list):
+        return [_normalize(n) for n in node]
+    if not isinstance(node, dict):
+        return node
+    out = {k: _normalize(v) for k, v in node.items() if k not in ("query_location", "alias")}
+    if node.get("class") == "COLUMN_REF":
+        out["column_names"] = node["column_names"][-1:]
+    return out
+
+
+def _key(node) -> str:
+    return json.dumps(_normalize(node), sort_keys=True)
+
+
+def _children(node: dict):
+    """Direct sub-expressions of an expression node (through CASE arms, ORDER BYs, etc.)."""
+    for value in node.values():
+        yield from _expressions(value)
+
+
+def _expressions(value):
+    if isinstance(value, dict):
+        if "class" in value:
+            yield value
+        else:
+            for v in value.values():
+                yield from _expressions(v)
+    elif isinstance(value, list):
+        for v in value:
+            yield from _expressions(v)
+
+
+class RollupRouter:
+    """Rewrites compatible aggregate queries to the smallest covering rollup."""
+
+    def __init__(self, generation_path: str):
+        self.generation_path = generation_path
+        self._lock = threading.Lock()
+        self._stamp = object()
+        self._rollups: dict[str, list[RollupTable]] = {}
+        self._aggregates: set[str] = set()
+        self._templates: dict[str, dict] = {}
+
+    # -- catalog -------------------------------------------------------------
+
+    def _serialize(self, cur: duckdb.DuckDBPyConnection, sql: str) -> dict:
+        return json.loads(cur.execute("SELECT json_serialize_sql(?)", [sql]).fetchone()[0])
+
+    def _expression(self, cur: duckdb.DuckDBPyConnection, expr: str) -> dict:
+        tree = self._serialize(cur, f"SELECT {expr}")
+        return tree["statements"][0]["node"]["select_list"][0]
+
+    def _refresh(self, cur: duckdb.DuckDBPyConnection):
+        """Reload meta.rollups whenever the database generation changes."""
+        try:
+            stamp = os.stat(self.generation_path).st_mtime_ns
+        except FileNotFoundError:
+            stamp = None
+        if stamp == self._stamp:
+            return
+        with self._lock:
+            if stamp == self._stamp:
+                return
+            try:
+                rows = cur.execute(
+                    "SELECT name, source, definition, row_count FROM meta.rollups ORDER BY row_count"
+                ).fetchall()
+            except duckdb.CatalogException:
+                rows = []
+            rollups: dict[str, list[RollupTable]] = {}
+            for name, source, definition, row_count in rows:
+                definition = json.loads(definition)
+                rollups.setdefault(source, []).append(RollupTable(
+                    name, source, row_count,
+                    {_key(self._expression(cur, e)): n for n, e in definition["dimensions"].items()},
+                    {_key(self._expression(cur, e)): n for n, e in definition["measures"].items()},
+                ))
+            self._rollups = rollups
+            self._aggregates = {
+                name for (name,) in cur.execute(
+                    "SELECT DISTINCT function_name FROM duckdb_functions() WHERE function_type = 'aggregate'"
+                ).fetchall()
+            } | {"count_star"}
+            self._stamp = stamp
+
+    def _template(self, cur: duckdb.DuckDBPyConnection, expr: str) -> dict:
+        if expr not in self._templates:
+            self._templates[expr] = self._expression(cur, expr)
+        return copy.deepcopy(self._templates[expr])
+
+    # -- routing -------------------------------------------------------------
+
+    def rewrite(self, cur: duckdb.DuckDBPyConnection, sql: str, params=None) -> tuple[str, str] | None:
+        """Return ``(rewritten_sql, rollup_name)``, or None to run ``sql`` as is."""
+        self._refresh(cur)
+        if not self._rollups:
+            return None
+        tree = self._serialize(cur, sql)
+        if tree.get("error") or len(tree["statements"]) != 1:
+            return None
+        node = tree["statements"][0]["node"]
+        try:
+            candidates = self._check_shape(node)
+            dims, measures, aggregates = self._analyze(node, candidates)
+        except NotRoutable:
+            return None
+        if not aggregates and not node["group_expressions"] and node["aggregate_handling"] == "STANDARD_HANDLING":
+            return None  # not an aggregate query: rollup rows aren't source rows
+        rollup = next((
+            r for r in candidates
+            if dims <= r.dimensions.keys() and measures <= r.measures.keys()
+        ), None)
+        if rollup is None:
+            return None
+
+        names = [row[0] for row in cur.execute(f"DESCRIBE {sql}", params).fetchall()]
+        routed = self._apply(cur, node, rollup)
+        for expr, name in zip(routed["select_list"], names):
+            expr["alias"] = expr["alias"] or name
+        tree["statements"][0]["node"] = routed
+        rewritten = cur.execute("SELECT json_deserialize_sql(?)", [json.dumps(tree)]).fetchone()[0]
+        return rewritten, rollup.name
+
+    def _check_shape(self, node: dict) -> list[RollupTable]:
+        """Single-table SELECT over a fact table with rollups; returns them, smallest first."""
+        table = node.get("from_table") or {}
+        if (
+            node.get("type") != "SELECT_NODE"
+            or node["cte_map"]["map"]
+            or node.get("sample") or node.get("qualify")
+            or node["aggregate_handling"] not in ("STANDARD_HANDLING", "FORCE_AGGREGATES")
+            or table.get("type") != "BASE_TABLE"
+            or table.get("sample") or table.get("at_clause") or table.get("column_name_alias")
+            or any(m["type"] not in ("ORDER_MODIFIER", "LIMIT_MODIFIER", "DISTINCT_MODIFIER")
+                   for m in node["modifiers"])
+        ):
+            raise NotRoutable
+        source = f"{table['schema_name'] or 'main'}.{table['table_name']}"
+        if source not in self._rollups:
+            raise NotRoutable
+        return self._rollups[source]
+
+    def _analyze(self, node: dict, candidates: list[RollupTable]) -> tuple[set, set, int]:
+        """Dimension and measure keys a query needs, and how many aggregates it has."""
+        table = node["from_table"]
+        qualifiers = {(table["alias"] or table["table_name"],), (table["schema_name"], table["table_name"])}
+        all_dims = set().union(*(r.dimensions for r in candidates))
+        all_measures = set().union(*(r.measures for r in candidates))
+        aliases = {e["alias"] for e in node["select_list"] if e.get("alias")}
+        dims, measures = set(), set()
+        aggregates = 0
+
+        def visit(expr: dict, allow_aggregates: bool, allow_aliases: bool):
+            nonlocal aggregates
+            cls = expr["class"]
+            if cls in UNSUPPORTED:
+                raise NotRoutable
+            key = _key(expr)
+            if key in all_dims:
+                dims.add(key)
+                self._check_qualifiers(expr, qualifiers)
+                return
+            if cls == "COLUMN_REF":
+                if allow_aliases and len(expr["column_names"]) == 1 and expr["column_names"][0] in aliases:
+                    return
+                raise NotRoutable  # a non-dimension column outside an aggregate
+            if cls == "FUNCTION" and expr["function_name"] in self._aggregates:
+                if (
+                    not allow_aggregates
+                    or expr["function_name"] not in REWRITES
+                    or expr["distinct"] or expr["filter"] or expr["order_bys"]["orders"]
+                ):
+                    raise NotRoutable
+                aggregates += 1
+                if expr["function_name"] == "count_star":
+                    return
+                if len(expr["children"]) != 1 or _key(expr["children"][0]) not in all_measures:
+                    raise NotRoutable
+                self._check_qualifiers(expr["children"][0], qualifiers)
+                measures.add(_key(expr["children"][0]))
+                return
+            for child in _children(expr):
+                visit(child, allow_aggregates, allow_aliases)
+
+        for expr in node["select_list"]:
+            visit(expr, allow_aggregates=True, allow_aliases=False)
+        if node["where_clause"]:
+            visit(node["where_clause"], allow_aggregates=False, allow_aliases=False)
+        for expr in node["group_expressions"]:
+            visit(expr, allow_aggregates=False, allow_aliases=True)
+        if node["having"]:
+            visit(node["having"], allow_aggregates=True, allow_aliases=True)
+        for modifier in node["modifiers"]:
+            for expr in _children(modifier):
+                visit(expr, allow_aggregates=True, allow_aliases=True)
+        return dims, measures, aggregates
+
+    @staticmethod
+    def _check_qualifiers(expr: dict, qualifiers: set):
+        if expr["class"] == "COLUMN_REF" and tuple(expr["column_names"][:-1]) not in qualifiers | {()}:
+            raise NotRoutable
+        for child in _children(expr):
+            RollupRouter._check_qualifiers(child, qualifiers)
+
+    def _apply(self, cur: duckdb.DuckDBPyConnection, node: dict, rollup: RollupTable) -> dict:
+        """Copy of ``node`` reading from ``rollup``."""
+        def transform(expr):
+            if isinstance(expr, list):
+                return [transform(e) for e in expr]
+            if not isinstance(expr, dict):
+                return expr
+            if "class" in expr:
+                key = _key(expr)
+                if key in rollup.dimensions:
+                    return {
+                        "class": "COLUMN_REF", "type": "COLUMN_REF", "alias": expr["alias"],
+                        "query_location": expr.get("query_location", 0),
+                        "column_names": [rollup.dimensions[key]],
+                    }
+                if expr["class"] == "FUNCTION" and expr["function_name"] in REWRITES and expr["function_name"] in self._aggregates:
+                    measure = "" if expr["function_name"] == "count_star" else rollup.measures[_key(expr["children"][0])]
+                    replacement = self._template(cur, REWRITES[expr["function_name"]].format(m=measure))
+                    replacement["alias"] = expr["alias"]
+                    return replacement
+            return {k: transform(v) for k, v in expr.items()}
+
+        routed = transform({k: v for k, v in node.items() if k != "from_table"})
+        schema, name = rollup.name.split(".")
+        routed["from_table"] = {**node["from_table"], "schema_name": schema, "table_name": name}
+        return routed
@@ -0,0 +1,230 @@
+"""Typeahead search over plant names, owners and countries.
+
+``scripts/search_index.py`` stores a token vocabulary, a trigram index over
+that vocabulary and token -> plant postings in the database. Each worker
+loads them into numpy arrays once per database generation, so a search
+never queries DuckDB:
+
+1. Every query term is matched against the sorted vocabulary: exactly, as a
+   prefix (the last term, while it is still being typed), or when neither
+   matches by trigram similarity to catch misspellings ("botom" -> "bottom").
+2. The matched tokens' postings give the plants. Postings are ordered by
+   capacity, so a very common token contributes its largest plants first,
+   up to ``TERM_POSTINGS`` per term.
+3. Plants matching more terms rank first, then by score (match quality x
+   field weight: name > owner > country), then by capacity.
+"""
+
+import bisect
+import os
+import threading
+import unicodedata
+from dataclasses import dataclass
+
+import duckdb
+import numpy as np
+import pyarrow as pa
+
+# Field codes from scripts/search_index.py, and how much a match in each counts
+FIELDS = {1: "name", 2: "owner", 3: "country_long"}
+FIELD_WEIGHTS = np.array([0.0, 1.0, 0.6, 0.4])
+PREFIX_SCORE = 0.8
+FUZZY_SCORE = 0.7  # times the trigram similarity
+FUZZY_THRESHOLD = 0.35  # shared / total distinct trigrams, as pg_trgm's similarity()
+MAX_EXPANSIONS = 32  # vocabulary tokens one prefix or misspelling may stand for
+TERM_POSTINGS = 20_000
+MAX_TERMS = 8
+
+
+def normalize(text: str) -> list[str]:
+    """Tokens as ``search_tokens()`` produces them in the database."""
+    text = "".join(c for c in unicodedata.normalize("NFKD", text.lower()) if not unicodedata.combining(c))
+    return "".join(c if ("a" <= c <= "z" or "0" <= c <= "9") else " " for c in text).split()
+
+
+def trigrams(token: str) -> set[str]:
+    padded = f"  {token} "
+    return {padded[i:i + 3] for i in range(len(token) + 1)}
+
+
+@dataclass
+class Index:
+    tokens: list[str]  # sorted
+    token_ids: np.ndarray  # aligned with tokens
+    doc_counts: np.ndarray  # aligned with tokens
+    trigram_counts: np.ndarray  # by token id
+    trigram_slices: dict[str, tuple[int, int]]  # trigram -> range of trigram_tokens
+    trigram_tokens: np.ndarray
+    offsets: np.ndarray  # token id -> range of postings
+    posting_docs: np.ndarray  # document rank (0 = largest plant)
+    posting_fields: np.ndarray
+    documents: pa.Table  # ordered by rank
+
+    def _expand(self, term: str, prefix: bool) -> tuple[np.ndarray, np.ndarray]:
+        """Vocabulary token ids ``term`` stands for, and how well each matches."""
+        lo = bisect.bisect_left(self.tokens, term)
+        exact = lo < len(self.tokens) and self.tokens[lo] == term
+        ids, scores = [], []
+        if exact:
+            ids.append(self.token_ids[lo:lo + 1])
+            scores.append(np.ones(1))
+        if prefix:
+            # Tokens are [a-z0-9], so "{" sorts after every token starting with term
+            start, end = lo + exact, bisect.bisect_left(self.tokens, term + "{", lo)
+            if end > start:
+                candidates = np.arange(start, end)
+                if len(candidates) > MAX_EXPANSIONS:
+                    counts = self.doc_counts[start:end]
+                    candidates = candidates[np.argpartition(-counts, MAX_EXPANSIONS)[:MAX_EXPANSIONS]]
+                ids.append(self.token_ids[candidates])
+                scores.append(np.full(len(candidates), PREFIX_SCORE))
+        if not ids and len(term) >= 3:
+            grams = trigrams(term)
+            lists = [self.trigram_tokens[slice(*self.trigram_slices[g])] for g in grams if g in self.trigram_slices]
+            if lists:
+                candidates, shared = np.unique(np.concatenate(lists), return_counts=True)
+                similarity = shared / (len(grams) + self.trigram_counts[candidates] - shared)
+                keep = np.flatnonzero(similarity >= FUZZY_THRESHOLD)
+                if len(keep) > MAX_EXPANSIONS:
+                    keep = keep[np.argpartition(-similarity[keep], MAX_EXPANSIONS)[:MAX_EXPANSIONS]]
+                ids.append(candidates[keep])
+                scores.append(similarity[keep] * FUZZY_SCORE)
+        if not ids:
+            return np.empty(0, np.int32), np.empty(0)
+        return np.concatenate(ids), np.concatenate(scores)
+
+    def _matches(self, token_ids: np.ndarray, scores: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(document, score, field) of the best match per document for one term."""
+        docs, weighted, fields = [], [], []
+        budget = TERM_POSTINGS
+        for i in np.argsort(-scores, kind="stable"):
+            start = self.offsets[token_ids[i]]
+            end = min(self.offsets[token_ids[i] + 1], start + budget)
+            docs.append(self.posting_docs[start:end])
+            field = self.posting_fields[start:end]
+            fields.append(field)
+            weighted.append(scores[i] * FIELD_WEIGHTS[field])
+            budget -= end - start
+            if budget <= 0:
+                break
+        docs, weighted, fields = np.concatenate(docs), np.concatenate(weighted), np.concatenate(fields)
+        order = np.lexsort((-weighted, docs))
+        docs, weighted, fields = docs[order], weighted[order], fields[order]
+        best = np.flatnonzero(np.r_[True, docs[1:] != docs[:-1]])
+        return docs[best], weighted[best], fields[best]
+
+    def search(self, query: str, limit: int = 10) -> list[dict]:
+        """Ranked plants matching ``query``; the last term matches as a prefix unless followed by a space."""
+        terms = list(dict.fromkeys(normalize(query)))[:MAX_TERMS]
+        typing = not query[-1:].isspace()
+        matches = []
+        for i, term in enumerate(terms):
+            token_ids, scores = self._expand(term, prefix=typing and i == len(terms) - 1)
+            if len(token_ids):
+                matches.append(self._matches(token_ids, scores))
+        if not matches:
+            return []
+
+        docs = np.concatenate([m[0] for m in matches])
+        scores = np.concatenate([m[1] for m in matches])
+        fields = np.concatenate([m[2] for m in matches])
+        order = np.lexsort((-scores, docs))
+        docs, scores, fields = docs[order], scores[order], fields[order]
+        starts = np.flatnonzero(np.r_[True, docs[1:] != docs[:-1]])
+        terms_matched = np.diff(np.r_[starts, len(docs)])
+        totals = np.add.reduceat(scores, starts)
+        # Each document's best match comes first in its run
+        docs, fields = docs[starts], fields[starts]
+
+        top = np.lexsort((docs, -totals, -terms_matched))[:limit]
+        rows = self.documents.take(pa.array(docs[top])).to_pylist()
+        for row, i in zip(rows, top):
+            row["score"] = round(float(totals[i]) / len(terms), 3)
+            row["matched"] = FIELDS[int(fields[i])]
+        return rows
+
+
+def load(cur: duckdb.DuckDBPyConnection) -> Index | None:
+    """Read the search tables into memory; None if the database has no index."""
+    try:
+        vocabulary = cur.execute(
+            "SELECT token, token_id, doc_count, trigram_count FROM plants.search_vocabulary ORDER BY token"
+        ).fetch_arrow_table()
+    except duckdb.CatalogException:
+        return None
+    token_ids = vocabulary["token_id"].to_numpy()
+    size = int(token_ids.max()) + 1 if len(token_ids) else 1
+    trigram_counts = np.zeros(size, np.int32)
+    trigram_counts[token_ids] = vocabulary["trigram_count"].to_numpy()
+
+    grams = cur.execute(
+        "SELECT trigram, COUNT(*) FROM plants.search_trigrams GROUP BY trigram ORDER BY trigram"
+    ).fetchall()
+    trigram_tokens = cur.execute(
+        "SELECT token_id FROM plants.search_trigrams ORDER BY trigram, token_id"
+    ).fetch_arrow_table()["token_id"].to_numpy()
+    trigram_slices, start = {}, 0
+    for gram, count in grams:
+        trigram_slices[gram] = (start, start + count)
+        start += count
+
+    # Documents are ranked by capacity, and postings follow that order within each token
+    postings = cur.execute("""
+        SELECT p.token_id, r.rank, p.field
+        FROM plants.search_postings p
+        JOIN (
+            SELECT doc_id, (row_number() OVER (ORDER BY capacity_mw DESC NULLS LAST, plant_id) - 1)::INTEGER AS rank
+            FROM plants.search_documents
+        ) r USING (doc_id)
+        ORDER BY p.token_id, r.rank
+    """).fetch_arrow_table()
+    documents = cur.execute("""
+        SELECT plant_id, name, owner, country_long, primary_fuel, capacity_mw
+        FROM plants.search_documents
+        ORDER BY capacity_mw DESC NULLS LAST, plant_id
+    """).fetch_arrow_table()
+    posting_tokens = postings["token_id"].to_numpy()
+    offsets = np.searchsorted(posting_tokens, np.arange(size + 1))
+
+    return Index(
+        tokens=vocabulary["token"].to_pylist(),
+        token_ids=token_ids,
+        doc_counts=vocabulary["doc_count"].to_numpy(),
+        trigram_counts=trigram_counts,
+        trigram_slices=trigram_slices,
+        trigram_tokens=trigram_tokens,
+        offsets=offsets,
+        posting_docs=postings["rank"].to_numpy(),
+        posting_fields=postings["field"].to_numpy(),
+        # One chunk: take() on a chunked table costs time proportional to its size
+        documents=documents.combine_chunks(),
+    )
+
+
+class SearchIndex:
+    """The in-memory index of the current database generation."""
+
+    def __init__(self, generation_path: str):
+        self.generation_path = generation_path
+        self._lock = threading.Lock()
+        self._stamp = object()
+        self._index: Index | None = None
+
+    def current(self, cur: duckdb.DuckDBPyConnection) -> Index | None:
+        """Reload when the generation changes; other callers keep using the old index meanwhile."""
+        try:
+            stamp = os.stat(self.generation_path).st_mtime_ns
+        except FileNotFoundError:
+            stamp = None
+        if stamp == self._stamp:
+            return self._index
+        if not self._lock.acquire(blocking=self._index is None):
+            return self._index
+        try:
+            if stamp != self._stamp:
+                self._index = load(cur)
+                self._stamp = stamp
+        finally:
+            self._lock.release()
+        return self._index
+
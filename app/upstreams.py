@@ -0,0 +1,142 @@
+"""Upstream services (Jupyter, Superset, Duck-UI) and the deep health check.
+
+``JUPYTER_URL`` and friends are the addresses browsers use; from inside the
+frontend container the services are reached at ``*_INTERNAL_URL`` (defaulting
+to the public URL, which works outside Docker).
+
+All requests share one pooled ``httpx.AsyncClient``. ``checker.check()``
+probes every upstream concurrently plus the DuckDB file and the age of the
+last seed, and caches the aggregate for ``HEALTH_CACHE_SECONDS``. Concurrent
+callers share a single in-flight probe, so a burst of load balancer checks
+causes at most one round of upstream requests per cache period.
+"""
+
+import asyncio
+import os
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+
+import httpx
+
+import database
+
+PROBE_TIMEOUT = float(os.getenv("HEALTH_PROBE_TIMEOUT_SECONDS", "2"))
+HEALTH_CACHE_SECONDS = float(os.getenv("HEALTH_CACHE_SECONDS", "5"))
+SEED_MAX_AGE_HOURS = float(os.getenv("SEED_MAX_AGE_HOURS", "72"))  # 0 = don't check
+
+# name -> (internal base URL, probe path)
+UPSTREAMS = {
+    "jupyter": (
+        os.getenv("JUPYTER_INTERNAL_URL", os.getenv("JUPYTER_URL", "http://localhost:8888")), "/api"),
+    "superset": (
+        os.getenv("SUPERSET_INTERNAL_URL", os.getenv("SUPERSET_URL", "http://localhost:8088")), "/health"),
+    "duckdb-ui": (
+        os.getenv("DUCKDB_INTERNAL_URL", os.getenv("DUCKDB_URL", "http://localhost:5522")), "/"),
+}
+
+_client: httpx.AsyncClient | None = None
+
+
+def client() -> httpx.AsyncClient:
+    """The shared HTTP client, created on first use."""
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            timeout=httpx.Timeout(PROBE_TIMEOUT),
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            # Shared by every user of the proxy, so upstream cookies must never be kept
+            cookies=CookieJar(policy=DefaultCookiePolicy(allowed_domains=[])),
+        )
+    return _client
+
+
+async def close():
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+@dataclass
+class Check:
+    name: str
+    ok: bool
+    elapsed_ms: float
+    detail: str | None = None
+
+
+async def probe(name: str, base_url: str, path: str) -> Check:
+    """GET ``path`` on an upstream; any response below 500 counts as up."""
+    start = time.perf_counter()
+    try:
+        response = await client().get(base_url.rstrip("/") + path)
+        ok, detail = response.status_code < 500, f"HTTP {response.status_code}"
+    except httpx.HTTPError as e:
+        ok, detail = False, f"{type(e).__name__}: {e}" if str(e) else type(e).__name__
+    return Check(name, ok, round((time.perf_counter() - start) * 1000, 2), detail)
+
+
+async def check_database() -> Check:
+    """Open the database read-only and check when a source was last loaded."""
+    start = time.perf_counter()
+
+    def last_load(cur):
+        return cur.execute("SELECT MAX(loaded_at) FROM meta.source_manifest").fetchone()[0]
+
+    try:
+        loaded_at = await database.run(last_load, timeout=PROBE_TIMEOUT)
+    except (database.DatabaseUnavailable, database.QueryTimeout) as e:
+        return Check("duckdb", False, round((time.perf_counter() - start) * 1000, 2), str(e))
+    except Exception as e:  # e.g. no manifest in a database seeded by an older version
+        return Check("duckdb", False, round((time.perf_counter() - start) * 1000, 2), f"{type(e).__name__}: {e}")
+    elapsed = round((time.perf_counter() - start) * 1000, 2)
+    if loaded_at is None:
+        return Check("duckdb", False, elapsed, "no source has been loaded")
+    age_hours = (datetime.now() - loaded_at).total_seconds() / 3600
+    detail = f"last load {loaded_at:%Y-%m-%d %H:%M} ({age_hours:.1f}h ago)"
+    if SEED_MAX_AGE_HOURS and age_hours > SEED_MAX_AGE_HOURS:
+        return Check("duckdb", False, elapsed, f"{detail}, older than SEED_MAX_AGE_HOURS={SEED_MAX_AGE_HOURS:g}")
+    return Check("duckdb", True, elapsed, detail)
+
+
+class HealthChecker:
+    """Cached, single-flight aggregate of every check."""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._result: dict | None = None
+        self._expires = 0.0
+        self._inflight: asyncio.Task | None = None
+        self.probes = 0  # rounds of checks actually run
+
+    async def _run(self) -> dict:
+        self.probes += 1
+        checks = await asyncio.gather(
+            check_database(),
+            *(probe(name, url, path) for name, (url, path) in UPSTREAMS.items()),
+        )
+        return {
+            "status": "healthy" if all(c.ok for c in checks) else "unhealthy",
+            "checked_at": datetime.now().isoformat(timespec="seconds"),
+            "checks": {c.name: asdict(c) for c in checks},
+        }
+
+    async def check(self) -> dict:
+        if self._result is not None and time.monotonic() < self._expires:
+            return self._result
+        if self._inflight is None:
+            self._inflight = asyncio.create_task(self._run())
+            self._inflight.add_done_callback(self._finished)
+        # Shielded: a client disconnecting mustn't cancel the probe other callers are waiting on
+        return await asyncio.shield(self._inflight)
+
+    def _finished(self, task: asyncio.Task):
+        self._inflight = None
+        if not task.cancelled() and task.exception() is None:
+            self._result = task.result()
+            self._expires = time.monotonic() + self.ttl
+
+
+checker = HealthChecker(HEALTH_CACHE_SECONDS)
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Benchmark the seed pipeline and the queries behind the notebooks and dashboards.
+
+For each scale, generates synthetic sources (``synthetic.py``) in a scratch
+directory, runs every non-fetch step of the seed pipeline against a fresh
+database there, then times each query in ``QUERIES`` on a read-only
+connection, as the frontend and Superset open it. Nothing is downloaded.
+
+Results are written as JSON (one file per run) so runs can be compared:
+
+    python scripts/benchmark.py --scale 1 10 100
+    python scripts/benchmark.py --scale 10 --compare data/benchmarks/<earlier run>.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import duckdb
+
+from seed_data import DATA_DIR, build_pipeline, prepare_database
+from synthetic import generate_sources
+
+RESULTS_DIR = DATA_DIR / "benchmarks"
+
+# Notebook and dashboard queries; {data} is the scratch data directory
+QUERIES = {
+    # Superset "Global Capacity by Fuel Type" chart (as Superset writes it)
+    "capacity_by_fuel": """
+        SELECT primary_fuel AS primary_fuel, sum(capacity_mw) AS "SUM(capacity_mw)"
+        FROM plants.global_power_plants
+        GROUP BY primary_fuel
+        ORDER BY "SUM(capacity_mw)" DESC
+        LIMIT 15
+    """,
+    # Superset "Top 20 Countries by Capacity"
+    "top_countries": """
+        SELECT country_long AS country_long, sum(capacity_mw) AS "SUM(capacity_mw)"
+        FROM plants.global_power_plants
+        GROUP BY country_long
+        ORDER BY "SUM(capacity_mw)" DESC
+        LIMIT 20
+    """,
+    # Superset "US Nuclear Plants" table
+    "us_nuclear": """
+        SELECT name, capacity_mw, commissioning_year, owner
+        FROM plants.us_nuclear_plants
+        LIMIT 100
+    """,
+    # Notebook: US plants by fuel, straight from the fact table
+    "us_capacity_by_fuel": """
+        SELECT primary_fuel, COUNT(*) AS plants, ROUND(SUM(capacity_mw), 0) AS total_mw
+        FROM plants.global_power_plants
+        WHERE country = 'USA'
+        GROUP BY primary_fuel
+        ORDER BY total_mw DESC
+    """,
+    # Notebook: plants near Chicago, the original box scan and the grid index
+    "proximity_box_scan": """
+        SELECT name, primary_fuel, capacity_mw
+        FROM plants.global_power_plants
+        WHERE country = 'USA' AND ABS(latitude - 41.88) < 1.0 AND ABS(longitude - -87.63) < 1.0
+        ORDER BY capacity_mw DESC
+        LIMIT 15
+    """,
+    "proximity_indexed": """
+        SELECT name, primary_fuel, capacity_mw
+        FROM plants_within(41.88, -87.63, 100)
+        ORDER BY capacity_mw DESC
+        LIMIT 15
+    """,
+    # The same 100 km search without the index: a lat/lon box, then the exact distance
+    "proximity_box_haversine": """
+        SELECT name, primary_fuel, capacity_mw
+        FROM plants.global_power_plants
+        WHERE latitude BETWEEN 41.88 - 100 / 111.0 AND 41.88 + 100 / 111.0
+          AND longitude BETWEEN -87.63 - 100 / 111.0 / cos(radians(41.88))
+                            AND -87.63 + 100 / 111.0 / cos(radians(41.88))
+          AND haversine_km(41.88, -87.63, latitude, longitude) <= 100
+        ORDER BY capacity_mw DESC
+        LIMIT 15
+    """,
+    # Duck-UI / notebooks reading the partitioned Parquet export
+    "parquet_us_nuclear": """
+        SELECT name, capacity_mw
+        FROM read_parquet('{data}/global_power_plants/**/*.parquet', hive_partitioning = true)
+        WHERE country = 'USA' AND primary_fuel = 'Nuclear'
+    """,
+    "reactor_fleet_monthly": """
+        SELECT period_start, capacity_factor, outage_days
+        FROM regulatory.reactor_power_monthly
+        WHERE unit IS NULL
+        ORDER BY period_start
+    """,
+}
+
+# Seed steps that read source files; the rest derive from tables
+INGEST_STEPS = ("seed_wri_power_plants", "seed_nrc_reactor_status")
+
+
+def percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))]
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=Path(__file__).parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_seed(directory: Path, workers: int) -> dict:
+    """Run the seed pipeline (minus downloads) on the sources in ``directory``."""
+    pipeline = build_pipeline(data_dir=directory)
+    selected = {step.name for step in pipeline.steps if not step.name.startswith("fetch_")}
+    con = duckdb.connect(str(directory / "fissio.duckdb"))
+    prepare_database(con)
+    start = time.perf_counter()
+    results = pipeline.run(con, selected, max_workers=workers)
+    wall = time.perf_counter() - start
+    con.close()
+
+    failed = [r for r in results.values() if not r.succeeded]
+    if failed:
+        raise RuntimeError(f"Seed steps failed: {', '.join(f'{r.name} ({r.error})' for r in failed)}")
+    steps = {name: round(r.seconds, 3) for name, r in results.items()}
+    return {
+        "wall_seconds": round(wall, 3),
+        "ingest_seconds": round(sum(steps[s] for s in INGEST_STEPS), 3),
+        "export_seconds": round(sum(t for s, t in steps.items() if s.startswith("export_")), 3),
+        "steps": steps,
+    }
+
+
+def run_queries(directory: Path, rounds: int) -> dict:
+    """p50/p95 latency of every query over ``rounds`` runs, after one warm-up run."""
+    con = duckdb.connect(str(directory / "fissio.duckdb"), read_only=True)
+    timings = {}
+    for name, sql in QUERIES.items():
+        sql = sql.format(data=directory)
+        rows = len(con.execute(sql).fetchall())
+        samples = []
+        for _ in range(rounds):
+            start = time.perf_counter()
+            con.execute(sql).fetchall()
+            samples.append((time.perf_counter() - start) * 1000)
+        timings[name] = {
+            "rows": rows,
+            "p50_ms": round(statistics.median(samples), 3),
+            "p95_ms": round(percentile(samples, 95), 3),
+            "min_ms": round(min(samples), 3),
+        }
+    con.close()
+    return timings
+
+
+def run_scale(scale: float, rounds: int, workers: int, workdir: Path | None, seed: int) -> dict:
+    directory = Path(tempfile.mkdtemp(prefix=f"fissio-bench-x{scale:g}-", dir=workdir))
+    try:
+        start = time.perf_counter()
+        rows = generate_sources(directory, scale, seed)
+        generate_seconds = time.perf_counter() - start
+        print(f"\n[x{scale:g}] generated {sum(rows.values()):,} source rows in {generate_seconds:.1f}s")
+
+        seed_result = run_seed(directory, workers)
+        print(f"  seed: {seed_result['wall_seconds']:.2f}s "
+              f"(ingest {seed_result['ingest_seconds']:.2f}s, export {seed_result['export_seconds']:.2f}s)")
+
+        queries = run_queries(directory, rounds)
+        for name, t in queries.items():
+            print(f"  {name:<24} p50 {t['p50_ms']:>9.2f} ms   p95 {t['p95_ms']:>9.2f} ms   {t['rows']:>6} rows")
+        return {
+            "scale": scale,
+            "source_rows": rows,
+            "database_bytes": (directory / "fissio.duckdb").stat().st_size,
+            "generate_seconds": round(generate_seconds, 3),
+            "seed": seed_result,
+            "queries": queries,
+        }
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def compare(current: dict, baseline: dict):
+    """Print current vs. baseline for every metric present in both runs."""
+    print(f"\nCompared with {baseline['run_at']} ({baseline.get('git_commit') or 'unknown commit'}):")
+    print(f"{'scale':>6} {'metric':<38} {'baseline':>10} {'current':>10} {'change':>8}")
+    baseline_by_scale = {r["scale"]: r for r in baseline["results"]}
+    for result in current["results"]:
+        before = baseline_by_scale.get(result["scale"])
+        if before is None:
+            continue
+        metrics = [
+            ("seed wall s", result["seed"]["wall_seconds"], before["seed"]["wall_seconds"]),
+            ("ingest s", result["seed"]["ingest_seconds"], before["seed"]["ingest_seconds"]),
+            ("export s", result["seed"]["export_seconds"], before["seed"]["export_seconds"]),
+        ]
+        for name, t in result["queries"].items():
+            if name in before["queries"]:
+                metrics.append((f"{name} p50 ms", t["p50_ms"], before["queries"][name]["p50_ms"]))
+                metrics.append((f"{name} p95 ms", t["p95_ms"], before["queries"][name]["p95_ms"]))
+        for label, now, then in metrics:
+            change = f"{(now - then) / then:+.0%}" if then else "-"
+            print(f"{result['scale']:>6g} {label:<38} {then:>10.3f} {now:>10.3f} {change:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark seeding and analytics queries on synthetic data")
+    parser.add_argument("--scale", type=float, nargs="+", default=[1], help="Multiples of the real row counts")
+    parser.add_argument("--rounds", type=int, default=20, help="Timed runs per query")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent pipeline steps")
+    parser.add_argument("--seed", type=int, default=0, help="Synthetic data seed")
+    parser.add_argument("--workdir", type=Path, help="Scratch directory (default: system temp)")
+    parser.add_argument("--output", type=Path, help=f"Results file (default: {RESULTS_DIR}/<time>.json)")
+    parser.add_argument("--compare", type=Path, help="Earlier results file to compare against")
+    args = parser.parse_args()
+
+    run_at = datetime.now(timezone.utc)
+    report = {
+        "run_at": run_at.isoformat(timespec="seconds"),
+        "git_commit": git_commit(),
+        "duckdb_version": duckdb.__version__,
+        "python_version": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "rounds": args.rounds,
+        "seed": args.seed,
+        "results": [run_scale(s, args.rounds, args.workers, args.workdir, args.seed) for s in args.scale],
+    }
+
+    output = args.output or RESULTS_DIR / f"{run_at:%Y%m%dT%H%M%SZ}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        compare(report, json.loads(args.compare.read_text()))
+
+
+if __name__ == "__main__":
+    main()
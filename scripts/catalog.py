@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Column statistics for filter UIs and table listings (``meta.table_stats``, ``meta.column_stats``).
+
+Each catalogued table is profiled in two scans right after it is loaded:
+
+1. One aggregate query for every column at once: non-null count, min, max
+   and an approximate (HyperLogLog) distinct count.
+2. One query for the columns that need it: every value with its count for
+   columns with at most ``VALUE_COUNTS_MAX_DISTINCT`` distinct values (so a
+   dropdown can list them all), approximate top-k values for the rest, and
+   an equi-width histogram of each numeric column.
+
+The frontend serves the result from ``/api/catalog``, so filter dropdowns
+and table listings read a few hundred catalogue rows instead of running
+``SELECT DISTINCT`` or min/max scans over the fact tables.
+
+Usage:
+    python scripts/catalog.py plants.global_power_plants   # Profile tables in data/fissio.duckdb and print them
+"""
+
+import argparse
+import json
+from pathlib import Path
+
+import duckdb
+
+# Columns with at most this many distinct values get every value with its count
+VALUE_COUNTS_MAX_DISTINCT = 1000
+# Approximate most-frequent values kept for higher-cardinality columns
+TOP_K = 20
+# Target bucket count; bounds are rounded to readable values, so the actual count varies a little
+HISTOGRAM_BINS = 20
+NUMERIC_TYPES = ("TINYINT", "SMALLINT", "INTEGER", "BIGINT", "HUGEINT", "UTINYINT", "USMALLINT", "UINTEGER",
+                 "UBIGINT", "FLOAT", "DOUBLE", "DECIMAL")
+TOP_VALUES_TYPE = "STRUCT(value VARCHAR, count BIGINT)[]"
+HISTOGRAM_TYPE = "STRUCT(lower DOUBLE, upper DOUBLE, count BIGINT)[]"
+
+
+def ensure_stats(con: duckdb.DuckDBPyConnection):
+    """Create the statistics tables."""
+    con.execute("CREATE SCHEMA IF NOT EXISTS meta")
+    con.execute("""
+        CREATE TABLE IF NOT EXISTS meta.table_stats (
+            table_schema VARCHAR,
+            table_name VARCHAR,
+            row_count BIGINT,
+            column_count INTEGER,
+            computed_at TIMESTAMP,
+            PRIMARY KEY (table_schema, table_name)
+        )
+    """)
+    con.execute(f"""
+        CREATE TABLE IF NOT EXISTS meta.column_stats (
+            table_schema VARCHAR,
+            table_name VARCHAR,
+            column_name VARCHAR,
+            ordinal INTEGER,
+            data_type VARCHAR,
+            row_count BIGINT,
+            null_count BIGINT,
+            null_fraction DOUBLE,
+            min_value VARCHAR,
+            max_value VARCHAR,
+            approx_distinct BIGINT,
+            -- Sorted by count; every value when values_complete, else the approximate top-k (count NULL)
+            top_values {TOP_VALUES_TYPE},
+            values_complete BOOLEAN,
+            -- Numeric columns: equi-width buckets, each holding values in (previous upper, upper]
+            histogram {HISTOGRAM_TYPE},
+            computed_at TIMESTAMP,
+            PRIMARY KEY (table_schema, table_name, column_name)
+        )
+    """)
+
+
+def quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def is_numeric(data_type: str) -> bool:
+    return data_type.startswith(NUMERIC_TYPES)
+
+
+def profile(con: duckdb.DuckDBPyConnection, table: str) -> tuple[int, list[dict]]:
+    """Row count and per-column statistics of ``table``."""
+    schema, name = table.split(".")
+    columns = con.execute("""
+        SELECT column_name, data_type FROM information_schema.columns
+        WHERE table_schema = ? AND table_name = ?
+        ORDER BY ordinal_position
+    """, [schema, name]).fetchall()
+
+    # Scan 1: counts, bounds and distinct estimates for every column
+    aggregates = ["COUNT(*)"]
+    for column, _ in columns:
+        c = quote(column)
+        aggregates += [f"COUNT({c})", f"MIN({c})::VARCHAR", f"MAX({c})::VARCHAR", f"approx_count_distinct({c})"]
+    row = con.execute(f"SELECT {', '.join(aggregates)} FROM {table}").fetchone()
+    row_count = row[0]
+    stats = []
+    for i, (column, data_type) in enumerate(columns):
+        non_null, min_value, max_value, distinct = row[1 + 4 * i: 5 + 4 * i]
+        stats.append({
+            "column_name": column,
+            "ordinal": i + 1,
+            "data_type": data_type,
+            "row_count": row_count,
+            "null_count": row_count - non_null,
+            "null_fraction": (row_count - non_null) / row_count if row_count else 0.0,
+            "min_value": min_value,
+            "max_value": max_value,
+            "approx_distinct": distinct,
+            "top_values": None,
+            "values_complete": False,
+            "histogram": None,
+        })
+
+    # Scan 2: value counts, top-k and histograms
+    aggregates, readers = [], []
+    for s in stats:
+        c = quote(s["column_name"])
+        if not s["approx_distinct"]:
+            continue
+        if s["approx_distinct"] <= VALUE_COUNTS_MAX_DISTINCT:
+            aggregates.append(f"histogram({c}::VARCHAR)")
+            readers.append((s, "values"))
+        else:
+            aggregates.append(f"approx_top_k({c}::VARCHAR, {TOP_K})")
+            readers.append((s, "top_k"))
+        if is_numeric(s["data_type"]) and s["min_value"] != s["max_value"]:
+            aggregates.append(
+                f"histogram({c}, equi_width_bins('{s['min_value']}'::DOUBLE, '{s['max_value']}'::DOUBLE, "
+                f"{HISTOGRAM_BINS}, true))"
+            )
+            readers.append((s, "histogram"))
+    if aggregates:
+        values = con.execute(f"SELECT {', '.join(aggregates)} FROM {table}").fetchone()
+        for (s, kind), value in zip(readers, values):
+            if kind == "values":
+                counts = sorted(value.items(), key=lambda item: (-item[1], item[0]))
+                s["top_values"] = [{"value": v, "count": n} for v, n in counts]
+                # The estimate may have let through a column with a few too many values
+                s["values_complete"] = len(counts) <= VALUE_COUNTS_MAX_DISTINCT
+                del s["top_values"][VALUE_COUNTS_MAX_DISTINCT:]
+            elif kind == "top_k":
+                s["top_values"] = [{"value": v, "count": None} for v in value]
+            else:
+                lower = float(s["min_value"])
+                s["histogram"] = []
+                for upper, count in value.items():
+                    s["histogram"].append({"lower": lower, "upper": upper, "count": count})
+                    lower = upper
+    return row_count, stats
+
+
+def build_stats(con: duckdb.DuckDBPyConnection, table: str) -> int:
+    """Profile ``table`` and replace its rows in the statistics tables. Returns the row count."""
+    schema, name = table.split(".")
+    row_count, stats = profile(con, table)
+    con.execute("BEGIN TRANSACTION")
+    try:
+        con.execute("DELETE FROM meta.table_stats WHERE table_schema = ? AND table_name = ?", [schema, name])
+        con.execute("DELETE FROM meta.column_stats WHERE table_schema = ? AND table_name = ?", [schema, name])
+        con.execute("INSERT INTO meta.table_stats VALUES (?, ?, ?, ?, current_timestamp::TIMESTAMP)",
+                    [schema, name, row_count, len(stats)])
+        # One multi-row INSERT; the nested lists go in as JSON, which binds far faster than Python dicts
+        row = (f"(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?::JSON::{TOP_VALUES_TYPE}, ?, ?::JSON::{HISTOGRAM_TYPE}, "
+               "current_timestamp::TIMESTAMP)")
+        params = []
+        for s in stats:
+            params += [schema, name, s["column_name"], s["ordinal"], s["data_type"], s["row_count"], s["null_count"],
+                       s["null_fraction"], s["min_value"], s["max_value"], s["approx_distinct"],
+                       json.dumps(s["top_values"]), s["values_complete"], json.dumps(s["histogram"])]
+        if stats:
+            con.execute(f"INSERT INTO meta.column_stats VALUES {', '.join([row] * len(stats))}", params)
+        con.execute("COMMIT")
+    except Exception:
+        con.execute("ROLLBACK")
+        raise
+    return row_count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile tables into meta.table_stats / meta.column_stats")
+    parser.add_argument("tables", nargs="+", help="schema.table names")
+    parser.add_argument("--db", default=str(Path(__file__).parent.parent / "data" / "fissio.duckdb"))
+    args = parser.parse_args()
+
+    # Profiled without writing, so it works on the published (read-only) generation
+    con = duckdb.connect(args.db, read_only=True)
+    for table in args.tables:
+        row_count, stats = profile(con, table)
+        print(f"\n{table}: {row_count:,} rows")
+        for s in stats:
+            values = ""
+            if s["top_values"]:
+                shown = ", ".join(str(v["value"]) for v in s["top_values"][:5])
+                values = f"  [{shown}{', ...' if len(s['top_values']) > 5 else ''}]"
+            print(f"  {s['column_name']:<32} {s['data_type']:<10} nulls {s['null_fraction']:6.1%}  "
+                  f"~{s['approx_distinct']:,} distinct  {s['min_value']} .. {s['max_value']}{values}")
+    con.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Entity resolution between WRI plants, NRC reactor units and EIA-860 plants.
+
+``plants.plant_crosswalk`` has one row per US WRI plant and NRC unit (NULL
+unit for plants without one), with the plant's EIA code and how each link
+was made, so reactor status by plant is an equi-join on ``nrc_unit``
+(``regulatory.v_reactor_status_by_plant`` does it over the full history).
+
+Links:
+
+- EIA: WRI's US plant ids are EIA plant codes ("USA0006008" -> 6008). When
+  the EIA-860 file is loaded (``plants.eia_860_plants``), codes it lists are
+  kept as they are, and the remaining WRI plants are resolved against the
+  EIA plants nobody claimed, by name and location.
+- NRC: status rows carry nothing but the unit name ("Peach Bottom 2"), so
+  units are resolved by name against US nuclear plants.
+
+:func:`resolve` never compares every pair. Names are normalized into tokens
+(accents, punctuation, unit numbers and words like "nuclear" or "station"
+dropped) and records only meet when they share a block: a name token, or,
+when both sides have coordinates, the same or a neighbouring grid cell.
+Tokens or cells holding more than ``MAX_BLOCK_SIZE`` right-hand records
+("solar", a dense city) are too common to block on. The candidate pairs are
+scored in one SQL pass: Jaro-Winkler similarity of the normalized names
+averaged with the share of tokens in common, blended with proximity when
+both records have coordinates. Each record keeps its best candidate scoring
+at least ``MIN_CONFIDENCE``.
+
+Usage:
+    python scripts/crosswalk.py    # Review matches in data/fissio.duckdb: ambiguous, weakest, unmatched
+"""
+
+import argparse
+from pathlib import Path
+
+import duckdb
+
+from timeseries import HISTORY
+
+CROSSWALK = "plants.plant_crosswalk"
+EIA_PLANTS = "plants.eia_860_plants"
+CELL_DEGREES = 0.1
+# Records sharing a block with more right-hand records than this are not paired through it
+MAX_BLOCK_SIZE = 100
+MIN_CONFIDENCE = 0.6
+# Weight of the name score when both records have coordinates; proximity gets the rest
+NAME_WEIGHT = 0.7
+# Proximity falls linearly to 0 at this distance
+MAX_DISTANCE_KM = 10.0
+KM_PER_DEGREE = 111.2
+# Dropped from names before comparing
+STOPWORDS = [
+    "and", "center", "centre", "co", "company", "electric", "energy", "facility", "generating", "generation",
+    "inc", "llc", "nuclear", "of", "one", "plant", "power", "project", "station", "the", "three", "two", "unit",
+    "units",
+]
+ABBREVIATIONS = {"saint": "st", "mount": "mt", "fort": "ft"}
+
+MACROS = [
+    f"""
+    CREATE OR REPLACE MACRO crosswalk_tokens(s) AS list_filter(
+        list_transform(
+            string_split(trim(regexp_replace(strip_accents(lower(coalesce(s, ''))), '[^a-z0-9]+', ' ', 'g')), ' '),
+            t -> CASE t {" ".join(f"WHEN '{k}' THEN '{v}'" for k, v in ABBREVIATIONS.items())} ELSE t END
+        ),
+        -- Unit numbers (also as roman numerals), initials and stopwords
+        t -> length(t) > 1 AND NOT regexp_full_match(t, '[0-9]+|ii|iii|iv') AND NOT list_contains({STOPWORDS}, t)
+    )
+    """,
+    f"CREATE OR REPLACE MACRO crosswalk_cell(degrees) AS floor(degrees / {CELL_DEGREES})::INTEGER",
+]
+
+
+def resolve(con: duckdb.DuckDBPyConnection, left: str, right: str, result: str):
+    """Best right-hand match for each left-hand record, as temp table ``result``.
+
+    ``left`` and ``right`` are queries returning (id, name, latitude, longitude),
+    coordinates possibly NULL. ``result`` gets (left_id, right_id, method,
+    confidence, candidates), ``candidates`` counting the right-hand records that
+    scored at least ``MIN_CONFIDENCE``.
+    """
+    for side, query in (("left", left), ("right", right)):
+        con.execute(f"""
+            CREATE OR REPLACE TEMP TABLE crosswalk_{side} AS
+            SELECT id, tokens, array_to_string(tokens, ' ') AS core, latitude, longitude,
+                   crosswalk_cell(latitude) AS cell_lat, crosswalk_cell(longitude) AS cell_lon
+            FROM (SELECT id, crosswalk_tokens(name) AS tokens, latitude, longitude FROM ({query}))
+            WHERE len(tokens) > 0
+        """)
+    con.execute("""
+        CREATE OR REPLACE TEMP TABLE crosswalk_right_blocks AS
+        SELECT id, 't:' || unnest(tokens) AS block FROM crosswalk_right
+        UNION ALL
+        SELECT id, 'c:' || cell_lat || ':' || cell_lon FROM crosswalk_right WHERE cell_lat IS NOT NULL
+    """)
+    # Left-hand records also look in the 8 cells around their own, for pairs straddling a cell edge
+    con.execute(f"""
+        CREATE OR REPLACE TEMP TABLE crosswalk_pairs AS
+        WITH left_blocks AS (
+            SELECT id, 't:' || unnest(tokens) AS block FROM crosswalk_left
+            UNION ALL
+            SELECT id, 'c:' || (cell_lat + dy) || ':' || (cell_lon + dx)
+            FROM crosswalk_left, range(-1, 2) a(dy), range(-1, 2) b(dx)
+            WHERE cell_lat IS NOT NULL
+        ),
+        usable AS (
+            SELECT block FROM crosswalk_right_blocks GROUP BY block HAVING COUNT(*) <= {MAX_BLOCK_SIZE}
+        )
+        SELECT DISTINCT l.id AS left_id, r.id AS right_id
+        FROM left_blocks l
+        JOIN usable USING (block)
+        JOIN crosswalk_right_blocks r USING (block)
+    """)
+    con.execute(f"""
+        CREATE OR REPLACE TEMP TABLE {result} AS
+        WITH scored AS (
+            SELECT
+                p.left_id,
+                p.right_id,
+                l.core = r.core AS same_name,
+                (jaro_winkler_similarity(l.core, r.core)
+                    + len(list_intersect(l.tokens, r.tokens)) / least(len(l.tokens), len(r.tokens))) / 2
+                    AS name_score,
+                {KM_PER_DEGREE} * sqrt(pow(l.latitude - r.latitude, 2)
+                    + pow((l.longitude - r.longitude) * cos(radians(l.latitude)), 2)) AS distance_km
+            FROM crosswalk_pairs p
+            JOIN crosswalk_left l ON l.id = p.left_id
+            JOIN crosswalk_right r ON r.id = p.right_id
+        ),
+        candidates AS (
+            SELECT *, COUNT(*) OVER (PARTITION BY left_id) AS candidates
+            FROM (
+                SELECT
+                    left_id, right_id, same_name,
+                    CASE
+                        WHEN distance_km IS NULL THEN name_score
+                        ELSE {NAME_WEIGHT} * name_score
+                             + {1 - NAME_WEIGHT} * greatest(0, 1 - distance_km / {MAX_DISTANCE_KM})
+                    END AS confidence
+                FROM scored
+            )
+            WHERE confidence >= {MIN_CONFIDENCE}
+        )
+        SELECT
+            left_id,
+            right_id,
+            CASE WHEN same_name THEN 'exact_name' ELSE 'fuzzy_name' END AS method,
+            round(confidence, 3) AS confidence,
+            candidates::INTEGER AS candidates
+        FROM candidates
+        QUALIFY row_number() OVER (PARTITION BY left_id ORDER BY confidence DESC, right_id) = 1
+    """)
+
+
+def build_crosswalk(con: duckdb.DuckDBPyConnection, source: str = "plants.global_power_plants",
+                    eia: str | None = None) -> dict:
+    """Create ``plants.plant_crosswalk`` and ``regulatory.v_reactor_status_by_plant``.
+
+    ``eia`` is the loaded EIA-860 plant table, if any. Returns link counts.
+    """
+    for macro in MACROS:
+        con.execute(macro)
+    con.execute(f"""
+        CREATE OR REPLACE TEMP TABLE crosswalk_wri AS
+        SELECT plant_id, name, latitude, longitude, primary_fuel,
+               TRY_CAST(substr(plant_id, 4) AS INTEGER) AS gppd_code
+        FROM {source}
+        WHERE country = 'USA'
+    """)
+
+    # WRI plant -> EIA plant code
+    if eia:
+        con.execute(f"""
+            CREATE OR REPLACE TEMP TABLE crosswalk_eia AS
+            SELECT w.plant_id, w.gppd_code AS eia_plant_code, 'gppd_id' AS eia_method, 1.0::DOUBLE AS eia_confidence
+            FROM crosswalk_wri w
+            WHERE w.gppd_code IN (SELECT plant_id_eia FROM {eia})
+        """)
+        resolve(
+            con,
+            "SELECT plant_id AS id, name, latitude, longitude FROM crosswalk_wri "
+            "WHERE plant_id NOT IN (SELECT plant_id FROM crosswalk_eia)",
+            f"SELECT plant_id_eia AS id, plant_name_eia AS name, latitude, longitude FROM {eia} "
+            "WHERE plant_id_eia NOT IN (SELECT eia_plant_code FROM crosswalk_eia)",
+            "crosswalk_eia_matches",
+        )
+        con.execute("""
+            INSERT INTO crosswalk_eia
+            SELECT left_id, right_id, method, confidence FROM crosswalk_eia_matches
+        """)
+    else:
+        con.execute("""
+            CREATE OR REPLACE TEMP TABLE crosswalk_eia AS
+            SELECT plant_id, gppd_code AS eia_plant_code, 'gppd_id' AS eia_method, 1.0::DOUBLE AS eia_confidence
+            FROM crosswalk_wri
+            WHERE gppd_code IS NOT NULL
+        """)
+
+    # NRC unit -> WRI plant
+    resolve(
+        con,
+        f"SELECT DISTINCT unit AS id, unit AS name, NULL::DOUBLE AS latitude, NULL::DOUBLE AS longitude FROM {HISTORY}",
+        "SELECT plant_id AS id, name, latitude, longitude FROM crosswalk_wri WHERE primary_fuel = 'Nuclear'",
+        "crosswalk_nrc",
+    )
+
+    con.execute(f"""
+        CREATE OR REPLACE TABLE {CROSSWALK} AS
+        SELECT
+            w.plant_id,
+            w.name AS plant_name,
+            e.eia_plant_code,
+            e.eia_method,
+            e.eia_confidence,
+            n.left_id AS nrc_unit,
+            n.method AS nrc_method,
+            n.confidence AS nrc_confidence,
+            n.candidates AS nrc_candidates
+        FROM crosswalk_wri w
+        LEFT JOIN crosswalk_eia e USING (plant_id)
+        LEFT JOIN crosswalk_nrc n ON n.right_id = w.plant_id
+        ORDER BY w.plant_id, n.left_id
+    """)
+    con.execute(f"""
+        CREATE OR REPLACE VIEW regulatory.v_reactor_status_by_plant AS
+        SELECT x.plant_id, x.plant_name, x.eia_plant_code, h.unit, h.report_date, h.power_pct, x.nrc_confidence
+        FROM {HISTORY} h
+        JOIN {CROSSWALK} x ON x.nrc_unit = h.unit
+    """)
+    for table in ("crosswalk_wri", "crosswalk_eia", "crosswalk_eia_matches", "crosswalk_nrc", "crosswalk_left",
+                  "crosswalk_right", "crosswalk_right_blocks", "crosswalk_pairs"):
+        con.execute(f"DROP TABLE IF EXISTS {table}")
+
+    plants, eia_linked, eia_resolved, units = con.execute(f"""
+        SELECT COUNT(DISTINCT plant_id), COUNT(DISTINCT plant_id) FILTER (eia_plant_code IS NOT NULL),
+               COUNT(DISTINCT plant_id) FILTER (eia_method <> 'gppd_id'), COUNT(DISTINCT nrc_unit)
+        FROM {CROSSWALK}
+    """).fetchone()
+    return {
+        "plants": plants,
+        "eia_linked": eia_linked,
+        "eia_resolved": eia_resolved,
+        "nrc_units": con.execute(f"SELECT COUNT(DISTINCT unit) FROM {HISTORY}").fetchone()[0],
+        "nrc_matched": units,
+    }
+
+
+def review(con: duckdb.DuckDBPyConnection, limit: int = 20):
+    """Print the NRC links worth a look: ambiguous, weakest, and units left unmatched."""
+    ambiguous = con.execute(f"""
+        SELECT nrc_unit, plant_id, plant_name, nrc_confidence, nrc_candidates FROM {CROSSWALK}
+        WHERE nrc_candidates > 1 ORDER BY nrc_unit LIMIT ?
+    """, [limit]).fetchall()
+    print(f"\nAmbiguous NRC units (several plants scored above {MIN_CONFIDENCE}):")
+    for unit, plant_id, name, confidence, candidates in ambiguous:
+        print(f"  {unit:<28} -> {plant_id} {name} ({confidence:.3f}, {candidates} candidates)")
+
+    weakest = con.execute(f"""
+        SELECT nrc_unit, plant_id, plant_name, nrc_confidence FROM {CROSSWALK}
+        WHERE nrc_unit IS NOT NULL ORDER BY nrc_confidence, nrc_unit LIMIT ?
+    """, [limit]).fetchall()
+    print("\nWeakest NRC links:")
+    for unit, plant_id, name, confidence in weakest:
+        print(f"  {unit:<28} -> {plant_id} {name} ({confidence:.3f})")
+
+    unmatched = con.execute(f"""
+        SELECT DISTINCT unit FROM {HISTORY}
+        WHERE unit NOT IN (SELECT nrc_unit FROM {CROSSWALK} WHERE nrc_unit IS NOT NULL)
+        ORDER BY unit
+    """).fetchall()
+    print(f"\nUnmatched NRC units: {len(unmatched)}")
+    for (unit,) in unmatched:
+        print(f"  {unit}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Review the WRI / NRC / EIA plant crosswalk")
+    parser.add_argument("--db", default=str(Path(__file__).parent.parent / "data" / "fissio.duckdb"))
+    parser.add_argument("--limit", type=int, default=20, help="Rows per section")
+    args = parser.parse_args()
+
+    con = duckdb.connect(args.db, read_only=True)
+    review(con, args.limit)
+    con.close()
+
+
+if __name__ == "__main__":
+    main()
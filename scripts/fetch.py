@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Parallel, resumable downloader for the seed data sources.
+
+Every source is fetched on its own worker thread. Each download:
+- streams into ``<file>.part`` while hashing (SHA-256), then renames atomically
+- resumes an interrupted ``.part`` with an HTTP Range request (guarded by If-Range)
+- revalidates a cached copy with If-None-Match / If-Modified-Since
+- retries transient failures with exponential backoff
+
+Validators and checksums are kept next to each file in ``<file>.meta.json``.
+
+Usage:
+    python scripts/fetch.py [--refresh] [--workers N]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+CHUNK_SIZE = 1 << 20
+USER_AGENT = "fissio-base-seed/1.0"
+
+# HTTP statuses worth retrying
+RETRY_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+
+
+@dataclass
+class FetchResult:
+    """Outcome of fetching one source."""
+    name: str
+    path: Path
+    status: str  # downloaded | not-modified | cached | failed
+    sha256: str | None = None
+    etag: str | None = None
+    last_modified: str | None = None
+    size: int = 0
+    elapsed: float = 0.0
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status != "failed" and self.path.exists()
+
+
+def _meta_path(path: Path) -> Path:
+    return path.with_name(path.name + ".meta.json")
+
+
+def _read_meta(path: Path) -> dict:
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_meta(path: Path, meta: dict):
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(meta, indent=2))
+    os.replace(tmp, path)
+
+
+def file_checksum(path: Path) -> str:
+    """SHA-256 of a file, read in 1 MB blocks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class _RetryableError(Exception):
+    pass
+
+
+def _download(url: str, dest: Path, meta: dict, timeout: float) -> dict | None:
+    """Single download attempt. Returns new metadata, or None if not modified."""
+    part = dest.with_name(dest.name + ".part")
+    part_meta_path = _meta_path(part)
+    part_meta = _read_meta(part_meta_path)
+
+    headers = {"User-Agent": USER_AGENT}
+    offset = part.stat().st_size if part.exists() else 0
+    validator = part_meta.get("etag") or part_meta.get("last_modified")
+    if offset and validator and part_meta.get("url") == url:
+        # Resume, but only if the remote file is still the one we started on
+        headers["Range"] = f"bytes={offset}-"
+        headers["If-Range"] = validator
+    else:
+        offset = 0
+        if dest.exists() and meta.get("url") == url:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+
+    request = urllib.request.Request(url, headers=headers)
+    try:
+        response = urllib.request.urlopen(request, timeout=timeout)
+    except urllib.error.HTTPError as e:
+        if e.code == 304:
+            return None
+        if e.code == 416:
+            # Partial file is unusable against the current remote; start over
+            part.unlink(missing_ok=True)
+            part_meta_path.unlink(missing_ok=True)
+            raise _RetryableError("range not satisfiable")
+        if e.code in RETRY_STATUSES:
+            raise _RetryableError(f"HTTP {e.code}")
+        raise
+    except (urllib.error.URLError, TimeoutError, ConnectionError) as e:
+        raise _RetryableError(str(e))
+
+    with response:
+        status = getattr(response, "status", None) or 200
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        length = response.headers.get("Content-Length")
+
+        digest = hashlib.sha256()
+        if status == 206:
+            with open(part, "rb") as f:
+                for block in iter(lambda: f.read(CHUNK_SIZE), b""):
+                    digest.update(block)
+            mode = "ab"
+        else:
+            offset = 0
+            mode = "wb"
+
+        _write_meta(part_meta_path, {"url": url, "etag": etag, "last_modified": last_modified})
+        received = 0
+        try:
+            with open(part, mode) as f:
+                for chunk in iter(lambda: response.read(CHUNK_SIZE), b""):
+                    digest.update(chunk)
+                    f.write(chunk)
+                    received += len(chunk)
+                f.flush()
+                os.fsync(f.fileno())
+        except (OSError, TimeoutError) as e:
+            # Keep the partial file so the next attempt can resume it
+            raise _RetryableError(str(e))
+
+        if length is not None and received != int(length):
+            raise _RetryableError(f"short read: {received} of {length} bytes")
+
+    os.replace(part, dest)
+    part_meta_path.unlink(missing_ok=True)
+    return {
+        "url": url,
+        "etag": etag,
+        "last_modified": last_modified,
+        "sha256": digest.hexdigest(),
+        "size": offset + received,
+        "fetched_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }
+
+
+def fetch(name: str, url: str, dest: Path, refresh: bool = True, timeout: float = 30.0,
+          retries: int = 3, backoff: float = 1.0) -> FetchResult:
+    """Fetch one URL into ``dest``.
+
+    Without ``refresh`` an existing local copy is used as-is and no request is made.
+    """
+    start = time.perf_counter()
+    meta_path = _meta_path(dest)
+    meta = _read_meta(meta_path)
+
+    def result(status, error=None):
+        if dest.exists() and not meta.get("sha256"):
+            meta["sha256"] = file_checksum(dest)
+            meta["size"] = dest.stat().st_size
+        return FetchResult(
+            name=name,
+            path=dest,
+            status=status,
+            sha256=meta.get("sha256"),
+            etag=meta.get("etag"),
+            last_modified=meta.get("last_modified"),
+            size=meta.get("size", 0),
+            elapsed=time.perf_counter() - start,
+            error=error,
+        )
+
+    if dest.exists() and not refresh:
+        return result("cached")
+
+    error = None
+    for attempt in range(retries + 1):
+        try:
+            new_meta = _download(url, dest, meta, timeout)
+        except _RetryableError as e:
+            error = str(e)
+            if attempt < retries:
+                delay = backoff * (2 ** attempt) * (1 + random.random() * 0.25)
+                print(f"  [{name}] {error}; retrying in {delay:.1f}s")
+                time.sleep(delay)
+            continue
+        except Exception as e:
+            error = str(e)
+            break
+
+        if new_meta is None:
+            return result("not-modified")
+        meta = new_meta
+        _write_meta(meta_path, meta)
+        return result("downloaded")
+
+    print(f"  [{name}] Error: {error}")
+    return result("failed", error)
+
+
+def fetch_sources(sources: dict, data_dir: Path, refresh: bool = True, max_workers: int | None = None,
+                  **kwargs) -> dict[str, FetchResult]:
+    """Fetch every entry of ``sources`` concurrently into ``data_dir``.
+
+    By default there is one worker per source, so the stage takes about as
+    long as the slowest download.
+    """
+    data_dir.mkdir(parents=True, exist_ok=True)
+    workers = max_workers or len(sources)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="fetch") as pool:
+        futures = {
+            name: pool.submit(fetch, name, src["url"], data_dir / src["filename"], refresh, **kwargs)
+            for name, src in sources.items()
+        }
+        results = {name: future.result() for name, future in futures.items()}
+
+    for r in results.values():
+        size_mb = r.size / (1024 * 1024)
+        print(f"  {r.name}: {r.status} ({size_mb:.1f} MB, {r.elapsed:.1f}s)")
+    return results
+
+
+def main():
+    from seed_data import DATA_DIR, SOURCES
+
+    parser = argparse.ArgumentParser(description="Download seed data sources")
+    parser.add_argument("--refresh", action="store_true", help="Revalidate existing local copies")
+    parser.add_argument("--workers", type=int, help="Concurrent downloads (default: one per source)")
+    args = parser.parse_args()
+
+    print("Fetching sources...")
+    results = fetch_sources(SOURCES, DATA_DIR, refresh=args.refresh, max_workers=args.workers)
+    if not all(r.ok for r in results.values()):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
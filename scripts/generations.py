@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Blue/green database generations.
+
+DuckDB allows one read-write process per file, so the seed never writes to
+the file readers have open. Each run builds ``generations/fissio-<N>.duckdb``
+next to the database, starting from a copy of the current generation (reactor
+history accumulates across loads), validates it and publishes it by
+atomically replacing the ``fissio.duckdb`` symlink. Anything that opens
+``fissio.duckdb`` afterwards (the frontend's pool, Superset, notebooks) gets
+generation N; connections already open keep reading their old file until
+they close.
+
+Old generations are deleted once drained. DuckDB holds a shared lock on every
+file it has open, read-only or not, so a file that can be locked exclusively
+has no readers left in any process or container on this host.
+
+    python scripts/generations.py          # List generations
+    python scripts/generations.py --gc     # Delete drained ones
+"""
+
+import argparse
+import fcntl
+import os
+import re
+import shutil
+import time
+from pathlib import Path
+
+import duckdb
+
+GENERATIONS_DIR = "generations"
+# Tables that must exist and have rows before a generation is published
+REQUIRED_TABLES = ("plants.global_power_plants", "meta.source_manifest")
+# The generation replaced last stays this long, for readers that resolved the link just before the swap
+GRACE_SECONDS = 30
+
+NAME = re.compile(r"^fissio-(\d+)\.duckdb$")
+
+
+class InvalidGeneration(Exception):
+    """A freshly built database failed validation and was not published."""
+
+
+def generation_path(db_path: Path, number: int) -> Path:
+    return db_path.parent / GENERATIONS_DIR / f"fissio-{number}.duckdb"
+
+
+def generation_number(path: Path) -> int | None:
+    match = NAME.match(path.name)
+    return int(match.group(1)) if match else None
+
+
+def next_number(db_path: Path, floor: int = 0) -> int:
+    """A generation number above ``floor`` and every existing generation file."""
+    return max([floor] + [generation_number(p) for p in generations(db_path)]) + 1
+
+
+def current(db_path: Path) -> Path | None:
+    """The file ``db_path`` currently points at (itself for a database that predates generations)."""
+    return db_path.resolve() if db_path.exists() else None
+
+
+def prepare(db_path: Path, number: int) -> Path:
+    """Create the file generation ``number`` is built in, as a copy of the current one."""
+    build = generation_path(db_path, number)
+    build.parent.mkdir(parents=True, exist_ok=True)
+    remove(build)  # left by an interrupted run
+    source = current(db_path)
+    if source is not None:
+        # Published files are only ever opened read-only, so the copy is consistent
+        shutil.copyfile(source, build)
+        wal = source.with_name(source.name + ".wal")
+        if wal.exists():  # a database written in place by an older seed
+            shutil.copyfile(wal, build.with_name(build.name + ".wal"))
+    return build
+
+
+def validate(path: Path, required: tuple[str, ...] = REQUIRED_TABLES):
+    """Open ``path`` read-only, read every table and check the required ones have rows."""
+    try:
+        con = duckdb.connect(str(path), read_only=True)
+    except duckdb.Error as e:
+        raise InvalidGeneration(f"{path.name} can't be opened: {e}")
+    try:
+        tables = con.execute("""
+            SELECT table_schema || '.' || table_name FROM information_schema.tables
+            WHERE table_type = 'BASE TABLE'
+        """).fetchall()
+        counts = {}
+        for (table,) in tables:
+            try:
+                counts[table] = con.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            except duckdb.Error as e:
+                raise InvalidGeneration(f"{table} can't be read: {e}")
+        for table in required:
+            if not counts.get(table):
+                raise InvalidGeneration(f"{table} is missing or empty")
+    finally:
+        con.close()
+
+
+def publish(db_path: Path, build: Path):
+    """Point ``db_path`` at ``build`` with an atomic rename of a relative symlink."""
+    link = db_path.with_name(f".{db_path.name}.link")
+    link.unlink(missing_ok=True)
+    # Relative, so it resolves wherever ./data is mounted (/data, /app/data, /home/jovyan/data)
+    link.symlink_to(os.path.relpath(build, db_path.parent))
+    os.replace(link, db_path)
+    # A WAL left by a database written in place would be replayed onto the new generation
+    db_path.with_name(db_path.name + ".wal").unlink(missing_ok=True)
+
+
+def remove(path: Path):
+    path.unlink(missing_ok=True)
+    path.with_name(path.name + ".wal").unlink(missing_ok=True)
+
+
+def in_use(path: Path) -> bool:
+    """True if any process has ``path`` open with DuckDB."""
+    try:
+        fd = os.open(path, os.O_RDWR)
+    except FileNotFoundError:
+        return False
+    try:
+        fcntl.lockf(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        return True
+    finally:
+        os.close(fd)  # also releases our lock
+    return False
+
+
+def generations(db_path: Path) -> list[Path]:
+    directory = (db_path.parent / GENERATIONS_DIR).resolve()  # comparable with current()
+    if not directory.is_dir():
+        return []
+    return sorted((p for p in directory.iterdir() if generation_number(p) is not None), key=generation_number)
+
+
+def collect_garbage(db_path: Path, grace: float = GRACE_SECONDS) -> list[Path]:
+    """Delete every generation other than the current one that no process has open."""
+    live = current(db_path)
+    keep = {live}
+    if db_path.is_symlink() and time.time() - db_path.lstat().st_mtime < grace:
+        older = [p for p in generations(db_path) if generation_number(p) < generation_number(live)]
+        keep.update(older[-1:])
+    removed = []
+    for path in generations(db_path):
+        if path in keep or in_use(path):
+            continue
+        remove(path)
+        removed.append(path)
+    return removed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="List or clean up database generations")
+    parser.add_argument("--db", default=str(Path(__file__).parent.parent / "data" / "fissio.duckdb"))
+    parser.add_argument("--gc", action="store_true", help="Delete generations no process has open")
+    args = parser.parse_args()
+    db_path = Path(args.db)
+
+    if args.gc:
+        for path in collect_garbage(db_path):
+            print(f"  Removed {path.name}")
+    live = current(db_path)
+    for path in generations(db_path):
+        state = "current" if path == live else "in use" if in_use(path) else "drained"
+        print(f"  {path.name:<24} {path.stat().st_size / (1024 * 1024):10.1f} MB  {state}")
+    if live is not None and generation_number(live) is None:
+        print(f"  {db_path.name} is a plain file; the next seed moves it into {GENERATIONS_DIR}/")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Streaming CSV ingest with explicit schemas and a quarantine for bad rows.
+
+``ingest_csv`` reads a source file with the types from ``schemas.py`` in a
+single streaming pass (DuckDB's CSV scanner works through the file in
+fixed-size vectors and spills to disk under ``memory_limit``), so there is no
+type-inference sample and no full in-memory copy. Rows that fail to parse
+are captured with DuckDB's ``store_rejects``; rows that parse but fail a
+schema check are split off in the same pass. Both end up in
+``meta.ingest_quarantine`` with the reason, instead of being dropped silently.
+"""
+
+import csv
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+import duckdb
+
+from schemas import SCHEMAS, SourceSchema
+
+
+class SchemaError(Exception):
+    """The source file no longer matches its declared schema."""
+
+
+@dataclass
+class IngestStats:
+    source: str
+    schema_version: int
+    rows: int
+    rejected: int
+    bytes: int
+    seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    @property
+    def mb_per_second(self) -> float:
+        return self.bytes / (1024 * 1024) / self.seconds if self.seconds else 0.0
+
+
+def ensure_quarantine(con: duckdb.DuckDBPyConnection):
+    """Create the table that holds rejected source rows."""
+    con.execute("CREATE SCHEMA IF NOT EXISTS meta")
+    con.execute("""
+        CREATE TABLE IF NOT EXISTS meta.ingest_quarantine (
+            source VARCHAR,
+            schema_version INTEGER,
+            line BIGINT,
+            column_name VARCHAR,
+            error_type VARCHAR,
+            reason VARCHAR,
+            raw_row VARCHAR,
+            rejected_at TIMESTAMP
+        )
+    """)
+
+
+def read_header(path: Path, schema: SourceSchema) -> list[str]:
+    with open(path, newline="", encoding="utf-8", errors="replace") as f:
+        return next(csv.reader(f, delimiter=schema.delimiter), [])
+
+
+def ingest_csv(con: duckdb.DuckDBPyConnection, source: str, path: Path, staging: str) -> IngestStats:
+    """Stream ``path`` into the temp table ``staging`` using the schema for ``source``."""
+    schema = SCHEMAS[source]
+    header = read_header(path, schema)
+    missing = [c for c in schema.columns if c not in header]
+    if missing:
+        raise SchemaError(f"{source}: columns {missing} missing from {path.name} (schema v{schema.version})")
+    extra = [c for c in header if c not in schema.columns]
+    if extra:
+        print(f"  Ignoring {len(extra)} undeclared columns: {', '.join(extra)}")
+
+    # Declared types, in header order; undeclared columns are read as text and dropped
+    columns = ", ".join(f"'{c}': '{schema.columns.get(c, 'VARCHAR')}'" for c in header)
+    select = ", ".join(
+        f'"{c}" AS {schema.rename[c]}' if c in schema.rename else f'"{c}"' for c in schema.columns
+    )
+    reject_reason = "NULL"
+    if schema.checks:
+        cases = " ".join(f"WHEN NOT ({check}) THEN '{reason}'" for check, reason in schema.checks.items())
+        reject_reason = f"CASE {cases} END"
+    options = [
+        f"delim = '{schema.delimiter}'",
+        "header = true",
+        "auto_detect = false",
+        f"columns = {{{columns}}}",
+        "store_rejects = true",
+        f"rejects_table = '{staging}_rejects'",
+        f"rejects_scan = '{staging}_rejects_scan'",
+    ]
+    if schema.timestampformat:
+        options.append(f"timestampformat = '{schema.timestampformat}'")
+
+    start = time.perf_counter()
+    con.execute(f"""
+        CREATE OR REPLACE TEMP TABLE {staging} AS
+        SELECT *, {reject_reason} AS _reject_reason
+        FROM (
+            SELECT {select}
+            FROM read_csv('{path}', {', '.join(options)})
+        )
+    """)
+
+    ensure_quarantine(con)
+    con.execute("DELETE FROM meta.ingest_quarantine WHERE source = ?", [source])
+    # One quarantine row per rejected line, even if several columns failed
+    con.execute(f"""
+        INSERT INTO meta.ingest_quarantine
+        SELECT ?, ?, line, string_agg(column_name, ', '), string_agg(DISTINCT error_type::VARCHAR, ', '),
+               first(error_message), first(csv_line), current_timestamp::TIMESTAMP
+        FROM {staging}_rejects
+        GROUP BY line
+        ORDER BY line
+    """, [source, schema.version])
+    con.execute(f"""
+        INSERT INTO meta.ingest_quarantine
+        SELECT ?, ?, NULL, NULL, 'CHECK', _reject_reason, to_json(s)::VARCHAR,
+               current_timestamp::TIMESTAMP
+        FROM {staging} s
+        WHERE _reject_reason IS NOT NULL
+    """, [source, schema.version])
+    con.execute(f"DELETE FROM {staging} WHERE _reject_reason IS NOT NULL")
+    con.execute(f"ALTER TABLE {staging} DROP COLUMN _reject_reason")
+    con.execute(f"DROP TABLE IF EXISTS {staging}_rejects")
+    con.execute(f"DROP TABLE IF EXISTS {staging}_rejects_scan")
+    seconds = time.perf_counter() - start
+
+    rows = con.execute(f"SELECT COUNT(*) FROM {staging}").fetchone()[0]
+    rejected = con.execute(
+        "SELECT COUNT(*) FROM meta.ingest_quarantine WHERE source = ?", [source]
+    ).fetchone()[0]
+    stats = IngestStats(source, schema.version, rows, rejected, path.stat().st_size, seconds)
+    print(f"  Ingested {rows:,} rows in {seconds:.2f}s "
+          f"({stats.rows_per_second:,.0f} rows/s, {stats.mb_per_second:.1f} MB/s)")
+    if rejected:
+        print(f"  Quarantined {rejected:,} rows -> meta.ingest_quarantine")
+    return stats
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+HTTP load test for the frontend, and worker-count scaling runs.
+
+Against a running frontend:
+
+    python scripts/loadtest.py --url http://localhost:8080 --scenario page query
+
+Or start the production server locally (``app/gunicorn.conf.py``) with each
+worker count in turn and compare throughput:
+
+    python scripts/loadtest.py --sweep 1 2 4 8 --duration 15
+
+Load comes from ``--clients`` processes (default: CPU count), each running
+its share of ``--concurrency`` keep-alive connections, so the client itself
+isn't the single-core bottleneck. On one machine client and server share the
+cores; for clean numbers run the client on another host.
+"""
+
+import argparse
+import asyncio
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import time
+from multiprocessing import Pool
+from pathlib import Path
+
+import httpx
+
+APP_DIR = Path(__file__).parent.parent / "app"
+
+# name -> (method, path, json body or None, headers)
+SCENARIOS = {
+    # Repeat visitor: shell page revalidated with its ETag (304)
+    "page": ("GET", "/", None, {"accept-encoding": "gzip, br", "if-none-match": "{etag}"}),
+    # First visit: full compressed shell page
+    "page-full": ("GET", "/", None, {"accept-encoding": "gzip, br"}),
+    "health": ("GET", "/health", None, {}),
+    # Dashboard-style aggregate, answered from the result cache after the first run
+    "query": ("POST", "/api/query", {
+        "sql": "SELECT primary_fuel, SUM(capacity_mw) AS mw FROM plants.global_power_plants GROUP BY 1"
+    }, {}),
+    # Same aggregate, bypassing the cache: DuckDB on every request
+    "query-uncached": ("POST", "/api/query", {
+        "sql": "SELECT primary_fuel, SUM(capacity_mw) AS mw FROM plants.global_power_plants GROUP BY 1"
+    }, {"cache-control": "no-cache"}),
+    # Typeahead: misspelled two-word search over the in-memory index
+    "search": ("GET", "/api/search?q=peach%20botom", None, {}),
+}
+
+
+def percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))]
+
+
+async def _client_run(url: str, scenario: str, connections: int, duration: float) -> tuple[list[float], int]:
+    method, path, body, headers = SCENARIOS[scenario]
+    limits = httpx.Limits(max_connections=connections, max_keepalive_connections=connections)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=30) as client:
+        if "{etag}" in headers.get("if-none-match", ""):
+            etag = (await client.get(path, headers={"accept-encoding": headers["accept-encoding"]})).headers["etag"]
+            headers = {**headers, "if-none-match": etag}
+        latencies, errors = [], 0
+        deadline = time.perf_counter() + duration
+
+        async def connection():
+            nonlocal errors
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                try:
+                    response = await client.request(method, path, json=body, headers=headers)
+                    await response.aread()
+                    if response.status_code >= 400:
+                        errors += 1
+                        continue
+                except httpx.HTTPError:
+                    errors += 1
+                    continue
+                latencies.append(time.perf_counter() - start)
+
+        await asyncio.gather(*(connection() for _ in range(connections)))
+        return latencies, errors
+
+
+def client_process(args: tuple) -> tuple[list[float], int]:
+    return asyncio.run(_client_run(*args))
+
+
+def run_load(url: str, scenario: str, concurrency: int, duration: float, clients: int) -> dict:
+    clients = max(1, min(clients, concurrency))
+    shares = [concurrency // clients + (1 if i < concurrency % clients else 0) for i in range(clients)]
+    with Pool(clients) as pool:
+        results = pool.map(client_process, [(url, scenario, share, duration) for share in shares])
+    latencies = [t for samples, _ in results for t in samples]
+    errors = sum(e for _, e in results)
+    if not latencies:
+        return {"scenario": scenario, "requests": 0, "errors": errors, "rps": 0}
+    return {
+        "scenario": scenario,
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / duration),
+        "p50_ms": round(statistics.median(latencies) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+    }
+
+
+def print_result(result: dict):
+    if not result["requests"]:
+        print(f"  {result['scenario']:<15} no successful requests ({result['errors']} errors)")
+        return
+    print(f"  {result['scenario']:<15} {result['rps']:>8,} req/s   p50 {result['p50_ms']:>7.2f} ms   "
+          f"p95 {result['p95_ms']:>7.2f} ms   p99 {result['p99_ms']:>7.2f} ms   errors {result['errors']}")
+
+
+def start_server(workers: int, port: int) -> subprocess.Popen:
+    env = {**os.environ, "WEB_CONCURRENCY": str(workers), "PORT": str(port)}
+    env.pop("DUCKDB_THREADS", None)  # let gunicorn.conf.py split the cores for this worker count
+    process = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "main:app"],
+        cwd=APP_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health", timeout=1).status_code == 200:
+                time.sleep(1)  # let the remaining workers finish booting
+                return process
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError(f"Server with {workers} workers didn't start on port {port}")
+
+
+def stop_server(process: subprocess.Popen):
+    process.send_signal(signal.SIGTERM)
+    try:
+        process.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+def sweep(worker_counts: list[int], scenarios: list[str], concurrency: int, duration: float, clients: int,
+          port: int):
+    """Throughput per scenario for each worker count, relative to the first count."""
+    url = f"http://127.0.0.1:{port}"
+    table = {}
+    for workers in worker_counts:
+        print(f"\n[{workers} worker{'s' if workers != 1 else ''}]")
+        process = start_server(workers, port)
+        try:
+            for scenario in scenarios:
+                result = run_load(url, scenario, concurrency, duration, clients)
+                print_result(result)
+                table[workers, scenario] = result["rps"]
+        finally:
+            stop_server(process)
+
+    base = worker_counts[0]
+    print(f"\n{'scenario':<15}" + "".join(f"{w:>10}w" for w in worker_counts) + "   scaling")
+    for scenario in scenarios:
+        row = [table[w, scenario] for w in worker_counts]
+        scaling = " ".join(f"{r / row[0]:.1f}x" if row[0] else "-" for r in row[1:])
+        print(f"{scenario:<15}" + "".join(f"{r:>11,}" for r in row) + f"   {scaling}")
+    print(f"(relative to {base} worker{'s' if base != 1 else ''}; CPU count {os.cpu_count()})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the frontend")
+    parser.add_argument("--url", default="http://localhost:8080", help="Frontend to test (ignored with --sweep)")
+    parser.add_argument("--scenario", nargs="+", choices=list(SCENARIOS), default=["page", "query"])
+    parser.add_argument("--concurrency", type=int, default=64, help="Open connections in total")
+    parser.add_argument("--duration", type=float, default=10, help="Seconds per scenario")
+    parser.add_argument("--clients", type=int, default=os.cpu_count() or 1, help="Client processes")
+    parser.add_argument("--sweep", type=int, nargs="+", metavar="WORKERS",
+                        help="Start app/gunicorn.conf.py locally with each worker count")
+    parser.add_argument("--port", type=int, default=18080, help="Port for --sweep servers")
+    args = parser.parse_args()
+
+    if args.sweep:
+        sweep(args.sweep, args.scenario, args.concurrency, args.duration, args.clients, args.port)
+    else:
+        print(f"{args.url}: {args.concurrency} connections, {args.duration:g}s per scenario")
+        for scenario in args.scenario:
+            print_result(run_load(args.url, scenario, args.concurrency, args.duration, args.clients))
+
+
+if __name__ == "__main__":
+    main()
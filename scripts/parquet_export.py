@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Tuned Parquet export layer for Superset, Duck-UI and notebooks.
+
+An ``ExportSpec`` describes one export: a single file or a Hive-partitioned
+directory (``country=USA/primary_fuel=Nuclear/data_0.parquet``), the sort
+order used to tighten min/max statistics, codec/level, row-group size and the
+dictionary size limit (DuckDB writes a bloom filter for every
+dictionary-encoded column, so a limit above the row-group size adds bloom
+filters on unique keys such as ``plant_id``).
+
+Exports are written next to the published copy and swapped in with a
+rename, so readers see either the old or the new export, never a mix.
+Partitioned exports also get a ``_manifest.json`` listing each file with its
+partition values, row count, size and key-column statistics. A partitioned
+export lives in a versioned directory (``.<name>.<N>``) and ``<name>`` is a
+relative symlink to it, replaced with ``os.replace``; the previous version
+is kept for readers that listed its files just before the swap.
+
+Usage:
+    python scripts/parquet_export.py              # Re-export everything in seed_data.EXPORTS
+    python scripts/parquet_export.py --benchmark  # Scan bytes: default flat vs. tuned layouts
+"""
+
+import argparse
+import json
+import os
+import re
+import shutil
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+
+import duckdb
+
+MANIFEST_NAME = "_manifest.json"
+
+
+@dataclass
+class ExportSpec:
+    """How to export one table to Parquet."""
+    table: str
+    name: str  # file name, or directory name when partitioned
+    partition_by: tuple[str, ...] = ()
+    order_by: tuple[str, ...] = ()
+    compression: str = "zstd"
+    compression_level: int | None = 3
+    row_group_size: int = 122_880
+    dictionary_size_limit: int | None = None
+    stats_columns: tuple[str, ...] = ()  # reported in the manifest
+
+    @property
+    def step_name(self) -> str:
+        stem = self.name.removesuffix(".parquet")
+        return f"export_{stem}_partitioned" if self.partition_by else f"export_{stem}"
+
+    def copy_options(self) -> str:
+        options = ["FORMAT PARQUET", f"COMPRESSION {self.compression}", f"ROW_GROUP_SIZE {self.row_group_size}"]
+        if self.compression_level is not None and self.compression.lower() == "zstd":
+            options.append(f"COMPRESSION_LEVEL {self.compression_level}")
+        if self.dictionary_size_limit is not None:
+            options.append(f"DICTIONARY_SIZE_LIMIT {self.dictionary_size_limit}")
+        if self.partition_by:
+            options.append(f"PARTITION_BY ({', '.join(self.partition_by)})")
+        return ", ".join(options)
+
+    def source_query(self) -> str:
+        query = f"SELECT * FROM {self.table}"
+        order = list(self.partition_by) + [c for c in self.order_by if c not in self.partition_by]
+        if order:
+            query += f" ORDER BY {', '.join(order)}"
+        return query
+
+
+def remove_path(path: Path):
+    """Delete an export file, directory or symlink if present."""
+    if path.is_dir() and not path.is_symlink():
+        shutil.rmtree(path)
+    else:
+        path.unlink(missing_ok=True)
+
+
+def write(con: duckdb.DuckDBPyConnection, spec: ExportSpec, path: Path):
+    """Write ``spec`` to ``path`` (a directory when partitioned), replacing whatever is there."""
+    remove_path(path)
+    con.execute(f"COPY ({spec.source_query()}) TO '{path}' ({spec.copy_options()})")
+    if spec.partition_by:
+        write_manifest(con, spec, path)
+
+
+def versions(data_dir: Path, name: str) -> list[Path]:
+    """Versioned directories of a partitioned export, oldest first."""
+    pattern = re.compile(rf"^\.{re.escape(name)}\.(\d+)$")
+    found = [(int(m.group(1)), p) for p in data_dir.iterdir() if (m := pattern.match(p.name))]
+    return [p for _, p in sorted(found)]
+
+
+def install(spec: ExportSpec, staged: Path, data_dir: Path) -> Path:
+    """Publish ``staged`` as ``data_dir / spec.name`` with an atomic rename.
+
+    ``staged`` must be on the same filesystem as ``data_dir``.
+    """
+    target = data_dir / spec.name
+    if not spec.partition_by:
+        os.replace(staged, target)
+        return target
+
+    existing = versions(data_dir, spec.name)
+    version = data_dir / f".{spec.name}.{(int(existing[-1].name.rsplit('.', 1)[1]) if existing else 0) + 1}"
+    staged.rename(version)
+    if target.is_dir() and not target.is_symlink():
+        # A plain directory from before versioned exports: moved aside once, without a link to swap
+        target.rename(data_dir / f".{spec.name}.0")
+    link = data_dir / f".{spec.name}.link"
+    link.unlink(missing_ok=True)
+    link.symlink_to(version.name)
+    os.replace(link, target)
+    for old in versions(data_dir, spec.name)[:-2]:
+        shutil.rmtree(old, ignore_errors=True)
+    return target
+
+
+def export(con: duckdb.DuckDBPyConnection, spec: ExportSpec, data_dir: Path) -> Path:
+    """Write ``spec`` under ``data_dir``, replacing any previous export atomically."""
+    staged = data_dir / f".{spec.name}.tmp"
+    write(con, spec, staged)
+    return install(spec, staged, data_dir)
+
+
+def write_manifest(con: duckdb.DuckDBPyConnection, spec: ExportSpec, directory: Path):
+    """Summarise a partitioned export in ``_manifest.json``."""
+    glob = f"{directory}/**/*.parquet"
+    stats_filter = ", ".join(f"'{c}'" for c in spec.stats_columns) or "NULL"
+    # Min/max are per row group (and strings); fold them per file and column, numerically where possible
+    rows = con.execute(f"""
+        WITH columns AS (
+            SELECT
+                file_name,
+                path_in_schema,
+                SUM(row_group_num_rows) FILTER (WHERE column_id = 0) AS num_rows,
+                COUNT(DISTINCT row_group_id) AS row_groups,
+                SUM(total_compressed_size) AS compressed_bytes,
+                COALESCE(arg_min(stats_min, TRY_CAST(stats_min AS DOUBLE)), MIN(stats_min)) AS stats_min,
+                COALESCE(arg_max(stats_max, TRY_CAST(stats_max AS DOUBLE)), MAX(stats_max)) AS stats_max
+            FROM parquet_metadata('{glob}')
+            GROUP BY file_name, path_in_schema
+        )
+        SELECT
+            file_name,
+            SUM(num_rows) AS num_rows,
+            MAX(row_groups) AS row_groups,
+            SUM(compressed_bytes) AS compressed_bytes,
+            MAP_FROM_ENTRIES(LIST(
+                {{'k': path_in_schema, 'v': [stats_min, stats_max]}}
+            ) FILTER (WHERE path_in_schema IN ({stats_filter}))) AS stats
+        FROM columns
+        GROUP BY file_name
+        ORDER BY file_name
+    """).fetchall()
+
+    files = []
+    for file_name, num_rows, row_groups, compressed_bytes, stats in rows:
+        path = Path(file_name).relative_to(directory)
+        partition = dict(part.split("=", 1) for part in path.parts[:-1])
+        files.append({
+            "path": str(path),
+            "partition": partition,
+            "rows": num_rows,
+            "row_groups": row_groups,
+            "bytes": (directory / path).stat().st_size,
+            "compressed_column_bytes": compressed_bytes,
+            "stats": {k: {"min": v[0], "max": v[1]} for k, v in (stats or {}).items()},
+        })
+
+    manifest = {
+        "table": spec.table,
+        "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "partition_by": list(spec.partition_by),
+        "order_by": list(spec.order_by),
+        "compression": spec.compression,
+        "compression_level": spec.compression_level,
+        "row_group_size": spec.row_group_size,
+        "row_count": sum(f["rows"] for f in files),
+        "total_bytes": sum(f["bytes"] for f in files),
+        "files": files,
+    }
+    (directory / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2, default=str))
+
+
+# =============================================================================
+# Benchmark
+# =============================================================================
+
+# Equality filters issued by Duck-UI, notebooks and dashboards
+BENCHMARK_FILTERS = [
+    {"country": "USA"},
+    {"primary_fuel": "Nuclear"},
+    {"country": "USA", "primary_fuel": "Nuclear"},
+    {"plant_id": "USA0006031"},
+]
+
+
+def scanned_bytes(con: duckdb.DuckDBPyConnection, glob: str, filters: dict[str, str]) -> tuple[int, int]:
+    """Bytes and files a reader must touch for ``filters``: (bytes, files).
+
+    A row group is skipped when its Hive partition value differs, when the
+    value lies outside the column's min/max, or when the bloom filter
+    excludes it; everything else is counted at its full compressed size.
+    """
+    row_groups = con.execute(f"""
+        SELECT
+            file_name,
+            row_group_id,
+            SUM(total_compressed_size) AS bytes,
+            MAP_FROM_ENTRIES(LIST({{'k': path_in_schema, 'v': [stats_min, stats_max]}})) AS stats
+        FROM parquet_metadata('{glob}')
+        GROUP BY file_name, row_group_id
+    """).fetchall()
+
+    excluded = set()
+    for column, value in filters.items():
+        try:
+            probe = con.execute(
+                f"SELECT file_name, row_group_id FROM parquet_bloom_probe('{glob}', ?, ?) WHERE bloom_filter_excludes",
+                [column, value],
+            ).fetchall()
+        except duckdb.Error:
+            probe = []  # column only exists as a partition key
+        excluded.update(probe)
+
+    total_bytes, files = 0, set()
+    for file_name, row_group_id, size, stats in row_groups:
+        partition = dict(p.split("=", 1) for p in Path(file_name).parts if "=" in p)
+        keep = (file_name, row_group_id) not in excluded
+        for column, value in filters.items():
+            if column in partition:
+                keep = keep and partition[column] == value
+            elif column in stats and stats[column][0] is not None:
+                low, high = stats[column]
+                keep = keep and low <= value <= high
+        if keep:
+            total_bytes += size
+            files.add(file_name)
+    return total_bytes, len(files)
+
+
+def benchmark(con: duckdb.DuckDBPyConnection, flat: ExportSpec, partitioned: ExportSpec):
+    """Compare bytes scanned by common filters: default flat export vs. tuned layouts."""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        baseline = tmp / "baseline.parquet"
+        con.execute(f"COPY {flat.table} TO '{baseline}' (FORMAT PARQUET)")
+        tuned_file = export(con, flat, tmp)
+        tuned_dir = export(con, partitioned, tmp)
+
+        layouts = [
+            ("default flat", str(baseline), f"read_parquet('{baseline}')"),
+            ("tuned flat", str(tuned_file), f"read_parquet('{tuned_file}')"),
+            ("partitioned", f"{tuned_dir}/**/*.parquet",
+             f"read_parquet('{tuned_dir}/**/*.parquet', hive_partitioning = true)"),
+        ]
+        print(f"\n{'filter':<44} {'layout':<13} {'files':>6} {'bytes scanned':>14} {'vs default':>11} {'ms':>7}")
+        for filters in BENCHMARK_FILTERS:
+            where = " AND ".join(f"{column} = '{value}'" for column, value in filters.items())
+            baseline_bytes = None
+            for label, glob, source in layouts:
+                scanned, files = scanned_bytes(con, glob, filters)
+                baseline_bytes = scanned if baseline_bytes is None else baseline_bytes
+                start = time.perf_counter()
+                con.execute(f"SELECT * FROM {source} WHERE {where}").fetchall()
+                ms = (time.perf_counter() - start) * 1000
+                ratio = scanned / baseline_bytes if baseline_bytes else 0
+                print(f"{where:<44} {label:<13} {files:>6} {scanned:>14,} {ratio:>10.1%} {ms:>7.1f}")
+
+
+def main():
+    from seed_data import DATA_DIR, DB_PATH, EXPORTS
+
+    parser = argparse.ArgumentParser(description="Export tables to Parquet")
+    parser.add_argument("--benchmark", action="store_true", help="Compare scan bytes across layouts instead")
+    parser.add_argument("--db", default=str(DB_PATH), help="DuckDB database to read")
+    args = parser.parse_args()
+
+    con = duckdb.connect(args.db, read_only=True)
+    if args.benchmark:
+        flat = next(s for s in EXPORTS if s.table == "plants.global_power_plants" and not s.partition_by)
+        partitioned = next(s for s in EXPORTS if s.table == "plants.global_power_plants" and s.partition_by)
+        benchmark(con, flat, partitioned)
+    else:
+        for spec in EXPORTS:
+            export(con, spec, DATA_DIR)
+            print(f"Exported {spec.table} -> {spec.name}")
+    con.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""
+Minimal dependency-graph runner for the seed pipeline.
+
+Each ``Step`` names the artifacts it reads (``inputs``) and writes
+(``outputs``): tables such as ``plants.global_power_plants``, downloaded
+files, Parquet exports. A step becomes ready once every step producing one
+of its inputs has finished, and ready steps run concurrently on a thread
+pool, each with its own DuckDB cursor. A full run therefore takes about as
+long as the critical path through the graph rather than the sum of steps.
+
+A step function may return False to say that its outputs did not change;
+with ``skip_unchanged`` the runner then skips any step whose upstream steps
+all reported no change (used by ``--incremental``).
+"""
+
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable
+
+import duckdb
+
+
+@dataclass
+class Step:
+    """A unit of work in the pipeline."""
+    name: str
+    func: Callable[[duckdb.DuckDBPyConnection], bool | None]
+    inputs: tuple[str, ...] = ()
+    outputs: tuple[str, ...] = ()
+
+
+@dataclass
+class StepResult:
+    """Outcome and timing of one step."""
+    name: str
+    status: str  # ok | unchanged | up-to-date | failed | skipped
+    started_at: datetime | None = None
+    seconds: float = 0.0
+    error: str | None = None
+
+    @property
+    def succeeded(self) -> bool:
+        return self.status in ("ok", "unchanged", "up-to-date")
+
+
+class Pipeline:
+    """Steps wired together by their inputs and outputs, declared in dependency order."""
+
+    def __init__(self, steps: list[Step]):
+        self.steps = steps
+        self.producers: dict[str, str] = {}
+        for step in self.steps:
+            for output in step.outputs:
+                if output in self.producers:
+                    raise ValueError(f"{output} is produced by both {self.producers[output]} and {step.name}")
+                self.producers[output] = step.name
+        self.by_name = {step.name: step for step in self.steps}
+
+    def upstream(self, name: str) -> set[str]:
+        """Names of the steps that ``name`` directly depends on."""
+        return {self.producers[i] for i in self.by_name[name].inputs if i in self.producers}
+
+    def downstream(self, names: set[str]) -> set[str]:
+        """``names`` plus every step that transitively depends on them."""
+        result = set(names)
+        changed = True
+        while changed:
+            changed = False
+            for step in self.steps:
+                if step.name not in result and self.upstream(step.name) & result:
+                    result.add(step.name)
+                    changed = True
+        return result
+
+    def resolve(self, targets: list[str]) -> set[str]:
+        """Map step names or artifact names to step names."""
+        names = set()
+        for target in targets:
+            if target in self.by_name:
+                names.add(target)
+            elif target in self.producers:
+                names.add(self.producers[target])
+            else:
+                raise KeyError(f"Unknown step or output: {target}")
+        return names
+
+    def select(self, only: list[str] | None = None, start: list[str] | None = None) -> set[str]:
+        """Steps to run: ``only`` those named, or everything ``start``-ing from the named steps."""
+        if only:
+            return self.resolve(only)
+        if start:
+            return self.downstream(self.resolve(start))
+        return set(self.by_name)
+
+    def run(self, con: duckdb.DuckDBPyConnection, selected: set[str] | None = None,
+            max_workers: int = 4, skip_unchanged: bool = False) -> dict[str, StepResult]:
+        """Run the selected steps in dependency order, in parallel where possible.
+
+        Steps outside ``selected`` are treated as already up to date.
+        """
+        selected = set(self.by_name) if selected is None else selected
+        pending = [s.name for s in self.steps if s.name in selected]
+        results: dict[str, StepResult] = {}
+        changed: dict[str, bool] = {}
+
+        def is_ready(name):
+            return all(dep in results or dep not in selected for dep in self.upstream(name))
+
+        def execute(step):
+            started_at = datetime.now()
+            start = time.perf_counter()
+            cursor = con.cursor()
+            try:
+                outcome = step.func(cursor)
+                status = "unchanged" if outcome is False else "ok"
+                return StepResult(step.name, status, started_at, time.perf_counter() - start)
+            except Exception as e:
+                traceback.print_exc()
+                return StepResult(step.name, "failed", started_at, time.perf_counter() - start, str(e))
+            finally:
+                cursor.close()
+
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="step") as pool:
+            running = {}
+            while pending or running:
+                # Start (or resolve) everything whose dependencies are done
+                progressed = True
+                while progressed:
+                    progressed = False
+                    for name in [n for n in pending if is_ready(n)]:
+                        pending.remove(name)
+                        progressed = True
+                        deps = [d for d in self.upstream(name) if d in selected]
+                        if any(not results[d].succeeded for d in deps):
+                            results[name] = StepResult(name, "skipped", error="upstream step failed")
+                        elif skip_unchanged and deps and not any(changed[d] for d in deps):
+                            results[name] = StepResult(name, "up-to-date")
+                            changed[name] = False
+                        else:
+                            running[pool.submit(execute, self.by_name[name])] = name
+
+                if not running:
+                    for name in pending:
+                        results[name] = StepResult(name, "skipped", error="dependency cycle")
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    results[name] = future.result()
+                    changed[name] = results[name].status == "ok"
+        return results
+
+    def critical_path(self, results: dict[str, StepResult]) -> tuple[list[str], float]:
+        """Longest chain of step durations through the executed graph."""
+        best: dict[str, tuple[float, list[str]]] = {}
+        for step in self.steps:  # steps are declared in dependency order
+            if step.name not in results:
+                continue
+            prior = max(
+                (best[d] for d in self.upstream(step.name) if d in best),
+                default=(0.0, []),
+                key=lambda b: b[0],
+            )
+            best[step.name] = (prior[0] + results[step.name].seconds, prior[1] + [step.name])
+        if not best:
+            return [], 0.0
+        total, path = max(best.values(), key=lambda b: b[0])
+        return path, total
+
+
+def record_timings(con: duckdb.DuckDBPyConnection, results: dict[str, StepResult]):
+    """Append step timings to ``meta.step_timings``."""
+    con.execute("CREATE SCHEMA IF NOT EXISTS meta")
+    con.execute("""
+        CREATE TABLE IF NOT EXISTS meta.step_timings (
+            run_started_at TIMESTAMP,
+            step VARCHAR,
+            status VARCHAR,
+            started_at TIMESTAMP,
+            seconds DOUBLE,
+            error VARCHAR
+        )
+    """)
+    run_started_at = min((r.started_at for r in results.values() if r.started_at), default=datetime.now())
+    con.executemany(
+        "INSERT INTO meta.step_timings VALUES (?, ?, ?, ?, ?, ?)",
+        [[run_started_at, r.name, r.status, r.started_at, r.seconds, r.error] for r in results.values()],
+    )
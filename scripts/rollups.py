@@ -0,0 +1,187 @@
+"""
+Declarative rollups: pre-aggregated summary tables over a fact table.
+
+A ``Rollup`` groups its source by a set of dimensions and stores, for every
+measure, the decomposable aggregates SUM, COUNT, MIN and MAX (AVG is
+SUM / COUNT), plus the group's row count. Coarser questions can be answered
+from a rollup by aggregating these columns again, which is what the query
+router in ``app/rollups.py`` does with matching GROUP BY queries.
+
+Every built rollup is recorded in ``meta.rollups`` together with its
+definition, so the router knows what each table can answer and the builder
+knows when a definition changed.
+
+Rollups are maintained per group: when a row-level delta of the source is
+available (``changes``: old and new images of every touched row), only the
+groups those rows fall in are recomputed. Otherwise the table is rebuilt.
+"""
+
+import hashlib
+import json
+import time
+from dataclasses import dataclass
+
+import duckdb
+
+AGGREGATES = ("sum", "count", "min", "max")
+
+
+@dataclass(frozen=True)
+class Rollup:
+    """A summary table of ``source`` grouped by ``dimensions``."""
+    name: str
+    source: str
+    # Column name -> SQL expression over the source
+    dimensions: dict[str, str]
+    measures: dict[str, str]
+
+    def definition(self) -> dict:
+        return {"source": self.source, "dimensions": self.dimensions, "measures": self.measures}
+
+    def definition_hash(self) -> str:
+        return hashlib.sha256(json.dumps(self.definition(), sort_keys=True).encode()).hexdigest()[:16]
+
+    def select(self, where: str = "") -> str:
+        dims = [f"{expr} AS {name}" for name, expr in self.dimensions.items()]
+        aggs = ["COUNT(*) AS row_count"]
+        for name, expr in self.measures.items():
+            aggs += [f"{agg.upper()}({expr}) AS {name}_{agg}" for agg in AGGREGATES]
+        return f"""
+            SELECT {', '.join(dims + aggs)}
+            FROM {self.source}
+            {where}
+            GROUP BY ALL
+        """
+
+
+DECADE = "(FLOOR(commissioning_year / 10) * 10)::INTEGER"
+PLANT_MEASURES = {
+    "capacity_mw": "capacity_mw",
+    "commissioning_year": "commissioning_year",
+    "generation_gwh_2017": "generation_gwh_2017",
+    "estimated_generation_gwh_2017": "estimated_generation_gwh_2017",
+    # Reported generation where available, WRI's estimate otherwise
+    "best_generation_gwh_2017": "COALESCE(generation_gwh_2017, estimated_generation_gwh_2017)",
+}
+
+# Finest first; the router picks the smallest rollup that covers a query
+ROLLUPS = [
+    Rollup(
+        "plants.rollup_country_fuel_decade",
+        "plants.global_power_plants",
+        dimensions={
+            "country": "country",
+            "country_long": "country_long",
+            "primary_fuel": "primary_fuel",
+            "commissioning_decade": DECADE,
+        },
+        measures=PLANT_MEASURES,
+    ),
+    Rollup(
+        "plants.rollup_country_fuel",
+        "plants.global_power_plants",
+        dimensions={"country": "country", "country_long": "country_long", "primary_fuel": "primary_fuel"},
+        measures=PLANT_MEASURES,
+    ),
+    Rollup(
+        "plants.rollup_country",
+        "plants.global_power_plants",
+        dimensions={"country": "country", "country_long": "country_long"},
+        measures=PLANT_MEASURES,
+    ),
+    Rollup(
+        "plants.rollup_fuel_decade",
+        "plants.global_power_plants",
+        dimensions={"primary_fuel": "primary_fuel", "commissioning_decade": DECADE},
+        measures=PLANT_MEASURES,
+    ),
+]
+
+
+def ensure_catalog(con: duckdb.DuckDBPyConnection):
+    """Create ``meta.rollups``, the catalog read by the query router."""
+    con.execute("CREATE SCHEMA IF NOT EXISTS meta")
+    con.execute("""
+        CREATE TABLE IF NOT EXISTS meta.rollups (
+            name VARCHAR PRIMARY KEY,
+            source VARCHAR,
+            definition JSON,
+            definition_hash VARCHAR,
+            row_count BIGINT,
+            source_rows BIGINT,
+            build_mode VARCHAR,
+            built_at TIMESTAMP
+        )
+    """)
+
+
+def _catalog_entry(con: duckdb.DuckDBPyConnection, rollup: Rollup):
+    return con.execute(
+        "SELECT definition_hash FROM meta.rollups WHERE name = ?", [rollup.name]
+    ).fetchone()
+
+
+def build_rollup(con: duckdb.DuckDBPyConnection, rollup: Rollup, changes: str | None = None) -> str:
+    """Build or update ``rollup``; returns "full" or "incremental".
+
+    ``changes`` names a table with the old and new versions of every source
+    row touched since the rollup was last built. Without it, or if the
+    definition changed, the rollup is rebuilt from scratch.
+    """
+    ensure_catalog(con)
+    entry = _catalog_entry(con, rollup)
+    incremental = changes is not None and entry == (rollup.definition_hash(),)
+    dims = ", ".join(rollup.dimensions)
+
+    con.execute("BEGIN TRANSACTION")
+    try:
+        if incremental:
+            # Groups touched by any old or new row image, identified by a hash of
+            # their dimension values (NULL-safe; a collision only recomputes an
+            # extra group, since delete and insert use the same test)
+            source_key = f"hash({', '.join(rollup.dimensions.values())})"
+            rollup_key = f"hash({dims})"
+            con.execute(f"""
+                CREATE OR REPLACE TEMP TABLE rollup_groups AS
+                SELECT DISTINCT {source_key} AS group_key FROM {changes}
+            """)
+            con.execute(f"""
+                DELETE FROM {rollup.name}
+                WHERE {rollup_key} IN (SELECT group_key FROM rollup_groups)
+            """)
+            con.execute(f"""
+                INSERT INTO {rollup.name}
+                {rollup.select(f"WHERE {source_key} IN (SELECT group_key FROM rollup_groups)")}
+            """)
+            con.execute("DROP TABLE rollup_groups")
+        else:
+            con.execute(f"CREATE OR REPLACE TABLE {rollup.name} AS {rollup.select()} ORDER BY {dims}")
+
+        row_count, covered = con.execute(
+            f"SELECT COUNT(*), COALESCE(SUM(row_count), 0) FROM {rollup.name}"
+        ).fetchone()
+        source_rows = con.execute(f"SELECT COUNT(*) FROM {rollup.source}").fetchone()[0]
+        if covered != source_rows:
+            raise RuntimeError(f"{rollup.name} covers {covered:,} of {source_rows:,} source rows")
+
+        con.execute("""
+            INSERT OR REPLACE INTO meta.rollups
+            VALUES (?, ?, ?, ?, ?, ?, ?, current_timestamp::TIMESTAMP)
+        """, [
+            rollup.name, rollup.source, json.dumps(rollup.definition()), rollup.definition_hash(),
+            row_count, source_rows, "incremental" if incremental else "full",
+        ])
+        con.execute("COMMIT")
+    except Exception:
+        con.execute("ROLLBACK")
+        raise
+    return "incremental" if incremental else "full"
+
+
+def build_rollups(con: duckdb.DuckDBPyConnection, rollups: list[Rollup], changes: str | None = None):
+    """Build every rollup, printing size and time."""
+    for rollup in rollups:
+        start = time.perf_counter()
+        mode = build_rollup(con, rollup, changes)
+        rows = con.execute(f"SELECT COUNT(*) FROM {rollup.name}").fetchone()[0]
+        print(f"  {rollup.name}: {rows:,} rows ({mode}, {time.perf_counter() - start:.2f}s)")
@@ -0,0 +1,101 @@
+"""
+Explicit, versioned column schemas for the raw seed sources.
+
+Loaders read each file with exactly these types instead of sampling it with
+``auto_detect``. Bump ``version`` whenever a column or type changes: the
+manifest records the version of every load, and a version change forces a
+full reload instead of a row-level delta.
+"""
+
+from dataclasses import dataclass, field
+
+
+@dataclass(frozen=True)
+class SourceSchema:
+    """Layout of one delimited source file."""
+    version: int
+    # Source column -> DuckDB type. Every column listed here must be in the header;
+    # any other header columns are read as VARCHAR and dropped.
+    columns: dict[str, str]
+    # Source column -> table column
+    rename: dict[str, str] = field(default_factory=dict)
+    # Row-level validation: SQL predicate over table columns -> rejection reason
+    checks: dict[str, str] = field(default_factory=dict)
+    delimiter: str = ","
+    timestampformat: str | None = None
+
+    def table_columns(self) -> list[str]:
+        return [self.rename.get(c, c) for c in self.columns]
+
+
+SCHEMAS = {
+    "wri_power_plants": SourceSchema(
+        version=1,
+        columns={
+            "country": "VARCHAR",
+            "country_long": "VARCHAR",
+            "name": "VARCHAR",
+            "gppd_idnr": "VARCHAR",
+            "capacity_mw": "DOUBLE",
+            "latitude": "DOUBLE",
+            "longitude": "DOUBLE",
+            "primary_fuel": "VARCHAR",
+            "other_fuel1": "VARCHAR",
+            "other_fuel2": "VARCHAR",
+            "other_fuel3": "VARCHAR",
+            "commissioning_year": "DOUBLE",  # fractional for plants commissioned in stages
+            "owner": "VARCHAR",
+            "source": "VARCHAR",
+            "url": "VARCHAR",
+            "geolocation_source": "VARCHAR",
+            "wepp_id": "VARCHAR",
+            "year_of_capacity_data": "DOUBLE",
+            "generation_gwh_2013": "DOUBLE",
+            "generation_gwh_2014": "DOUBLE",
+            "generation_gwh_2015": "DOUBLE",
+            "generation_gwh_2016": "DOUBLE",
+            "generation_gwh_2017": "DOUBLE",
+            "generation_data_source": "VARCHAR",
+            "estimated_generation_gwh_2013": "DOUBLE",
+            "estimated_generation_gwh_2014": "DOUBLE",
+            "estimated_generation_gwh_2015": "DOUBLE",
+            "estimated_generation_gwh_2016": "DOUBLE",
+            "estimated_generation_gwh_2017": "DOUBLE",
+        },
+        rename={"gppd_idnr": "plant_id"},
+        checks={
+            "plant_id IS NOT NULL": "missing plant_id",
+            "capacity_mw >= 0": "negative capacity_mw",
+            "latitude BETWEEN -90 AND 90": "latitude out of range",
+            "longitude BETWEEN -180 AND 180": "longitude out of range",
+        },
+    ),
+    "nrc_reactor_status": SourceSchema(
+        version=1,
+        columns={
+            "ReportDt": "TIMESTAMP",
+            "Unit": "VARCHAR",
+            "Power": "INTEGER",
+        },
+        checks={
+            "ReportDt IS NOT NULL AND Unit IS NOT NULL": "missing report date or unit",
+            "Power BETWEEN 0 AND 110": "power percent out of range",
+        },
+        delimiter="|",
+        timestampformat="%m/%d/%Y %I:%M:%S %p",
+    ),
+    # PUDL's plant table; only what the crosswalk needs is declared
+    "eia_860_plants": SourceSchema(
+        version=1,
+        columns={
+            "plant_id_eia": "INTEGER",
+            "plant_name_eia": "VARCHAR",
+            "state": "VARCHAR",
+            "latitude": "DOUBLE",
+            "longitude": "DOUBLE",
+        },
+        checks={
+            "plant_id_eia IS NOT NULL": "missing plant_id_eia",
+        },
+    ),
+}
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+Trigram index for typeahead search over plant names, owners and countries.
+
+Text is normalized (lower case, accents stripped, anything but letters and
+digits becomes a word break) and split into tokens. The index has two levels:
+
+    plants.search_documents   one row per plant (doc_id, plant_id and the fields shown in results)
+    plants.search_vocabulary  every distinct token with its document count
+    plants.search_postings    token -> (doc_id, field) for name, owner and country_long
+    plants.search_trigrams    trigram -> token, over the vocabulary only
+
+A query term is matched against the vocabulary (exactly, as a prefix, or by
+trigram similarity when misspelled), so the fuzzy step works on a few
+hundred thousand distinct tokens even when there are millions of plants.
+The matched tokens' postings then give the plants. The frontend loads these
+tables into memory once per database generation (``app/search.py``) and
+serves ``/api/search`` without querying DuckDB.
+
+On ``--incremental`` seeds only the plants touched by the last delta
+(``meta.changes_plants_global_power_plants``) are re-indexed.
+
+Usage:
+    python scripts/search_index.py                          # Rebuild the index in data/fissio.duckdb
+    python scripts/search_index.py --benchmark --scale 100  # Query latency on a 100x copy of the plants
+"""
+
+import argparse
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import duckdb
+
+# Field codes stored in plants.search_postings
+FIELDS = {"name": 1, "owner": 2, "country_long": 3}
+INDEX_TABLES = ("plants.search_documents", "plants.search_vocabulary", "plants.search_postings", "plants.search_trigrams")
+
+MACROS = [
+    """
+    CREATE OR REPLACE MACRO search_normalize(s) AS
+        trim(regexp_replace(strip_accents(lower(coalesce(s, ''))), '[^a-z0-9]+', ' ', 'g'))
+    """,
+    "CREATE OR REPLACE MACRO search_tokens(s) AS list_filter(string_split(search_normalize(s), ' '), t -> t <> '')",
+    # Padded like pg_trgm: two spaces before a token, one after
+    "CREATE OR REPLACE MACRO search_trigrams(t) AS list_transform(range(1, length(t) + 2), i -> substr('  ' || t || ' ', i, 3))",
+]
+
+
+def _occurrences(con: duckdb.DuckDBPyConnection, where: str = ""):
+    """Tokens of the documents matching ``where`` as temp table ``search_occurrences``."""
+    fields = " UNION ALL ".join(
+        f"SELECT doc_id, {code}::TINYINT AS field, {column} AS text FROM plants.search_documents {where}"
+        for column, code in FIELDS.items()
+    )
+    con.execute(f"""
+        CREATE OR REPLACE TEMP TABLE search_occurrences AS
+        SELECT DISTINCT doc_id, field, token
+        FROM (SELECT doc_id, field, unnest(search_tokens(text)) AS token FROM ({fields}))
+    """)
+
+
+def _add_tokens(con: duckdb.DuckDBPyConnection):
+    """Give tokens of ``search_occurrences`` not yet in the vocabulary an id and their trigrams."""
+    con.execute("""
+        CREATE OR REPLACE TEMP TABLE search_new_tokens AS
+        SELECT
+            (SELECT COALESCE(MAX(token_id), 0) FROM plants.search_vocabulary)
+                + row_number() OVER (ORDER BY token)::INTEGER AS token_id,
+            token
+        FROM (
+            SELECT DISTINCT token FROM search_occurrences
+            EXCEPT
+            SELECT token FROM plants.search_vocabulary
+        )
+    """)
+    con.execute("""
+        INSERT INTO plants.search_vocabulary
+        SELECT token_id, token, 0, len(list_distinct(search_trigrams(token)))
+        FROM search_new_tokens
+    """)
+    con.execute("""
+        INSERT INTO plants.search_trigrams
+        SELECT DISTINCT unnest(search_trigrams(token)) AS trigram, token_id
+        FROM search_new_tokens
+        ORDER BY trigram, token_id
+    """)
+    con.execute("DROP TABLE search_new_tokens")
+
+
+def _add_postings(con: duckdb.DuckDBPyConnection):
+    con.execute("""
+        INSERT INTO plants.search_postings
+        SELECT v.token_id, o.doc_id, o.field
+        FROM search_occurrences o
+        JOIN plants.search_vocabulary v USING (token)
+        ORDER BY v.token_id, o.doc_id
+    """)
+
+
+def _count_documents(con: duckdb.DuckDBPyConnection, tokens: str):
+    """Refresh ``doc_count`` of the token ids selected by ``tokens`` and drop tokens no plant uses any more."""
+    con.execute(f"""
+        UPDATE plants.search_vocabulary v
+        SET doc_count = c.doc_count
+        FROM (
+            SELECT t.token_id, COUNT(DISTINCT p.doc_id)::INTEGER AS doc_count
+            FROM ({tokens}) t
+            LEFT JOIN plants.search_postings p USING (token_id)
+            GROUP BY t.token_id
+        ) c
+        WHERE v.token_id = c.token_id
+    """)
+    con.execute("DELETE FROM plants.search_trigrams WHERE token_id IN (SELECT token_id FROM plants.search_vocabulary WHERE doc_count = 0)")
+    con.execute("DELETE FROM plants.search_vocabulary WHERE doc_count = 0")
+
+
+def build_search_index(con: duckdb.DuckDBPyConnection, source: str = "plants.global_power_plants",
+                       changes: str | None = None) -> str:
+    """Build the search tables from ``source``, or update them for the plants in ``changes``.
+
+    ``changes`` names a table with the old and new versions of every touched
+    row (see ``apply_delta`` in seed_data.py). Returns "full" or "incremental".
+    """
+    for macro in MACROS:
+        con.execute(macro)
+    exists = con.execute("""
+        SELECT COUNT(*) FROM duckdb_tables()
+        WHERE database_name = current_database() AND list_contains(?, schema_name || '.' || table_name)
+    """, [list(INDEX_TABLES)]).fetchone()[0] == len(INDEX_TABLES)
+    columns = "plant_id, name, owner, country_long, primary_fuel, capacity_mw"
+
+    con.execute("BEGIN TRANSACTION")
+    try:
+        if changes and exists:
+            con.execute(f"""
+                CREATE OR REPLACE TEMP TABLE search_removed AS
+                SELECT doc_id FROM plants.search_documents
+                WHERE plant_id IN (SELECT plant_id FROM {changes})
+            """)
+            con.execute("""
+                CREATE OR REPLACE TEMP TABLE search_touched AS
+                SELECT DISTINCT token_id FROM plants.search_postings
+                WHERE doc_id IN (SELECT doc_id FROM search_removed)
+            """)
+            con.execute("DELETE FROM plants.search_postings WHERE doc_id IN (SELECT doc_id FROM search_removed)")
+            con.execute("DELETE FROM plants.search_documents WHERE doc_id IN (SELECT doc_id FROM search_removed)")
+            # Current versions of the touched plants (deleted plants have none) get new doc ids
+            first = con.execute("SELECT COALESCE(MAX(doc_id), 0) + 1 FROM plants.search_documents").fetchone()[0]
+            con.execute(f"""
+                INSERT INTO plants.search_documents
+                SELECT {first - 1} + row_number() OVER (ORDER BY plant_id)::INTEGER, {columns}
+                FROM {source}
+                WHERE plant_id IN (SELECT plant_id FROM {changes})
+            """)
+            _occurrences(con, f"WHERE doc_id >= {first}")
+            _add_tokens(con)
+            _add_postings(con)
+            _count_documents(con, """
+                SELECT token_id FROM search_touched
+                UNION SELECT token_id FROM plants.search_vocabulary
+                WHERE token IN (SELECT token FROM search_occurrences)
+            """)
+            con.execute("DROP TABLE search_removed")
+            con.execute("DROP TABLE search_touched")
+            mode = "incremental"
+        else:
+            con.execute(f"""
+                CREATE OR REPLACE TABLE plants.search_documents AS
+                SELECT row_number() OVER (ORDER BY plant_id)::INTEGER AS doc_id, {columns}
+                FROM {source}
+                ORDER BY doc_id
+            """)
+            con.execute("""
+                CREATE OR REPLACE TABLE plants.search_vocabulary (
+                    token_id INTEGER, token VARCHAR, doc_count INTEGER, trigram_count SMALLINT
+                )
+            """)
+            con.execute("CREATE OR REPLACE TABLE plants.search_postings (token_id INTEGER, doc_id INTEGER, field TINYINT)")
+            con.execute("CREATE OR REPLACE TABLE plants.search_trigrams (trigram VARCHAR, token_id INTEGER)")
+            _occurrences(con)
+            _add_tokens(con)
+            _add_postings(con)
+            _count_documents(con, "SELECT token_id FROM plants.search_vocabulary")
+            mode = "full"
+        con.execute("DROP TABLE search_occurrences")
+        con.execute("COMMIT")
+    except Exception:
+        con.execute("ROLLBACK")
+        raise
+    return mode
+
+
+# =============================================================================
+# Benchmark
+# =============================================================================
+
+# Typed prefixes, whole words and misspellings of plants in the WRI data
+BENCHMARK_QUERIES = [
+    "v", "vo", "vog", "vogt", "vogtle", "peach", "peach bot", "peach botom", "three gorg", "palo verde",
+    "diablo canyon", "drax", "kashiwazaki", "grand coulee", "itaipu", "bruce", "duke energy", "edf",
+    "united states", "germ", "solar", "wind farm", "hydro", "nuclear power station", "chna", "brazl",
+]
+# Endings attached to existing tokens to grow the vocabulary of the scaled copy
+SUFFIXES = ["", "a", "o", "er", "on", "ia", "ton", "ville", "burg", "field", "dale", "ley", "ham", "stad", "sk"]
+
+
+def scaled_copy(con: duckdb.DuckDBPyConnection, factor: int, source: str = "plants.global_power_plants"):
+    """Create ``bench.plants`` with ``factor`` copies of every plant.
+
+    Copies after the first get another name word made from an existing token
+    and a suffix, so the vocabulary grows (roughly with the square root of the
+    data, as real place and company names do) instead of repeating.
+    """
+    suffixes = SUFFIXES[:max(1, min(len(SUFFIXES), round(factor ** 0.5)))]
+    con.execute("CREATE SCHEMA IF NOT EXISTS bench")
+    con.execute(f"""
+        CREATE OR REPLACE TABLE bench.plants AS
+        WITH words AS (
+            SELECT list(DISTINCT token) AS words
+            FROM (SELECT unnest(search_tokens(name)) AS token FROM {source})
+        )
+        SELECT
+            plant_id || CASE WHEN c = 0 THEN '' ELSE '-' || c END AS plant_id,
+            CASE WHEN c = 0 THEN name ELSE name || ' '
+                || words[1 + (hash(plant_id, c) % len(words))::INTEGER]
+                || $suffixes[1 + (hash(c, plant_id) % len($suffixes))::INTEGER]
+            END AS name,
+            owner, country_long, primary_fuel, capacity_mw
+        FROM {source}, range($factor) r(c), words
+    """, {"suffixes": suffixes, "factor": factor})
+
+
+def percentile(values: list[float], p: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def benchmark(db: str, factor: int, rounds: int):
+    """Build the index over a scaled copy of the plants and time the frontend's in-memory search."""
+    sys.path.append(str(Path(__file__).parent.parent / "app"))
+    from search import load
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "search.duckdb"
+        shutil.copy(db, path)
+        con = duckdb.connect(str(path))
+        for macro in MACROS:
+            con.execute(macro)
+        start = time.perf_counter()
+        scaled_copy(con, factor)
+        rows = con.execute("SELECT COUNT(*) FROM bench.plants").fetchone()[0]
+        print(f"Scaled copy: {rows:,} plants ({time.perf_counter() - start:.1f}s)")
+
+        start = time.perf_counter()
+        build_search_index(con, "bench.plants")
+        tokens = con.execute("SELECT COUNT(*) FROM plants.search_vocabulary").fetchone()[0]
+        postings = con.execute("SELECT COUNT(*) FROM plants.search_postings").fetchone()[0]
+        print(f"Index: {tokens:,} tokens, {postings:,} postings ({time.perf_counter() - start:.1f}s)")
+
+        start = time.perf_counter()
+        index = load(con)
+        print(f"Loaded into memory in {time.perf_counter() - start:.1f}s")
+        con.close()
+
+    timings = {q: [] for q in BENCHMARK_QUERIES}
+    order = BENCHMARK_QUERIES * rounds
+    random.shuffle(order)
+    for q in order:
+        start = time.perf_counter()
+        index.search(q, 10)
+        timings[q].append((time.perf_counter() - start) * 1000)
+
+    print(f"\n{'query':<26} {'p50 ms':>8} {'p99 ms':>8}  top result")
+    for q in BENCHMARK_QUERIES:
+        top = index.search(q, 1)
+        print(f"{q:<26} {percentile(timings[q], 0.5):>8.2f} {percentile(timings[q], 0.99):>8.2f}  "
+              f"{top[0]['name'] if top else '-'}")
+    everything = [t for ts in timings.values() for t in ts]
+    print(f"\nAll queries: p50 {percentile(everything, 0.5):.2f} ms, p99 {percentile(everything, 0.99):.2f} ms, "
+          f"max {max(everything):.2f} ms ({len(everything):,} queries)")
+
+
+def main():
+    from seed_data import DB_PATH
+
+    parser = argparse.ArgumentParser(description="Plant search index")
+    parser.add_argument("--benchmark", action="store_true", help="Time searches over a scaled copy of the plants")
+    parser.add_argument("--scale", type=int, default=100, help="Copies of every plant for --benchmark (default: 100)")
+    parser.add_argument("--rounds", type=int, default=50, help="Repetitions per benchmark query")
+    parser.add_argument("--db", default=str(DB_PATH), help="DuckDB database")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark(args.db, args.scale, args.rounds)
+        return
+    con = duckdb.connect(args.db)
+    build_search_index(con)
+    tokens, documents = con.execute(
+        "SELECT COUNT(*), (SELECT COUNT(*) FROM plants.search_documents) FROM plants.search_vocabulary"
+    ).fetchone()
+    print(f"Indexed {documents:,} plants ({tokens:,} distinct tokens)")
+    con.close()
+
+
+if __name__ == "__main__":
+    main()
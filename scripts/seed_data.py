@@ -9,93 +9,224 @@ Data Sources:
 - NRC Reactor Status (daily updates)
 """
 
-import duckdb
-import urllib.request
+import argparse
 import os
+import re
+import shutil
+import time
+import duckdb
 from pathlib import Path
 
+from catalog import build_stats, ensure_stats
+from crosswalk import CROSSWALK, EIA_PLANTS, build_crosswalk
+from fetch import FetchResult, fetch
+from generations import (GENERATIONS_DIR, InvalidGeneration, collect_garbage, next_number, prepare, publish, remove,
+                         validate)
+from ingest import SchemaError, ensure_quarantine, ingest_csv
+from schemas import SCHEMAS
+from search_index import build_search_index
+from parquet_export import ExportSpec, export, install, write
+from pipeline import Pipeline, Step, StepResult, record_timings
+from rollups import ROLLUPS, build_rollups
+from spatial import build_locations
+from timeseries import GRAINS, HISTORY, merge_history, refresh_downsamples
+
 # Paths
 DATA_DIR = Path(__file__).parent.parent / "data"
+# A symlink to the published generation, data/generations/fissio-<N>.duckdb
 DB_PATH = DATA_DIR / "fissio.duckdb"
+# Number of the published generation, bumped only when a load changed data; the frontend's query cache keys on it
+GENERATION_PATH = DATA_DIR / "generation"
 
 # Data source URLs
 SOURCES = {
     "wri_power_plants": {
         "url": "https://raw.githubusercontent.com/wri/global-power-plant-database/master/output_database/global_power_plant_database.csv",
+        "filename": "wri_power_plants.csv",
         "description": "WRI Global Power Plant Database v1.3.0"
     },
     "nrc_reactor_status": {
         "url": "https://www.nrc.gov/reading-rm/doc-collections/event-status/reactor-status/PowerReactorStatusForLast365Days.txt",
+        "filename": "nrc_reactor_status.txt",
         "description": "NRC Power Reactor Status (Last 365 Days)"
     },
     "eia_860_plants": {
         "url": "https://raw.githubusercontent.com/catalyst-cooperative/pudl/main/src/pudl/package_data/eia860/plant_info_eia.csv",
-        "description": "EIA-860 Plant Information (via PUDL)"
+        "filename": "eia_860_plants.csv",
+        "description": "EIA-860 Plant Information (via PUDL)",
+        # The crosswalk falls back to the EIA codes in WRI's ids without it
+        "optional": True,
     },
     "eia_923_generation": {
         "url": "https://www.eia.gov/electricity/data/state/generation_annual.xlsx",
+        "filename": "eia_923_generation.xlsx",
         "description": "EIA Annual Generation by State (Excel)"
     }
 }
 
 
-def download_file(url: str, dest: Path) -> bool:
-    """Download a file from URL to destination."""
-    print(f"  Downloading: {url}")
+# =============================================================================
+# Database generation
+# =============================================================================
+
+def read_generation() -> int:
     try:
-        urllib.request.urlretrieve(url, dest)
-        print(f"  Saved to: {dest}")
-        return True
-    except Exception as e:
-        print(f"  Error: {e}")
-        return False
+        return int(GENERATION_PATH.read_text().strip() or 0)
+    except (FileNotFoundError, ValueError):
+        return 0
+
+
+def unfinished(pipeline: Pipeline, selected: set[str], results: dict) -> list[StepResult]:
+    """Selected steps that didn't end ok, unchanged or up-to-date, in pipeline order."""
+    outcomes = [results.get(s.name, StepResult(s.name, "skipped", error="did not run"))
+                for s in pipeline.steps if s.name in selected]
+    return [r for r in outcomes if not r.succeeded]
+
+
+def data_changed(results: dict) -> bool:
+    """True if a step other than a download wrote data; fetch steps always report "ok"."""
+    return any(r.status == "ok" and not name.startswith("fetch_") for name, r in results.items())
+
+
+def write_generation(generation: int):
+    """Atomically record the published generation so cached query results are invalidated."""
+    tmp = GENERATION_PATH.with_suffix(".tmp")
+    tmp.write_text(f"{generation}\n")
+    os.replace(tmp, GENERATION_PATH)
 
 
-def seed_wri_power_plants(con: duckdb.DuckDBPyConnection):
-    """Load WRI Global Power Plant Database."""
+# =============================================================================
+# Load manifest (meta.source_manifest)
+# =============================================================================
+
+def ensure_manifest(con: duckdb.DuckDBPyConnection):
+    """Create the manifest that records what was last loaded from each source."""
+    con.execute("CREATE SCHEMA IF NOT EXISTS meta")
+    con.execute("""
+        CREATE TABLE IF NOT EXISTS meta.source_manifest (
+            source VARCHAR PRIMARY KEY,
+            checksum VARCHAR,
+            etag VARCHAR,
+            row_count BIGINT,
+            loaded_at TIMESTAMP
+        )
+    """)
+    con.execute("ALTER TABLE meta.source_manifest ADD COLUMN IF NOT EXISTS schema_version INTEGER")
+
+
+def source_unchanged(con: duckdb.DuckDBPyConnection, source: str, checksum: str | None, table: str) -> bool:
+    """True if ``checksum`` and schema version match the manifest and the target table still exists."""
+    row = con.execute(
+        "SELECT checksum, schema_version FROM meta.source_manifest WHERE source = ?", [source]
+    ).fetchone()
+    return row == (checksum, SCHEMAS[source].version) and table_exists(con, table)
+
+
+def schema_changed(con: duckdb.DuckDBPyConnection, source: str) -> bool:
+    """True if the last load of ``source`` used a different schema version."""
+    row = con.execute(
+        "SELECT schema_version FROM meta.source_manifest WHERE source = ?", [source]
+    ).fetchone()
+    return row is None or row[0] != SCHEMAS[source].version
+
+
+def record_manifest(con: duckdb.DuckDBPyConnection, source: str, checksum: str, etag: str | None, table: str):
+    """Store the checksum, ETag, row count and schema version of a completed load."""
+    count = con.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    con.execute("""
+        INSERT OR REPLACE INTO meta.source_manifest
+            (source, checksum, etag, row_count, loaded_at, schema_version)
+        VALUES (?, ?, ?, ?, current_timestamp::TIMESTAMP, ?)
+    """, [source, checksum, etag, count, SCHEMAS[source].version])
+
+
+def table_exists(con: duckdb.DuckDBPyConnection, table: str) -> bool:
+    """Check whether a ``schema.table`` exists."""
+    schema, name = table.split(".")
+    return con.execute("""
+        SELECT COUNT(*) FROM information_schema.tables
+        WHERE table_schema = ? AND table_name = ?
+    """, [schema, name]).fetchone()[0] > 0
+
+
+def changes_table(table: str) -> str:
+    """Table holding the rows touched by the last delta applied to ``table``."""
+    return "meta.changes_" + table.replace(".", "_")
+
+
+def apply_delta(con: duckdb.DuckDBPyConnection, table: str, staging: str, keys: list[str]):
+    """Upsert ``staging`` into ``table`` keyed on ``keys``, touching only changed rows.
+
+    Rows that differ in any column are replaced, new keys are inserted and keys
+    that are no longer present in the source are deleted. The old and new
+    versions of every touched row are kept in ``changes_table(table)`` so
+    derived tables (rollups) can be updated per group.
+    """
+    key_list = ", ".join(keys)
+    con.execute("BEGIN TRANSACTION")
+    try:
+        con.execute(f"""
+            CREATE OR REPLACE TEMP TABLE delta_changed AS
+            SELECT * FROM {staging}
+            EXCEPT
+            SELECT * FROM {table}
+        """)
+        deleted = con.execute(f"""
+            SELECT COUNT(*) FROM (
+                SELECT {key_list} FROM {table}
+                EXCEPT
+                SELECT {key_list} FROM {staging}
+            )
+        """).fetchone()[0]
+        changed = con.execute("SELECT COUNT(*) FROM delta_changed").fetchone()[0]
+        con.execute(f"""
+            CREATE OR REPLACE TABLE {changes_table(table)} AS
+            SELECT * FROM {table}
+            WHERE ({key_list}) IN (SELECT ({key_list}) FROM delta_changed)
+               OR ({key_list}) NOT IN (SELECT ({key_list}) FROM {staging})
+            UNION ALL
+            SELECT * FROM delta_changed
+        """)
+        con.execute(f"""
+            DELETE FROM {table}
+            WHERE ({key_list}) IN (SELECT ({key_list}) FROM delta_changed)
+               OR ({key_list}) NOT IN (SELECT ({key_list}) FROM {staging})
+        """)
+        con.execute(f"INSERT INTO {table} SELECT * FROM delta_changed")
+        con.execute("DROP TABLE delta_changed")
+        con.execute("COMMIT")
+    except Exception:
+        con.execute("ROLLBACK")
+        raise
+    print(f"  Applied delta: {changed:,} inserted/updated, {deleted:,} deleted")
+
+
+def seed_wri_power_plants(con: duckdb.DuckDBPyConnection, fetched: FetchResult, incremental: bool = False) -> bool:
+    """Load WRI Global Power Plant Database. Returns True if the table changed."""
     print("\n[1/4] WRI Global Power Plant Database")
 
-    csv_path = DATA_DIR / "wri_power_plants.csv"
+    table = "plants.global_power_plants"
+    csv_path = fetched.path
     if not csv_path.exists():
-        if not download_file(SOURCES["wri_power_plants"]["url"], csv_path):
-            return
+        print("  Source not available, skipping")
+        return False
+
+    checksum = fetched.sha256
+    if incremental and source_unchanged(con, "wri_power_plants", checksum, table):
+        print("  Source unchanged since last load, skipping")
+        return False
 
     con.execute("CREATE SCHEMA IF NOT EXISTS plants")
-    con.execute("DROP TABLE IF EXISTS plants.global_power_plants")
-    con.execute(f"""
-        CREATE TABLE plants.global_power_plants AS
-        SELECT
-            country,
-            country_long,
-            name,
-            gppd_idnr as plant_id,
-            capacity_mw,
-            latitude,
-            longitude,
-            primary_fuel,
-            other_fuel1,
-            other_fuel2,
-            other_fuel3,
-            commissioning_year,
-            owner,
-            source,
-            url,
-            geolocation_source,
-            wepp_id,
-            year_of_capacity_data,
-            generation_gwh_2013,
-            generation_gwh_2014,
-            generation_gwh_2015,
-            generation_gwh_2016,
-            generation_gwh_2017,
-            generation_data_source,
-            estimated_generation_gwh_2013,
-            estimated_generation_gwh_2014,
-            estimated_generation_gwh_2015,
-            estimated_generation_gwh_2016,
-            estimated_generation_gwh_2017
-        FROM read_csv('{csv_path}', auto_detect=true)
-    """)
+    ingest_csv(con, "wri_power_plants", csv_path, "wri_staging")
+
+    if incremental and table_exists(con, table) and not schema_changed(con, "wri_power_plants"):
+        apply_delta(con, table, "wri_staging", ["plant_id"])
+    else:
+        con.execute(f"CREATE OR REPLACE TABLE {table} AS SELECT * FROM wri_staging")
+        # No row-level changes to hand on: derived tables rebuild in full
+        con.execute(f"DROP TABLE IF EXISTS {changes_table(table)}")
+    con.execute("DROP TABLE wri_staging")
+    record_manifest(con, "wri_power_plants", checksum, fetched.etag, table)
 
     count = con.execute("SELECT COUNT(*) FROM plants.global_power_plants").fetchone()[0]
     print(f"  Loaded {count:,} power plants")
@@ -111,43 +242,61 @@ def seed_wri_power_plants(con: duckdb.DuckDBPyConnection):
     """).fetchall()
     for fuel, cnt, mw in summary:
         print(f"    {fuel}: {cnt:,} plants, {mw:,.0f} MW")
+    return True
 
 
-def seed_nrc_reactor_status(con: duckdb.DuckDBPyConnection):
-    """Load NRC Power Reactor Status."""
+def seed_nrc_reactor_status(con: duckdb.DuckDBPyConnection, fetched: FetchResult, incremental: bool = False) -> bool:
+    """Load NRC Power Reactor Status. Returns True if the table changed."""
     print("\n[2/4] NRC Power Reactor Status")
 
-    txt_path = DATA_DIR / "nrc_reactor_status.txt"
+    table = "regulatory.nrc_reactor_status"
+    txt_path = fetched.path
     if not txt_path.exists():
-        if not download_file(SOURCES["nrc_reactor_status"]["url"], txt_path):
-            return
+        print("  Source not available, skipping")
+        return False
+
+    checksum = fetched.sha256
+    if incremental and source_unchanged(con, "nrc_reactor_status", checksum, table):
+        print("  Source unchanged since last load, skipping")
+        return False
 
     con.execute("CREATE SCHEMA IF NOT EXISTS regulatory")
-    con.execute("DROP TABLE IF EXISTS regulatory.nrc_reactor_status")
 
     # NRC file is pipe-delimited
-    con.execute(f"""
-        CREATE TABLE regulatory.nrc_reactor_status AS
-        SELECT *
-        FROM read_csv('{txt_path}',
-            delim='|',
-            header=true,
-            auto_detect=true,
-            ignore_errors=true
-        )
-    """)
+    ingest_csv(con, "nrc_reactor_status", txt_path, "nrc_staging")
+
+    # One row per report date and unit
+    if incremental and table_exists(con, table) and not schema_changed(con, "nrc_reactor_status"):
+        apply_delta(con, table, "nrc_staging", ["ReportDt", "Unit"])
+    else:
+        con.execute(f"CREATE OR REPLACE TABLE {table} AS SELECT * FROM nrc_staging")
+        # No row-level changes to hand on: derived tables rebuild in full
+        con.execute(f"DROP TABLE IF EXISTS {changes_table(table)}")
+    con.execute("DROP TABLE nrc_staging")
+    record_manifest(con, "nrc_reactor_status", checksum, fetched.etag, table)
 
     count = con.execute("SELECT COUNT(*) FROM regulatory.nrc_reactor_status").fetchone()[0]
     print(f"  Loaded {count:,} reactor status records")
+    return True
+
+
+def seed_reactor_history(con: duckdb.DuckDBPyConnection):
+    """Merge the NRC status file into the reactor power history and refresh downsamples."""
+    print("\n[History] NRC reactor power history")
+    first_load = not table_exists(con, HISTORY)
+    inserted, revised = merge_history(con, "regulatory.nrc_reactor_status")
+    refresh_downsamples(con, full=first_load)
+    days, units, total = con.execute(
+        f"SELECT COUNT(DISTINCT report_date), COUNT(DISTINCT unit), COUNT(*) FROM {HISTORY}"
+    ).fetchone()
+    print(f"  Merged {inserted:,} new and {revised:,} revised reports")
+    print(f"  History: {total:,} reports, {units} units over {days:,} days")
 
 
 def seed_eia_860(con: duckdb.DuckDBPyConnection):
     """Load EIA-860 plant data."""
     print("\n[3/4] EIA Form 860 (Plant Information)")
 
-    # Try PUDL's processed CSV first
-    csv_path = DATA_DIR / "eia_860_plants.csv"
-
     # For now, create a simplified US nuclear plants table from WRI data
     con.execute("""
         CREATE OR REPLACE TABLE plants.us_nuclear_plants AS
@@ -167,15 +316,15 @@ def seed_eia_860(con: duckdb.DuckDBPyConnection):
     count = con.execute("SELECT COUNT(*) FROM plants.us_nuclear_plants").fetchone()[0]
     print(f"  Created plants.us_nuclear_plants with {count} US nuclear plants (from WRI)")
 
-    # Create US plants by fuel type
+    # Create US plants by fuel type (from the country x fuel rollup)
     con.execute("""
         CREATE OR REPLACE TABLE plants.us_plants_summary AS
         SELECT
             primary_fuel,
-            COUNT(*) as plant_count,
-            ROUND(SUM(capacity_mw), 0) as total_capacity_mw,
-            ROUND(AVG(capacity_mw), 1) as avg_capacity_mw
-        FROM plants.global_power_plants
+            SUM(row_count)::BIGINT as plant_count,
+            ROUND(SUM(capacity_mw_sum), 0) as total_capacity_mw,
+            ROUND(SUM(capacity_mw_sum) / SUM(capacity_mw_count), 1) as avg_capacity_mw
+        FROM plants.rollup_country_fuel
         WHERE country = 'USA'
         GROUP BY primary_fuel
         ORDER BY total_capacity_mw DESC
@@ -183,6 +332,46 @@ def seed_eia_860(con: duckdb.DuckDBPyConnection):
     print("  Created plants.us_plants_summary")
 
 
+def seed_eia_860_plants(con: duckdb.DuckDBPyConnection, fetched: FetchResult, incremental: bool = False) -> bool:
+    """Load EIA-860 plant codes, names and coordinates for the crosswalk. Returns True if the table changed."""
+    print("\n[EIA-860] Plant codes")
+    if not fetched.path.exists():
+        print("  Source not available, skipping")
+        return False
+    if incremental and source_unchanged(con, "eia_860_plants", fetched.sha256, EIA_PLANTS):
+        print("  Source unchanged since last load, skipping")
+        return False
+    try:
+        ingest_csv(con, "eia_860_plants", fetched.path, "eia_860_staging")
+    except (SchemaError, duckdb.Error) as e:
+        # Optional source: the crosswalk falls back to the EIA codes in WRI's ids
+        print(f"  {e}, skipping")
+        if not table_exists(con, EIA_PLANTS):
+            return False
+        con.execute(f"DROP TABLE {EIA_PLANTS}")
+        return True
+    con.execute(f"""
+        CREATE OR REPLACE TABLE {EIA_PLANTS} AS
+        SELECT DISTINCT ON (plant_id_eia) * FROM eia_860_staging ORDER BY plant_id_eia
+    """)
+    con.execute("DROP TABLE eia_860_staging")
+    record_manifest(con, "eia_860_plants", fetched.sha256, fetched.etag, EIA_PLANTS)
+    count = con.execute(f"SELECT COUNT(*) FROM {EIA_PLANTS}").fetchone()[0]
+    print(f"  Loaded {count:,} EIA plants")
+    return True
+
+
+def seed_crosswalk(con: duckdb.DuckDBPyConnection):
+    """Link WRI plants, NRC units and EIA plant codes."""
+    print("\n[Crosswalk] WRI / NRC / EIA plants")
+    counts = build_crosswalk(con, eia=EIA_PLANTS if table_exists(con, EIA_PLANTS) else None)
+    print(f"  {counts['plants']:,} US plants, {counts['eia_linked']:,} with an EIA code "
+          f"({counts['eia_resolved']:,} resolved by name and location)")
+    print(f"  Matched {counts['nrc_matched']} of {counts['nrc_units']} NRC units -> {CROSSWALK}")
+    if counts["nrc_matched"] < counts["nrc_units"]:
+        print("  Review unmatched and ambiguous units with: python scripts/crosswalk.py")
+
+
 def seed_eia_923(con: duckdb.DuckDBPyConnection):
     """Load EIA-923 generation data."""
     print("\n[4/4] EIA Form 923 (Generation)")
@@ -190,17 +379,16 @@ def seed_eia_923(con: duckdb.DuckDBPyConnection):
     # Create market schema for generation data
     con.execute("CREATE SCHEMA IF NOT EXISTS market")
 
-    # For now, create a summary view from WRI generation estimates
+    # For now, create a summary from WRI generation estimates (via the country x fuel rollup)
     con.execute("""
         CREATE OR REPLACE TABLE market.generation_summary AS
         SELECT
             country,
             primary_fuel,
-            COUNT(*) as plant_count,
-            ROUND(SUM(capacity_mw), 0) as total_capacity_mw,
-            ROUND(SUM(COALESCE(generation_gwh_2017, estimated_generation_gwh_2017, 0)), 0) as generation_gwh_2017
-        FROM plants.global_power_plants
-        GROUP BY country, primary_fuel
+            row_count::BIGINT as plant_count,
+            ROUND(capacity_mw_sum, 0) as total_capacity_mw,
+            ROUND(COALESCE(best_generation_gwh_2017_sum, 0), 0) as generation_gwh_2017
+        FROM plants.rollup_country_fuel
         ORDER BY generation_gwh_2017 DESC
     """)
 
@@ -208,6 +396,34 @@ def seed_eia_923(con: duckdb.DuckDBPyConnection):
     print(f"  Created market.generation_summary with {count} rows")
 
 
+def seed_rollups(con: duckdb.DuckDBPyConnection, incremental: bool = False):
+    """Build the pre-aggregated rollups of plants.global_power_plants."""
+    print("\n[Rollups] Pre-aggregated summaries")
+    changes = changes_table("plants.global_power_plants")
+    # Per-group update when the last load was a delta; full rebuild otherwise
+    build_rollups(con, ROLLUPS, changes if incremental and table_exists(con, changes) else None)
+
+
+def seed_plant_locations(con: duckdb.DuckDBPyConnection):
+    """Index plant coordinates by grid cell for radius, nearest and polygon search."""
+    print("\n[Spatial] Plant location index")
+    build_locations(con)
+    count = con.execute("SELECT COUNT(*) FROM plants.plant_locations").fetchone()[0]
+    print(f"  Created plants.plant_locations with {count:,} located plants")
+
+
+def seed_search_index(con: duckdb.DuckDBPyConnection, incremental: bool = False):
+    """Index plant names, owners and countries for /api/search."""
+    print("\n[Search] Plant name index")
+    changes = changes_table("plants.global_power_plants")
+    # Only the plants touched by the last delta when there was one; full rebuild otherwise
+    mode = build_search_index(con, changes=changes if incremental and table_exists(con, changes) else None)
+    documents, tokens = con.execute(
+        "SELECT (SELECT COUNT(*) FROM plants.search_documents), COUNT(*) FROM plants.search_vocabulary"
+    ).fetchone()
+    print(f"  Indexed {documents:,} plants, {tokens:,} distinct tokens ({mode})")
+
+
 def create_views(con: duckdb.DuckDBPyConnection):
     """Create useful views for analysis."""
     print("\n[Views] Creating analysis views")
@@ -231,49 +447,307 @@ def create_views(con: duckdb.DuckDBPyConnection):
     print("  Created plants.v_nuclear_plants")
 
 
-def export_parquet(con: duckdb.DuckDBPyConnection):
-    """Export key tables to Parquet for Superset."""
-    print("\n[Export] Creating Parquet files for Superset")
-
-    exports = [
-        ("plants.global_power_plants", "global_power_plants.parquet"),
-        ("plants.us_nuclear_plants", "us_nuclear_plants.parquet"),
-        ("plants.us_plants_summary", "us_plants_summary.parquet"),
+# Tables profiled into meta.table_stats / meta.column_stats for /api/catalog
+CATALOG_TABLES = [
+    "plants.global_power_plants",
+    "plants.us_nuclear_plants",
+    "plants.us_plants_summary",
+    "plants.plant_locations",
+    CROSSWALK,
+    "regulatory.nrc_reactor_status",
+    HISTORY,
+    "market.generation_summary",
+]
+
+
+def seed_stats(con: duckdb.DuckDBPyConnection, table: str):
+    """Profile a freshly loaded table for the catalog."""
+    count = build_stats(con, table)
+    print(f"  Profiled {table} ({count:,} rows)")
+
+
+# Parquet exports
+EXPORTS = [
+    # Single file for Duck-UI import; sorted so row-group min/max prune common filters
+    ExportSpec(
+        "plants.global_power_plants",
+        "global_power_plants.parquet",
+        order_by=("country", "primary_fuel", "plant_id"),
+        row_group_size=16_384,
+        dictionary_size_limit=20_000,
+    ),
+    # Hive-partitioned copy: WHERE country/primary_fuel only opens matching files
+    ExportSpec(
+        "plants.global_power_plants",
+        "global_power_plants",
+        partition_by=("country", "primary_fuel"),
+        order_by=("plant_id",),
+        row_group_size=16_384,
+        dictionary_size_limit=20_000,
+        stats_columns=("plant_id", "capacity_mw", "commissioning_year"),
+    ),
+    ExportSpec("plants.us_nuclear_plants", "us_nuclear_plants.parquet", order_by=("plant_id",)),
+    ExportSpec("plants.us_plants_summary", "us_plants_summary.parquet"),
+]
+
+
+def export_parquet(con: duckdb.DuckDBPyConnection, spec: ExportSpec, data_dir: Path, staging_dir: Path | None):
+    """Export a table to Parquet for Superset, into ``staging_dir`` until the generation is published."""
+    if staging_dir is None:
+        export(con, spec, data_dir)
+    else:
+        write(con, spec, staging_dir / spec.name)
+    print(f"  Exported {spec.table} -> {spec.name}")
+
+
+def install_exports(staging_dir: Path, data_dir: Path):
+    """Swap the Parquet exports staged for a published generation into ``data_dir``."""
+    for spec in EXPORTS:
+        staged = staging_dir / spec.name
+        if staged.exists():
+            install(spec, staged, data_dir)
+            print(f"  Published {spec.name}")
+    shutil.rmtree(staging_dir, ignore_errors=True)
+
+
+def prepare_database(con: duckdb.DuckDBPyConnection):
+    """Create schemas and bookkeeping tables up front so concurrent steps don't race on the catalog."""
+    for schema in ("plants", "regulatory", "market"):
+        con.execute(f"CREATE SCHEMA IF NOT EXISTS {schema}")
+    ensure_manifest(con)
+    ensure_quarantine(con)
+    ensure_stats(con)
+
+
+def build_pipeline(incremental: bool = False, data_dir: Path | None = None,
+                   staging_dir: Path | None = None) -> Pipeline:
+    """Declare every fetch, seed, derive and export step with its inputs and outputs.
+
+    With ``staging_dir`` Parquet exports are written there for :func:`install_exports`;
+    otherwise they replace the ones in ``data_dir`` as they're written.
+    """
+    data_dir = data_dir or DATA_DIR
+    fetched: dict[str, FetchResult] = {}
+
+    def fetch_step(name):
+        def run(con):
+            src = SOURCES[name]
+            fetched[name] = fetch(name, src["url"], data_dir / src["filename"], refresh=incremental)
+            if not fetched[name].ok and not fetched[name].path.exists() and not src.get("optional"):
+                raise RuntimeError(fetched[name].error)
+        return run
+
+    def source(name):
+        # Fetch steps left out by --only/--from fall back to the local copy; never the network
+        if name not in fetched:
+            src = SOURCES[name]
+            path = data_dir / src["filename"]
+            if path.exists():
+                fetched[name] = fetch(name, src["url"], path, refresh=False)
+            else:
+                fetched[name] = FetchResult(name, path, "failed", error="no local copy")
+        return fetched[name]
+
+    steps = [
+        Step(f"fetch_{name}", fetch_step(name), outputs=(f"file:{src['filename']}",))
+        for name, src in SOURCES.items()
     ]
-
-    for table, filename in exports:
-        path = DATA_DIR / filename
-        con.execute(f"COPY {table} TO '{path}' (FORMAT PARQUET)")
-        print(f"  Exported {table} -> {filename}")
+    steps += [
+        Step(
+            "seed_wri_power_plants",
+            lambda con: seed_wri_power_plants(con, source("wri_power_plants"), incremental),
+            inputs=("file:wri_power_plants.csv",),
+            outputs=("plants.global_power_plants",),
+        ),
+        Step(
+            "seed_nrc_reactor_status",
+            lambda con: seed_nrc_reactor_status(con, source("nrc_reactor_status"), incremental),
+            inputs=("file:nrc_reactor_status.txt",),
+            outputs=("regulatory.nrc_reactor_status",),
+        ),
+        Step(
+            "seed_reactor_history",
+            seed_reactor_history,
+            inputs=("regulatory.nrc_reactor_status",),
+            outputs=(HISTORY, *GRAINS),
+        ),
+        Step(
+            "seed_rollups",
+            lambda con: seed_rollups(con, incremental),
+            inputs=("plants.global_power_plants",),
+            outputs=tuple(rollup.name for rollup in ROLLUPS),
+        ),
+        Step(
+            "seed_eia_860",
+            seed_eia_860,
+            inputs=("plants.global_power_plants", "plants.rollup_country_fuel"),
+            outputs=("plants.us_nuclear_plants", "plants.us_plants_summary"),
+        ),
+        Step(
+            "seed_eia_860_plants",
+            lambda con: seed_eia_860_plants(con, source("eia_860_plants"), incremental),
+            inputs=("file:eia_860_plants.csv",),
+            outputs=(EIA_PLANTS,),
+        ),
+        Step(
+            "seed_crosswalk",
+            seed_crosswalk,
+            inputs=("plants.global_power_plants", HISTORY, EIA_PLANTS),
+            outputs=(CROSSWALK, "regulatory.v_reactor_status_by_plant"),
+        ),
+        Step(
+            "seed_eia_923",
+            seed_eia_923,
+            inputs=("plants.rollup_country_fuel",),
+            outputs=("market.generation_summary",),
+        ),
+        Step(
+            "seed_plant_locations",
+            seed_plant_locations,
+            inputs=("plants.global_power_plants",),
+            outputs=("plants.plant_locations",),
+        ),
+        Step(
+            "seed_search_index",
+            lambda con: seed_search_index(con, incremental),
+            inputs=("plants.global_power_plants",),
+            outputs=("plants.search_documents", "plants.search_vocabulary", "plants.search_postings",
+                     "plants.search_trigrams"),
+        ),
+        Step(
+            "create_views",
+            create_views,
+            inputs=("plants.global_power_plants",),
+            outputs=("plants.v_us_power_plants", "plants.v_nuclear_plants"),
+        ),
+    ]
+    steps += [
+        Step(
+            f"stats_{table.split('.')[1]}",
+            lambda con, table=table: seed_stats(con, table),
+            inputs=(table,),
+            outputs=(f"stats:{table}",),
+        )
+        for table in CATALOG_TABLES
+    ]
+    steps += [
+        Step(
+            spec.step_name,
+            lambda con, spec=spec: export_parquet(con, spec, data_dir, staging_dir),
+            inputs=(spec.table,),
+            outputs=(f"file:{spec.name}",),
+        )
+        for spec in EXPORTS
+    ]
+    return Pipeline(steps)
+
+
+def memory_limit(value: str) -> str:
+    """argparse type for --memory-limit: a DuckDB size such as 512MB or 1.5GiB."""
+    if not re.fullmatch(r"\d+(\.\d+)?\s*[KMGT]i?B", value):
+        raise argparse.ArgumentTypeError(f"expected a size such as 512MB or 2GiB, got {value!r}")
+    return value
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Seed DuckDB with power industry data")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Re-fetch sources, skip unchanged ones and apply only row-level changes",
+    )
+    parser.add_argument(
+        "--only",
+        nargs="+",
+        metavar="TARGET",
+        help="Run only these steps (step names or outputs such as plants.us_nuclear_plants)",
+    )
+    parser.add_argument(
+        "--from",
+        dest="start",
+        nargs="+",
+        metavar="TARGET",
+        help="Run these steps and everything downstream of them",
+    )
+    parser.add_argument("--workers", type=int, default=4, help="Steps to run concurrently (default: 4)")
+    parser.add_argument(
+        "--memory-limit",
+        type=memory_limit,
+        help="Cap DuckDB memory, e.g. 512MB; larger loads spill to disk",
+    )
+    parser.add_argument("--list", action="store_true", help="List pipeline steps and exit")
+    return parser.parse_args()
+
+
+def print_timings(pipeline: Pipeline, results: dict, wall: float):
+    """Print how long each step took and the critical path through the graph."""
+    print("\nStep timings:")
+    for step in pipeline.steps:
+        if step.name in results:
+            r = results[step.name]
+            note = f"  ({r.error})" if r.error else ""
+            print(f"  {step.name:<28} {r.status:<11} {r.seconds:7.2f}s{note}")
+    path, length = pipeline.critical_path(results)
+    total = sum(r.seconds for r in results.values())
+    print(f"\n  Critical path: {' -> '.join(path)} ({length:.2f}s)")
+    print(f"  Wall time: {wall:.2f}s (sum of steps: {total:.2f}s)")
 
 
 def main():
+    args = parse_args()
+
     print("=" * 60)
     print("Fissio Base - Data Seeding Script")
     print("=" * 60)
 
+    # Parquet exports wait here until their generation is published
+    staging_dir = DB_PATH.parent / GENERATIONS_DIR / "exports"
+    pipeline = build_pipeline(args.incremental, staging_dir=staging_dir)
+    if args.list:
+        for step in pipeline.steps:
+            print(f"{step.name:<28} {', '.join(step.inputs) or '-'} -> {', '.join(step.outputs)}")
+        return
+    selected = pipeline.select(only=args.only, start=args.start)
+
     # Ensure data directory exists
     DATA_DIR.mkdir(exist_ok=True)
-
-    # Connect to DuckDB
-    print(f"\nConnecting to: {DB_PATH}")
-    con = duckdb.connect(str(DB_PATH))
+    shutil.rmtree(staging_dir, ignore_errors=True)  # left by an interrupted run
+    staging_dir.mkdir(parents=True)
+
+    # Build a new generation; readers stay on the published one until it's swapped in
+    generation = next_number(DB_PATH, read_generation())
+    build = prepare(DB_PATH, generation)
+    print(f"\nBuilding generation {generation}: {build}")
+    # Passed as config rather than SET, which takes no parameters
+    config = {}
+    if args.memory_limit:
+        # Lets loads stream through without buffering rows to keep file order
+        config = {"memory_limit": args.memory_limit, "preserve_insertion_order": False}
+    con = duckdb.connect(str(build), config=config)
 
     # Install and load extensions
     con.execute("INSTALL httpfs")
     con.execute("LOAD httpfs")
 
-    # Seed each data source
-    seed_wri_power_plants(con)
-    seed_nrc_reactor_status(con)
-    seed_eia_860(con)
-    seed_eia_923(con)
-
-    # Create views
-    create_views(con)
-
-    # Export to Parquet
-    export_parquet(con)
+    prepare_database(con)
+
+    # Run fetch, seed, derive and export steps as a dependency graph
+    start = time.perf_counter()
+    results = pipeline.run(con, selected, max_workers=args.workers, skip_unchanged=args.incremental)
+    print_timings(pipeline, results, time.perf_counter() - start)
+    record_timings(con, results)
+
+    # validate() only sees tables that open and have rows, so it can't tell a step failed and
+    # left the previous generation's copy of its table behind: publish only after a clean run
+    failed = unfinished(pipeline, selected, results)
+    if failed:
+        con.close()
+        remove(build)
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        print(f"\nSeeding failed; generation {generation} not published:")
+        for r in failed:
+            print(f"  - {r.name}: {r.status} ({r.error})")
+        raise SystemExit(1)
 
     # Summary
     print("\n" + "=" * 60)
@@ -286,14 +760,17 @@ def main():
         print(f"  - {schema}")
 
     print("\nTables:")
+    # Profiled row counts where the catalog has them; an exact count otherwise
     tables = con.execute("""
-        SELECT table_schema, table_name
-        FROM information_schema.tables
-        WHERE table_schema IN ('plants', 'regulatory', 'market')
-        ORDER BY table_schema, table_name
+        SELECT t.schema_name, t.table_name, s.row_count
+        FROM duckdb_tables() t
+        LEFT JOIN meta.table_stats s ON s.table_schema = t.schema_name AND s.table_name = t.table_name
+        WHERE t.database_name = current_database() AND t.schema_name IN ('plants', 'regulatory', 'market')
+        ORDER BY t.schema_name, t.table_name
     """).fetchall()
-    for schema, table in tables:
-        count = con.execute(f"SELECT COUNT(*) FROM {schema}.{table}").fetchone()[0]
+    for schema, table, count in tables:
+        if count is None:
+            count = con.execute(f'SELECT COUNT(*) FROM "{schema}"."{table}"').fetchone()[0]
         print(f"  - {schema}.{table} ({count:,} rows)")
 
     print("\nViews:")
@@ -306,11 +783,39 @@ def main():
         print(f"  - {schema}.{view}")
 
     print("\nParquet exports:")
-    for f in DATA_DIR.glob("*.parquet"):
-        size_mb = f.stat().st_size / (1024 * 1024)
-        print(f"  - {f.name} ({size_mb:.1f} MB)")
+    for spec in EXPORTS:
+        path = staging_dir / spec.name
+        if path.is_dir():
+            files = list(path.glob("**/*.parquet"))
+            size_mb = sum(f.stat().st_size for f in files) / (1024 * 1024)
+            print(f"  - {spec.name}/ ({len(files):,} files, {size_mb:.1f} MB)")
+        elif path.exists():
+            size_mb = path.stat().st_size / (1024 * 1024)
+            print(f"  - {spec.name} ({size_mb:.1f} MB)")
 
     con.close()
+
+    if not data_changed(results):
+        remove(build)
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        print(f"\nNo data changed; generation {read_generation()} stays published")
+    else:
+        try:
+            validate(build)
+        except InvalidGeneration as e:
+            remove(build)
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            print(f"\nGeneration {generation} not published: {e}")
+            raise SystemExit(1)
+        publish(DB_PATH, build)
+        # Exports follow the database, so they never describe a generation readers can't see yet
+        install_exports(staging_dir, DATA_DIR)
+        # After the swap, so readers never cache pre-load results under the new number
+        write_generation(generation)
+        print(f"\nPublished generation {generation}")
+    for path in collect_garbage(DB_PATH):
+        print(f"  Removed drained {path.name}")
+
     print("\nDone! Open http://localhost:8080 to explore the data.")
 
 
@@ -1,18 +1,41 @@
 #!/usr/bin/env python3
 """
-Set up Superset with DuckDB connection and sample dashboard.
-
-Run inside Superset container:
-    docker compose exec superset python /app/data/../scripts/setup_superset.py
+Provision Superset from a declarative spec: databases, datasets, charts and dashboards.
+
+Run inside the Superset container:
+    docker compose exec superset python /app/scripts/setup_superset.py
+    docker compose exec superset python /app/scripts/setup_superset.py tenants.json --dry-run
+
+``superset_spec.json`` (JSON, or YAML for ``.yml``/``.yaml`` files) names every
+object; charts refer to datasets as ``schema.table`` and dashboards to charts
+by name. Several spec files are merged, so tenant dashboards can live in their own.
+
+The whole spec is applied in one transaction:
+- Existing objects are loaded with one query per type and diffed against the
+  spec. Only missing or changed objects are written, so a rerun is a no-op and
+  edited chart params or layouts are applied.
+- New objects of each type are added together and flushed once.
+- Columns of new datasets (every dataset with ``--refresh-metadata``) are read
+  with one ``information_schema`` query per database, databases in parallel,
+  instead of a ``fetch_metadata()`` round trip per dataset.
+Objects that aren't in the spec are left alone.
 """
 
+import argparse
 import json
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable
 
 # Superset imports
 try:
+    from sqlalchemy import bindparam, create_engine, text
+    from sqlalchemy.orm import selectinload
     from superset import app, db
-    from superset.connectors.sqla.models import SqlaTable
+    from superset.connectors.sqla.models import SqlaTable, SqlMetric, TableColumn
     from superset.models.core import Database
     from superset.models.dashboard import Dashboard
     from superset.models.slice import Slice
@@ -20,230 +43,427 @@ except ImportError:
     print("Error: Must run inside Superset container")
     sys.exit(1)
 
-
-def create_database_connection():
-    """Create DuckDB database connection."""
-    with app.app_context():
-        # Check if already exists
-        existing = db.session.query(Database).filter_by(database_name="Fissio DuckDB").first()
-        if existing:
-            print("Database 'Fissio DuckDB' already exists")
-            return existing
-
-        database = Database(
-            database_name="Fissio DuckDB",
-            sqlalchemy_uri="duckdb:////app/data/fissio.duckdb",
-            expose_in_sqllab=True,
-            allow_run_async=True,
-            allow_ctas=False,
-            allow_cvas=False,
-            extra=json.dumps({
-                "allows_virtual_table_explore": True,
-            })
-        )
-        db.session.add(database)
-        db.session.commit()
-        print(f"Created database connection: {database.database_name}")
-        return database
-
-
-def create_dataset(database, table_name, schema="plants"):
-    """Create a dataset from a table."""
-    with app.app_context():
-        full_name = f"{schema}.{table_name}"
-
-        # Check if exists
-        existing = db.session.query(SqlaTable).filter_by(
-            table_name=table_name,
-            schema=schema,
-            database_id=database.id
-        ).first()
-        if existing:
-            print(f"Dataset '{full_name}' already exists")
-            return existing
-
-        dataset = SqlaTable(
-            table_name=table_name,
-            schema=schema,
-            database=database,
-        )
-        db.session.add(dataset)
-        db.session.commit()
-
-        # Fetch columns
-        dataset.fetch_metadata()
-        db.session.commit()
-
-        print(f"Created dataset: {full_name}")
-        return dataset
-
-
-def create_chart(name, viz_type, datasource, params):
-    """Create a chart/slice."""
-    with app.app_context():
-        # Check if exists
-        existing = db.session.query(Slice).filter_by(slice_name=name).first()
-        if existing:
-            print(f"Chart '{name}' already exists")
-            return existing
-
-        chart = Slice(
-            slice_name=name,
-            viz_type=viz_type,
-            datasource_type="table",
-            datasource_id=datasource.id,
-            params=json.dumps(params),
-        )
-        db.session.add(chart)
-        db.session.commit()
-        print(f"Created chart: {name}")
-        return chart
-
-
-def create_dashboard(name, slug, charts):
-    """Create a dashboard with charts."""
-    with app.app_context():
-        # Check if exists
-        existing = db.session.query(Dashboard).filter_by(slug=slug).first()
-        if existing:
-            print(f"Dashboard '{name}' already exists")
-            return existing
-
-        # Create position JSON for charts
-        positions = {
-            "DASHBOARD_VERSION_KEY": "v2",
-            "ROOT_ID": {"type": "ROOT", "id": "ROOT_ID", "children": ["GRID_ID"]},
-            "GRID_ID": {
-                "type": "GRID",
-                "id": "GRID_ID",
-                "children": [],
-                "parents": ["ROOT_ID"]
-            },
-            "HEADER_ID": {
-                "id": "HEADER_ID",
-                "type": "HEADER",
-                "meta": {"text": name}
-            }
-        }
-
-        # Add charts to grid
-        row_id = "ROW-1"
-        positions["GRID_ID"]["children"].append(row_id)
-        positions[row_id] = {
-            "type": "ROW",
-            "id": row_id,
-            "children": [],
+SPEC_PATH = Path(__file__).parent / "superset_spec.json"
+METADATA_WORKERS = 4
+# Text columns holding JSON, compared parsed so key order and spacing don't count as changes
+JSON_FIELDS = {"extra", "params", "position_json"}
+KINDS = ("databases", "datasets", "charts", "dashboards")
+
+
+class SpecError(Exception):
+    """The spec is malformed or refers to objects it doesn't define."""
+
+
+@dataclass
+class Change:
+    kind: str
+    name: str
+    action: str  # create | update | unchanged
+    fields: list[str] = field(default_factory=list)
+
+
+# =============================================================================
+# Spec
+# =============================================================================
+
+def load_spec(paths: list[Path]) -> dict:
+    """Read and merge spec files."""
+    spec = {kind: [] for kind in KINDS}
+    for path in paths:
+        if path.suffix in (".yml", ".yaml"):
+            import yaml  # shipped with Superset
+            data = yaml.safe_load(path.read_text())
+        else:
+            data = json.loads(path.read_text())
+        for kind in KINDS:
+            spec[kind] += data.get(kind, [])
+    check_spec(spec)
+    return spec
+
+
+def dataset_name(item: dict) -> str:
+    return f"{item['schema']}.{item['table']}"
+
+
+def check_spec(spec: dict):
+    """Report every missing key, duplicate and dangling reference at once, before anything is written."""
+    problems = []
+    required = {
+        "databases": ("name", "sqlalchemy_uri"),
+        "datasets": ("database", "schema", "table"),
+        "charts": ("name", "dataset", "viz_type"),
+        "dashboards": ("slug", "title", "rows"),
+    }
+    for kind, keys in required.items():
+        for i, item in enumerate(spec[kind]):
+            missing = [k for k in keys if k not in item]
+            if missing:
+                problems.append(f"{kind}[{i}] is missing {', '.join(missing)}")
+    if problems:
+        raise SpecError("\n".join(problems))
+
+    def unique(kind, names):
+        seen = set()
+        for name in names:
+            if name in seen:
+                problems.append(f"{kind} {name!r} is defined twice")
+            seen.add(name)
+        return seen
+
+    unique("database", (d["name"] for d in spec["databases"]))
+    datasets = unique("dataset", (dataset_name(d) for d in spec["datasets"]))
+    charts = unique("chart", (c["name"] for c in spec["charts"]))
+    unique("dashboard", (d["slug"] for d in spec["dashboards"]))
+    for chart in spec["charts"]:
+        if chart["dataset"] not in datasets:
+            problems.append(f"chart {chart['name']!r} uses undefined dataset {chart['dataset']!r}")
+    for dashboard in spec["dashboards"]:
+        for row in dashboard["rows"]:
+            for cell in row:
+                if cell["chart"] not in charts:
+                    problems.append(f"dashboard {dashboard['slug']!r} shows undefined chart {cell['chart']!r}")
+    if problems:
+        raise SpecError("\n".join(problems))
+
+
+def layout(title: str, rows: list[list[dict]], charts: dict[str, Slice]) -> dict:
+    """Dashboard position JSON: a header and one grid row per spec row."""
+    position = {
+        "DASHBOARD_VERSION_KEY": "v2",
+        "ROOT_ID": {"type": "ROOT", "id": "ROOT_ID", "children": ["GRID_ID"]},
+        "GRID_ID": {"type": "GRID", "id": "GRID_ID", "children": [], "parents": ["ROOT_ID"]},
+        "HEADER_ID": {"id": "HEADER_ID", "type": "HEADER", "meta": {"text": title}},
+    }
+    for i, row in enumerate(rows, 1):
+        row_id = f"ROW-{i}"
+        position["GRID_ID"]["children"].append(row_id)
+        position[row_id] = {
+            "type": "ROW", "id": row_id, "children": [],
             "parents": ["ROOT_ID", "GRID_ID"],
-            "meta": {"background": "BACKGROUND_TRANSPARENT"}
+            "meta": {"background": "BACKGROUND_TRANSPARENT"},
         }
-
-        for i, chart in enumerate(charts):
+        for cell in row:
+            chart = charts[cell["chart"]]
             chart_id = f"CHART-{chart.id}"
-            positions[row_id]["children"].append(chart_id)
-            positions[chart_id] = {
-                "type": "CHART",
-                "id": chart_id,
-                "children": [],
+            position[row_id]["children"].append(chart_id)
+            position[chart_id] = {
+                "type": "CHART", "id": chart_id, "children": [],
                 "parents": ["ROOT_ID", "GRID_ID", row_id],
                 "meta": {
-                    "width": 4,
-                    "height": 50,
+                    "width": cell.get("width", 4),
+                    "height": cell.get("height", 50),
                     "chartId": chart.id,
-                    "sliceName": chart.slice_name
-                }
+                    "sliceName": chart.slice_name,
+                },
             }
-
-        dashboard = Dashboard(
-            dashboard_title=name,
-            slug=slug,
-            position_json=json.dumps(positions),
-            published=True,
-        )
-        dashboard.slices = charts
-        db.session.add(dashboard)
-        db.session.commit()
-        print(f"Created dashboard: {name}")
-        return dashboard
+    return position
+
+
+# =============================================================================
+# Diff
+# =============================================================================
+
+def differs(field_name: str, current, wanted) -> bool:
+    if field_name in JSON_FIELDS:
+        try:
+            return json.loads(current or "{}") != json.loads(wanted)
+        except (TypeError, ValueError):
+            return True
+    return current != wanted
+
+
+def sync(obj, desired: dict) -> list[str]:
+    """Set the fields of ``obj`` that differ from ``desired`` and return their names."""
+    changed = [name for name, value in desired.items() if differs(name, getattr(obj, name), value)]
+    for name in changed:
+        setattr(obj, name, desired[name])
+    return changed
+
+
+def record(changes: list[Change], kind: str, name: str, fields: list[str] | None):
+    """``fields`` is None for a new object."""
+    if fields is None:
+        changes.append(Change(kind, name, "create"))
+    else:
+        changes.append(Change(kind, name, "update" if fields else "unchanged", fields))
+
+
+# =============================================================================
+# Dataset columns
+# =============================================================================
+
+def columns_reader(database: Database, tables: list[tuple[str, str]]) -> Callable[[], dict]:
+    """A job returning the column names and types of ``tables`` (schema, table), read with one query.
+
+    The job uses its own engine, built from values read here, so it can run
+    on a worker thread without touching the ORM session.
+    """
+    uri = database.sqlalchemy_uri_decrypted
+    engine_params = database.get_extra().get("engine_params", {})
+
+    def work():
+        engine = create_engine(uri, **engine_params)
+        try:
+            with engine.connect() as conn:
+                rows = conn.execute(text("""
+                    SELECT table_schema, table_name, column_name, data_type
+                    FROM information_schema.columns
+                    WHERE table_schema IN :schemas
+                    ORDER BY table_schema, table_name, ordinal_position
+                """).bindparams(bindparam("schemas", expanding=True)),
+                    {"schemas": sorted({schema for schema, _ in tables})}).fetchall()
+        finally:
+            engine.dispose()
+        wanted = set(tables)
+        columns: dict[tuple[str, str], list[tuple[str, str]]] = {}
+        for schema, table, column, data_type in rows:
+            if (schema, table) in wanted:
+                columns.setdefault((schema, table), []).append((column, data_type))
+        return columns
+
+    return work
+
+
+def sync_columns(dataset: SqlaTable, columns: list[tuple[str, str]]) -> bool:
+    """Bring the dataset's physical columns and default metric in line with the table, like ``fetch_metadata()``."""
+    engine_spec = dataset.database.db_engine_spec
+    existing = {c.column_name: c for c in dataset.columns}
+    changed = False
+    for name, data_type in columns:
+        column = existing.pop(name, None)
+        if column is None:
+            column_spec = engine_spec.get_column_spec(data_type)
+            dataset.columns.append(TableColumn(
+                column_name=name, type=data_type, is_dttm=bool(column_spec and column_spec.is_dttm),
+                groupby=True, filterable=True,
+            ))
+            changed = True
+        elif column.type != data_type:
+            column.type = data_type
+            changed = True
+    for column in existing.values():
+        if not column.expression:  # dropped from the table; calculated columns stay
+            dataset.columns.remove(column)
+            changed = True
+    if not any(m.metric_name == "count" for m in dataset.metrics):
+        dataset.metrics.append(SqlMetric(
+            metric_name="count", verbose_name="COUNT(*)", metric_type="count", expression="COUNT(*)",
+        ))
+        changed = True
+    return changed
+
+
+def refresh_metadata(datasets: list[SqlaTable], changes: dict[str, Change]):
+    """Read columns for ``datasets``, one query per database, databases in parallel."""
+    by_database: dict[int, list[SqlaTable]] = {}
+    for dataset in datasets:
+        by_database.setdefault(dataset.database_id, []).append(dataset)
+    jobs = {
+        database_id: columns_reader(group[0].database, [(d.schema, d.table_name) for d in group])
+        for database_id, group in by_database.items()
+    }
+    with ThreadPoolExecutor(max_workers=METADATA_WORKERS) as pool:
+        futures = {database_id: pool.submit(job) for database_id, job in jobs.items()}
+        results = {database_id: future.result() for database_id, future in futures.items()}
+
+    for database_id, group in by_database.items():
+        for dataset in group:
+            name = f"{dataset.schema}.{dataset.table_name}"
+            columns = results[database_id].get((dataset.schema, dataset.table_name))
+            if not columns:
+                print(f"  Warning: {name} not found in the database; columns not read (seed first?)")
+                continue
+            if sync_columns(dataset, columns) and changes[name].action != "create":
+                changes[name].action = "update"
+                changes[name].fields.append("columns")
+
+
+# =============================================================================
+# Apply
+# =============================================================================
+
+def provision(spec: dict, refresh_all: bool = False) -> list[Change]:
+    """Diff ``spec`` against Superset and stage every change in the current session (no commit)."""
+    changes: list[Change] = []
+
+    # Databases (including ones datasets use but the spec doesn't define)
+    names = {d["name"] for d in spec["databases"]} | {d["database"] for d in spec["datasets"]}
+    databases = {d.database_name: d for d in
+                 db.session.query(Database).filter(Database.database_name.in_(names))}
+    new = []
+    for item in spec["databases"]:
+        desired = {
+            "sqlalchemy_uri": item["sqlalchemy_uri"],
+            "expose_in_sqllab": item.get("expose_in_sqllab", True),
+            "allow_run_async": item.get("allow_run_async", False),
+            "allow_ctas": item.get("allow_ctas", False),
+            "allow_cvas": item.get("allow_cvas", False),
+        }
+        database = databases.get(item["name"])
+        if database is None:
+            database = Database(database_name=item["name"], extra=json.dumps(item.get("extra", {})), **desired)
+            databases[item["name"]] = database
+            new.append(database)
+            record(changes, "database", item["name"], None)
+        else:
+            # Merged, so settings made in the UI survive
+            desired["extra"] = json.dumps({**json.loads(database.extra or "{}"), **item.get("extra", {})})
+            record(changes, "database", item["name"], sync(database, desired))
+    missing = names - databases.keys()
+    if missing:
+        raise SpecError(f"Datasets use databases that neither the spec nor Superset define: {', '.join(sorted(missing))}")
+    db.session.add_all(new)
+    db.session.flush()
+
+    # Datasets
+    cache_timeouts = app.config.get("DATASET_CACHE_TIMEOUTS", {})
+    existing = {
+        (d.database_id, d.schema, d.table_name): d
+        for d in db.session.query(SqlaTable)
+        .filter(SqlaTable.database_id.in_([d.id for d in databases.values()]),
+                SqlaTable.table_name.in_({d["table"] for d in spec["datasets"]}))
+        .options(selectinload(SqlaTable.columns), selectinload(SqlaTable.metrics))
+    }
+    datasets: dict[str, SqlaTable] = {}
+    dataset_changes: dict[str, Change] = {}
+    new, to_refresh = [], []
+    for item in spec["datasets"]:
+        name = dataset_name(item)
+        database = databases[item["database"]]
+        desired = {"cache_timeout": item.get("cache_timeout", cache_timeouts.get(name))}
+        dataset = existing.get((database.id, item["schema"], item["table"]))
+        if dataset is None:
+            dataset = SqlaTable(table_name=item["table"], schema=item["schema"], database=database, **desired)
+            new.append(dataset)
+            to_refresh.append(dataset)
+            record(changes, "dataset", name, None)
+        else:
+            if refresh_all or not dataset.columns:
+                to_refresh.append(dataset)
+            record(changes, "dataset", name, sync(dataset, desired))
+        datasets[name] = dataset
+        dataset_changes[name] = changes[-1]
+    db.session.add_all(new)
+    db.session.flush()
+    if to_refresh:
+        refresh_metadata(to_refresh, dataset_changes)
+
+    # Charts
+    charts = {}
+    for chart in db.session.query(Slice).filter(Slice.slice_name.in_([c["name"] for c in spec["charts"]])):
+        charts.setdefault(chart.slice_name, chart)  # the oldest, if the name was reused
+    new = []
+    for item in spec["charts"]:
+        dataset = datasets[item["dataset"]]
+        params = {**item.get("params", {}), "datasource": f"{dataset.id}__table", "viz_type": item["viz_type"]}
+        desired = {
+            "viz_type": item["viz_type"],
+            "datasource_type": "table",
+            "datasource_id": dataset.id,
+            "params": json.dumps(params),
+            "cache_timeout": item.get("cache_timeout"),
+        }
+        chart = charts.get(item["name"])
+        if chart is None:
+            chart = Slice(slice_name=item["name"], **desired)
+            charts[item["name"]] = chart
+            new.append(chart)
+            record(changes, "chart", item["name"], None)
+        else:
+            record(changes, "chart", item["name"], sync(chart, desired))
+    db.session.add_all(new)
+    db.session.flush()
+
+    # Dashboards
+    dashboards = {d.slug: d for d in
+                  db.session.query(Dashboard)
+                  .filter(Dashboard.slug.in_([d["slug"] for d in spec["dashboards"]]))
+                  .options(selectinload(Dashboard.slices))}
+    new = []
+    for item in spec["dashboards"]:
+        slices = [charts[cell["chart"]] for row in item["rows"] for cell in row]
+        desired = {
+            "dashboard_title": item["title"],
+            "published": item.get("published", True),
+            "position_json": json.dumps(layout(item["title"], item["rows"], charts)),
+        }
+        dashboard = dashboards.get(item["slug"])
+        if dashboard is None:
+            dashboard = Dashboard(slug=item["slug"], **desired)
+            dashboard.slices = slices
+            new.append(dashboard)
+            record(changes, "dashboard", item["slug"], None)
+        else:
+            fields = sync(dashboard, desired)
+            if {c.id for c in dashboard.slices} != {c.id for c in slices}:
+                dashboard.slices = slices
+                fields.append("charts")
+            record(changes, "dashboard", item["slug"], fields)
+    db.session.add_all(new)
+    db.session.flush()
+    return changes
+
+
+def print_changes(changes: list[Change]):
+    symbols = {"create": "+", "update": "~"}
+    for change in changes:
+        if change.action in symbols:
+            detail = f" ({', '.join(change.fields)})" if change.fields else ""
+            print(f"  {symbols[change.action]} {change.kind} {change.name}{detail}")
+    counts = {action: sum(c.action == action for c in changes) for action in ("create", "update", "unchanged")}
+    print(f"\n  {counts['create']} created, {counts['update']} updated, {counts['unchanged']} unchanged")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Provision Superset from a declarative spec")
+    parser.add_argument("specs", nargs="*", type=Path, default=[SPEC_PATH],
+                        help="Spec files to merge (default: superset_spec.json)")
+    parser.add_argument("--dry-run", action="store_true", help="Show what would change, then roll back")
+    parser.add_argument("--refresh-metadata", action="store_true",
+                        help="Re-read the columns of every dataset, not only new ones")
+    return parser.parse_args()
 
 
 def main():
+    args = parse_args()
+
     print("=" * 60)
     print("Fissio Superset Setup")
     print("=" * 60)
 
-    # 1. Create database connection
-    print("\n[1/4] Creating database connection...")
-    database = create_database_connection()
-
-    # 2. Create datasets
-    print("\n[2/4] Creating datasets...")
-    ds_power_plants = create_dataset(database, "global_power_plants", "plants")
-    ds_us_nuclear = create_dataset(database, "us_nuclear_plants", "plants")
-    ds_us_summary = create_dataset(database, "us_plants_summary", "plants")
-
-    # 3. Create charts
-    print("\n[3/4] Creating charts...")
-
-    # Chart 1: Capacity by Fuel Type (Bar)
-    chart1 = create_chart(
-        name="Global Capacity by Fuel Type",
-        viz_type="echarts_timeseries_bar",
-        datasource=ds_power_plants,
-        params={
-            "datasource": f"{ds_power_plants.id}__table",
-            "viz_type": "echarts_timeseries_bar",
-            "metrics": [{"label": "Total MW", "expressionType": "SQL", "sqlExpression": "SUM(capacity_mw)"}],
-            "groupby": ["primary_fuel"],
-            "row_limit": 15,
-            "order_desc": True,
-            "color_scheme": "supersetColors",
-        }
-    )
-
-    # Chart 2: Plant Count by Country (Table)
-    chart2 = create_chart(
-        name="Top Countries by Plant Count",
-        viz_type="table",
-        datasource=ds_power_plants,
-        params={
-            "datasource": f"{ds_power_plants.id}__table",
-            "viz_type": "table",
-            "metrics": [{"label": "Count", "expressionType": "SQL", "sqlExpression": "COUNT(*)"}],
-            "groupby": ["country_long"],
-            "row_limit": 20,
-            "order_desc": True,
-        }
-    )
-
-    # Chart 3: US Nuclear Plants (Table)
-    chart3 = create_chart(
-        name="US Nuclear Plants",
-        viz_type="table",
-        datasource=ds_us_nuclear,
-        params={
-            "datasource": f"{ds_us_nuclear.id}__table",
-            "viz_type": "table",
-            "all_columns": ["name", "capacity_mw", "commissioning_year", "owner"],
-            "row_limit": 100,
-            "order_by_cols": ["capacity_mw"],
-            "order_desc": True,
-        }
-    )
+    try:
+        spec = load_spec(args.specs)
+    except SpecError as e:
+        print(f"\nInvalid spec:\n{e}")
+        sys.exit(1)
+    print(f"\nSpec: {', '.join(str(p) for p in args.specs)}")
+    print("  " + ", ".join(f"{len(spec[kind])} {kind}" for kind in KINDS))
 
-    # 4. Create dashboard
-    print("\n[4/4] Creating dashboard...")
-    charts = [c for c in [chart1, chart2, chart3] if c is not None]
-    dashboard = create_dashboard(
-        name="Power Plant Analytics",
-        slug="power-plants",
-        charts=charts
-    )
+    start = time.perf_counter()
+    with app.app_context():
+        try:
+            changes = provision(spec, args.refresh_metadata)
+        except SpecError as e:
+            db.session.rollback()
+            print(f"\nInvalid spec:\n{e}")
+            sys.exit(1)
+        except Exception:
+            db.session.rollback()
+            raise
+        print("\nChanges:")
+        print_changes(changes)
+        if args.dry_run:
+            db.session.rollback()
+            print("  Dry run: rolled back")
+        else:
+            db.session.commit()
+    print(f"  Applied in {time.perf_counter() - start:.2f}s")
 
     print("\n" + "=" * 60)
     print("Setup Complete!")
     print("=" * 60)
-    print("\nAccess the dashboard at:")
-    print("  http://localhost:8088/superset/dashboard/power-plants/")
+    for item in spec["dashboards"]:
+        print(f"  http://localhost:8088/superset/dashboard/{item['slug']}/")
     print("\nCredentials: admin / admin")
 
 
@@ -8,9 +8,15 @@ import json
 from superset import db
 from superset.models.core import Database
 
+# Read-only, so the web server and the Celery workers can all open the file
+extra = {"engine_params": {"connect_args": {"read_only": True}}}
+
 # Check if already exists
 existing = db.session.query(Database).filter_by(database_name="Fissio DuckDB").first()
 if existing:
+    existing.allow_run_async = True
+    existing.extra = json.dumps({**json.loads(existing.extra or "{}"), **extra})
+    db.session.commit()
     print("Database 'Fissio DuckDB' already exists, id:", existing.id)
 else:
     database = Database(
@@ -20,6 +26,7 @@ else:
         allow_run_async=True,
         allow_ctas=False,
         allow_cvas=False,
+        extra=json.dumps(extra),
     )
     db.session.add(database)
     db.session.commit()
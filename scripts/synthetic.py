@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+"""
+Deterministic synthetic power plant, reactor status and generation data, at any scale.
+
+Three targets:
+
+- ``csv`` (default): ``wri_power_plants.csv`` and ``nrc_reactor_status.txt`` in
+  the same layout as the real downloads (see ``schemas.py``), so the seed
+  pipeline ingests them unchanged. Used by ``benchmark.py``.
+- ``duckdb``: ``plants.global_power_plants``, ``regulatory.nrc_reactor_status``
+  and ``market.plant_generation`` (monthly, per plant) written straight into a
+  database, typed like the seeded tables.
+- ``parquet``: the same three tables as Hive-partitioned Parquet directories.
+
+Scale 1 is about the size of the real sources; ``--plants``/``--units``/
+``--days``/``--months`` set counts directly (``100M`` plants is fine).
+The database and Parquet targets are written in chunks of ``--chunk-rows``
+by ``--workers`` threads, so memory stays bounded.
+
+The data is skewed like the real fleet: countries follow WRI's shares,
+each country has its own fuel mix (French nuclear, Chinese coal, Brazilian
+hydro...), capacity is log-normal per fuel, reactors go through refuelling
+outages and generation is seasonal per fuel. Everything is computed in
+DuckDB from hashes of (row, seed, column), so the same arguments always
+produce the same data (for a given DuckDB version), with no network access.
+
+Usage:
+    python scripts/synthetic.py --scale 10 --out /tmp/synthetic
+    python scripts/synthetic.py --target duckdb --plants 100M --out /tmp/fleet.duckdb
+    python scripts/synthetic.py --target parquet --scale 1000 --months 60 --out /tmp/fleet
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import duckdb
+
+from schemas import SCHEMAS
+
+# Rows in the real sources: WRI plants, NRC units x 365 days
+REAL_PLANTS = 34_936
+REAL_UNITS = 94
+DAYS = 365
+LAST_DAY = "2024-12-31"
+CHUNK_ROWS = 5_000_000
+
+# (code, name, latitude, longitude, spread in degrees, share of plants), roughly WRI's mix
+COUNTRIES = [
+    ("USA", "United States of America", 39.0, -97.0, 10.0, 28),
+    ("CHN", "China", 33.0, 110.0, 8.0, 12),
+    ("GBR", "United Kingdom", 53.5, -2.0, 2.0, 8),
+    ("BRA", "Brazil", -14.0, -51.0, 8.0, 7),
+    ("FRA", "France", 46.5, 2.5, 2.5, 6),
+    ("IND", "India", 22.0, 79.0, 6.0, 5),
+    ("DEU", "Germany", 51.0, 10.0, 2.0, 4),
+    ("CAN", "Canada", 50.0, -95.0, 8.0, 3),
+    ("ESP", "Spain", 40.0, -3.5, 2.5, 3),
+    ("JPN", "Japan", 36.0, 138.0, 3.0, 3),
+    ("AUS", "Australia", -27.0, 135.0, 8.0, 3),
+    ("RUS", "Russia", 56.0, 60.0, 12.0, 2),
+    ("ITA", "Italy", 42.5, 12.5, 2.5, 2),
+    ("ZAF", "South Africa", -29.0, 25.0, 4.0, 1),
+    ("MEX", "Mexico", 23.0, -102.0, 5.0, 1),
+    ("FJI", "Fiji", -17.7, 178.1, 1.0, 1),
+]
+
+# fuel: (share of plants, median capacity MW, log-normal sigma, capacity factor,
+#        seasonal amplitude, peak month, first commissioning year)
+FUELS = {
+    "Solar": (30, 5, 1.1, 0.18, 0.35, 6, 2005),
+    "Hydro": (20, 30, 1.2, 0.40, 0.25, 5, 1920),
+    "Wind": (15, 50, 0.8, 0.33, 0.20, 1, 1995),
+    "Gas": (11, 200, 0.9, 0.45, 0.15, 7, 1960),
+    "Coal": (7, 600, 0.7, 0.55, 0.10, 1, 1950),
+    "Oil": (7, 50, 1.0, 0.15, 0.10, 7, 1950),
+    "Biomass": (4, 15, 0.9, 0.60, 0.05, 1, 1980),
+    "Waste": (3, 20, 0.8, 0.65, 0.05, 1, 1980),
+    "Nuclear": (1, 1000, 0.4, 0.90, 0.05, 1, 1965),
+    "Geothermal": (1, 40, 0.9, 0.75, 0.02, 1, 1960),
+    "Storage": (1, 20, 1.0, 0.10, 0.10, 7, 2010),
+}
+SHARE, MEDIAN_MW, SIGMA, CAPACITY_FACTOR, AMPLITUDE, PEAK_MONTH, FIRST_YEAR = range(7)
+
+# Country -> multipliers on the global fuel shares (0 = no plants of that fuel)
+FUEL_MIX = {
+    "USA": {"Gas": 1.5, "Solar": 1.2},
+    "CHN": {"Coal": 4, "Hydro": 1.5, "Solar": 0.7},
+    "GBR": {"Wind": 2, "Solar": 1.5, "Coal": 0.3},
+    "BRA": {"Hydro": 4, "Biomass": 3, "Coal": 0.3},
+    "FRA": {"Nuclear": 20, "Hydro": 1.5, "Coal": 0.1},
+    "IND": {"Coal": 3, "Solar": 1.2},
+    "DEU": {"Wind": 2, "Solar": 1.5, "Nuclear": 0.5},
+    "CAN": {"Hydro": 3, "Nuclear": 2, "Solar": 0.5},
+    "ESP": {"Solar": 1.5, "Wind": 1.5},
+    "JPN": {"Solar": 2, "Nuclear": 3},
+    "AUS": {"Solar": 1.5, "Coal": 2, "Nuclear": 0},
+    "RUS": {"Gas": 3, "Nuclear": 3, "Hydro": 2, "Solar": 0.1},
+    "ITA": {"Solar": 2, "Nuclear": 0},
+    "ZAF": {"Coal": 5, "Solar": 0.8},
+    "MEX": {"Gas": 2, "Oil": 2},
+    "FJI": {"Oil": 4, "Hydro": 2, "Nuclear": 0},
+}
+
+
+def uniform(row: str, seed: int, column: int) -> str:
+    """SQL for a deterministic uniform value in [0, 1) per row and column."""
+    # Re-hashed: plain hash(row, seed, column) values of one row are correlated across columns
+    return f"((hash(xor(hash({row}, {seed}), hash({column}))) >> 11)::DOUBLE / 9007199254740992)"
+
+
+def normal(row: str, seed: int, column: int) -> str:
+    """SQL for a deterministic standard normal value (Box-Muller)."""
+    u1, u2 = uniform(row, seed, column), uniform(row, seed, column + 1)
+    return f"(sqrt(-2 * ln(1 - {u1})) * cos(2 * pi() * {u2}))"
+
+
+def pick(values: list[str], weights: list[float], u: str, slots: int = 1000) -> str:
+    """SQL choosing one of ``values`` with probability proportional to ``weights``."""
+    total = sum(weights)
+    table = []
+    for value, weight in zip(values, weights):
+        if weight > 0:
+            table += [value] * max(1, round(slots * weight / total))
+    literal = ", ".join("'" + v.replace("'", "''") + "'" for v in table)
+    return f"[{literal}][1 + floor({u} * {len(table)})::INTEGER]"
+
+
+def fuel_lookup(field: int) -> str:
+    """SQL map literal: fuel -> one field of FUELS."""
+    entries = ", ".join(f"'{fuel}': {spec[field]}" for fuel, spec in FUELS.items())
+    return f"MAP {{{entries}}}"
+
+
+def plants_sql(stop: int, seed: int, start: int = 0, row_number: bool = False) -> str:
+    """SELECT producing WRI-shaped plant rows ``start`` to ``stop`` (source column names).
+
+    ``row_number`` adds the plant's row number ``i``, for deriving more data per plant.
+    """
+    # One draw for the (country, fuel) pair, so each country keeps its own fuel mix
+    pairs, weights = [], []
+    for code, *_, share in COUNTRIES:
+        mix = {fuel: spec[SHARE] * FUEL_MIX.get(code, {}).get(fuel, 1) for fuel, spec in FUELS.items()}
+        total = sum(mix.values())
+        for fuel, weight in mix.items():
+            pairs.append(f"{code}|{fuel}")
+            weights.append(share * weight / total)
+    countries = ", ".join(
+        f"'{code}': {{'name': '{name}', 'lat': {lat}, 'lon': {lon}, 'spread': {spread}}}"
+        for code, name, lat, lon, spread, _ in COUNTRIES
+    )
+    return f"""
+        WITH base AS (
+            SELECT i, {pick(pairs, weights, uniform("i", seed, 1), slots=20_000)} AS pair
+            FROM range({start}, {stop}) t(i)
+        ),
+        located AS (
+            SELECT
+                i,
+                split_part(pair, '|', 1) AS country,
+                split_part(pair, '|', 2) AS primary_fuel,
+                MAP {{{countries}}}[split_part(pair, '|', 1)] AS c
+            FROM base
+        )
+        SELECT
+            country,
+            c.name AS country_long,
+            'Synthetic Plant ' || i AS name,
+            printf('%s%07d', country, i) AS gppd_idnr,
+            round(
+                {fuel_lookup(MEDIAN_MW)}[primary_fuel]
+                * exp({fuel_lookup(SIGMA)}[primary_fuel] * {normal("i", seed, 3)}), 1
+            ) AS capacity_mw,
+            round(greatest(-89.9, least(89.9, c.lat + c.spread * {normal("i", seed, 5)})), 4) AS latitude,
+            round(((c.lon + c.spread * {normal("i", seed, 7)} + 540) % 360) - 180, 4) AS longitude,
+            primary_fuel,
+            NULL AS other_fuel1, NULL AS other_fuel2, NULL AS other_fuel3,
+            {fuel_lookup(FIRST_YEAR)}[primary_fuel]
+                + floor({uniform("i", seed, 9)} * (2021 - {fuel_lookup(FIRST_YEAR)}[primary_fuel])) AS commissioning_year,
+            'Synthetic Owner ' || (i % 997) AS owner,
+            'synthetic' AS source,
+            NULL AS url,
+            'synthetic' AS geolocation_source,
+            NULL AS wepp_id,
+            2019 AS year_of_capacity_data,
+            NULL AS generation_gwh_2013, NULL AS generation_gwh_2014, NULL AS generation_gwh_2015,
+            NULL AS generation_gwh_2016,
+            -- Reported generation mostly exists for US plants, as in WRI
+            CASE WHEN country = 'USA' AND {uniform("i", seed, 10)} < 0.8
+                THEN round(capacity_mw * 8.76 * {fuel_lookup(CAPACITY_FACTOR)}[primary_fuel]
+                           * (0.7 + 0.6 * {uniform("i", seed, 11)}), 3)
+            END AS generation_gwh_2017,
+            NULL AS generation_data_source,
+            NULL AS estimated_generation_gwh_2013, NULL AS estimated_generation_gwh_2014,
+            NULL AS estimated_generation_gwh_2015, NULL AS estimated_generation_gwh_2016,
+            round(capacity_mw * 8.76 * {fuel_lookup(CAPACITY_FACTOR)}[primary_fuel], 2) AS estimated_generation_gwh_2017
+            {", i" if row_number else ""}
+        FROM located
+        ORDER BY i
+    """
+
+
+def plants_table_sql(stop: int, seed: int, start: int = 0) -> str:
+    """Plant rows typed and named like ``plants.global_power_plants``."""
+    schema = SCHEMAS["wri_power_plants"]
+    columns = ", ".join(
+        f"CAST({column} AS {dtype}) AS {schema.rename.get(column, column)}"
+        for column, dtype in schema.columns.items()
+    )
+    return f"SELECT {columns} FROM ({plants_sql(stop, seed, start)})"
+
+
+def reactor_status_sql(stop: int, seed: int, start: int = 0, days: int = DAYS, typed: bool = False) -> str:
+    """SELECT producing NRC-shaped daily status rows for units ``start`` to ``stop``.
+
+    Each unit has an 18-month refuelling cycle with a ~35-day outage at a
+    unit-specific phase, plus occasional derates. ``typed`` returns
+    ``ReportDt`` as a TIMESTAMP instead of NRC's text format.
+    """
+    report_dt = "report_date" if typed else "strftime(report_date, '%m/%d/%Y %I:%M:%S %p')"
+    return f"""
+        WITH units AS (
+            SELECT
+                u,
+                'Synthetic ' || (u // 2 + 1) || ' ' || (u % 2 + 1) AS unit,
+                floor({uniform("u", seed, 20)} * 540)::INTEGER AS phase
+            FROM range({start}, {stop}) t(u)
+        ),
+        days AS (
+            SELECT d, (DATE '{LAST_DAY}' - INTERVAL ({days - 1} - d) DAY)::TIMESTAMP AS report_date
+            FROM range({days}) t(d)
+        )
+        SELECT
+            {report_dt} AS ReportDt,
+            unit AS Unit,
+            CASE
+                WHEN (d + phase) % 540 < 35 THEN 0
+                WHEN {uniform("u * 100000 + d", seed, 21)} < 0.03
+                    THEN 30 + floor({uniform("u * 100000 + d", seed, 22)} * 70)::INTEGER
+                ELSE 100
+            END AS Power
+        FROM days, units
+        ORDER BY d, u
+    """
+
+
+def generation_sql(stop: int, seed: int, start: int = 0, months: int = 12) -> str:
+    """Monthly net generation for plants ``start`` to ``stop``, ending at LAST_DAY's month.
+
+    Capacity factor varies by fuel and season, with per-plant and per-month noise.
+    """
+    return f"""
+        WITH plants AS (
+            SELECT i, gppd_idnr AS plant_id, primary_fuel, capacity_mw
+            FROM ({plants_sql(stop, seed, start, row_number=True)})
+        ),
+        months AS (
+            SELECT m, (date_trunc('month', DATE '{LAST_DAY}') - INTERVAL ({months - 1} - m) MONTH)::DATE AS month
+            FROM range({months}) t(m)
+        ),
+        factors AS (
+            SELECT
+                plant_id,
+                month,
+                capacity_mw,
+                greatest(0, least(1,
+                    {fuel_lookup(CAPACITY_FACTOR)}[primary_fuel]
+                    * (1 + {fuel_lookup(AMPLITUDE)}[primary_fuel]
+                           * cos(2 * pi() * (month(month) - {fuel_lookup(PEAK_MONTH)}[primary_fuel]) / 12))
+                    * (0.8 + 0.4 * {uniform("i", seed, 30)})
+                    * (0.9 + 0.2 * {uniform("i * 10000 + m", seed, 31)})
+                )) AS capacity_factor
+            FROM plants, months
+        )
+        SELECT
+            plant_id,
+            month,
+            round(capacity_mw * capacity_factor * 24 * day(last_day(month)), 1) AS net_generation_mwh,
+            round(capacity_factor, 4) AS capacity_factor
+        FROM factors
+        ORDER BY month, plant_id
+    """
+
+
+def generate_sources(directory: Path, scale: float = 1, seed: int = 0) -> dict[str, int]:
+    """Write synthetic WRI and NRC source files into ``directory``; returns rows per file."""
+    directory.mkdir(parents=True, exist_ok=True)
+    plants = max(1, round(REAL_PLANTS * scale))
+    units = max(1, round(REAL_UNITS * scale))
+    con = duckdb.connect()
+    con.execute(f"COPY ({plants_sql(plants, seed)}) TO '{directory / 'wri_power_plants.csv'}' (HEADER)")
+    con.execute(f"""
+        COPY ({reactor_status_sql(units, seed)})
+        TO '{directory / 'nrc_reactor_status.txt'}' (HEADER, DELIMITER '|')
+    """)
+    con.close()
+    return {"wri_power_plants.csv": plants, "nrc_reactor_status.txt": units * DAYS}
+
+
+# =============================================================================
+# Fleet scale: chunked, parallel writes to DuckDB or Parquet
+# =============================================================================
+
+def fleet_tables(plants: int, units: int, days: int, months: int, seed: int, chunk_rows: int) -> list[dict]:
+    """Each table as a list of chunk queries, sized to about ``chunk_rows`` rows."""
+    def chunks(count, rows_per_item, make_sql):
+        step = max(1, chunk_rows // rows_per_item)
+        return [make_sql(min(start + step, count), start) for start in range(0, count, step)]
+
+    tables = [
+        {
+            "table": "plants.global_power_plants",
+            "rows": plants,
+            "partition_by": "country",
+            "chunks": chunks(plants, 1, lambda stop, start: plants_table_sql(stop, seed, start)),
+        },
+        {
+            "table": "regulatory.nrc_reactor_status",
+            "rows": units * days,
+            "partition_by": "year",
+            "chunks": chunks(units, days, lambda stop, start: reactor_status_sql(stop, seed, start, days, typed=True)),
+        },
+    ]
+    if months:
+        tables.append({
+            "table": "market.plant_generation",
+            "rows": plants * months,
+            "partition_by": "year",
+            "chunks": chunks(plants, months, lambda stop, start: generation_sql(stop, seed, start, months)),
+        })
+    return tables
+
+
+def write_duckdb(path: Path, tables: list[dict], workers: int):
+    """Create each table from its first chunk, then append the rest in parallel."""
+    con = duckdb.connect(str(path))
+    # Chunks arrive in any order anyway; this lets inserts stream without buffering
+    con.execute("SET preserve_insertion_order = false")
+    for spec in tables:
+        schema, _ = spec["table"].split(".")
+        con.execute(f"CREATE SCHEMA IF NOT EXISTS {schema}")
+        first, *rest = spec["chunks"]
+        con.execute(f"CREATE OR REPLACE TABLE {spec['table']} AS {first}")
+
+        def insert(sql, table=spec["table"]):
+            cursor = con.cursor()
+            try:
+                cursor.execute(f"INSERT INTO {table} {sql}")
+            finally:
+                cursor.close()
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(insert, rest))
+    con.close()
+
+
+def write_parquet(directory: Path, tables: list[dict], workers: int):
+    """Write each table as a Hive-partitioned directory, one file per chunk and partition."""
+    con = duckdb.connect()
+
+    def copy(job):
+        target, partition_by, number, sql = job
+        # Year partitions need a column to partition on
+        if partition_by == "year":
+            column = "ReportDt" if target.name == "nrc_reactor_status" else "month"
+            sql = f"SELECT *, year({column}) AS year FROM ({sql})"
+        cursor = con.cursor()
+        try:
+            cursor.execute(f"""
+                COPY ({sql}) TO '{target}' (
+                    FORMAT PARQUET, COMPRESSION zstd, PARTITION_BY ({partition_by}),
+                    FILENAME_PATTERN 'chunk{number:05d}_{{i}}', OVERWRITE_OR_IGNORE
+                )
+            """)
+        finally:
+            cursor.close()
+
+    jobs = [
+        (directory / spec["table"].split(".")[1], spec["partition_by"], number, sql)
+        for spec in tables
+        for number, sql in enumerate(spec["chunks"])
+    ]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(copy, jobs))
+    con.close()
+
+
+def count(value: str) -> int:
+    """Parse a row count such as ``35000``, ``250k``, ``10M`` or ``1.5B``."""
+    multipliers = {"k": 1_000, "m": 1_000_000, "b": 1_000_000_000}
+    value = value.strip().replace("_", "").lower()
+    if value and value[-1] in multipliers:
+        return int(float(value[:-1]) * multipliers[value[-1]])
+    return int(value)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic power plant data")
+    parser.add_argument("--target", choices=["csv", "duckdb", "parquet"], default="csv",
+                        help="Source files, a DuckDB database, or Parquet directories")
+    parser.add_argument("--out", type=Path, required=True,
+                        help="Directory (csv, parquet) or database file (duckdb)")
+    parser.add_argument("--scale", type=float, default=1, help="Multiple of the real row counts")
+    parser.add_argument("--plants", type=count, help="Plants (default: scale x 34,936)")
+    parser.add_argument("--units", type=count, help="Reactor units (default: scale x 94)")
+    parser.add_argument("--days", type=int, default=DAYS, help="Days of reactor status per unit")
+    parser.add_argument("--months", type=int, default=12, help="Months of generation per plant (0 = none)")
+    parser.add_argument("--seed", type=int, default=0, help="Different seeds give different data")
+    parser.add_argument("--chunk-rows", type=count, default=CHUNK_ROWS, help="Rows per chunk written")
+    parser.add_argument("--workers", type=int, default=4, help="Chunks written concurrently")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.target == "csv":
+        rows = generate_sources(args.out, args.scale, args.seed)
+        for name, rows_written in rows.items():
+            print(f"  {args.out / name}: {rows_written:,} rows")
+    else:
+        plants = args.plants or max(1, round(REAL_PLANTS * args.scale))
+        units = args.units or max(1, round(REAL_UNITS * args.scale))
+        tables = fleet_tables(plants, units, args.days, args.months, args.seed, args.chunk_rows)
+        for spec in tables:
+            print(f"  {spec['table']}: {spec['rows']:,} rows in {len(spec['chunks'])} chunks")
+        if args.target == "duckdb":
+            args.out.parent.mkdir(parents=True, exist_ok=True)
+            write_duckdb(args.out, tables, args.workers)
+        else:
+            args.out.mkdir(parents=True, exist_ok=True)
+            write_parquet(args.out, tables, args.workers)
+    print(f"Generated in {time.perf_counter() - start:.1f}s -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
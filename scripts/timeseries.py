@@ -0,0 +1,158 @@
+"""
+Append-only history of NRC daily reactor power, with downsamples.
+
+The NRC file only covers the last 365 days, so ``regulatory.nrc_reactor_status``
+(replaced on every full load) can't answer multi-year questions. Every load
+is merged into ``regulatory.reactor_power_history`` instead:
+
+- rows are keyed on (report_date, unit); a date/unit already present is left
+  alone unless NRC revised its power level, so re-merging a file is a no-op
+- the table is never truncated, and new days are appended with an explicit
+  ``ORDER BY report_date, unit``, so its min/max zone maps on ``report_date``
+  act as date partitions for range queries. ``ORDER BY`` holds even with
+  ``preserve_insertion_order`` off (``seed_data.py --memory-limit``); a merge
+  that adds days older than the newest one stored rewrites the table in date
+  order instead of appending out of order
+
+Downsamples (``regulatory.reactor_power_daily|weekly|monthly``) hold, per
+period and unit, the average capacity factor (power / 100), min/max power and
+outage days. Rows with ``unit`` NULL are the fleet total for the period. After
+a merge only the periods containing changed rows are recomputed.
+"""
+
+from datetime import date
+
+import duckdb
+
+HISTORY = "regulatory.reactor_power_history"
+HISTORY_COLUMNS = """
+    report_date DATE NOT NULL,
+    unit VARCHAR NOT NULL,
+    power_pct SMALLINT,
+    loaded_at TIMESTAMP
+"""
+# Downsample table -> date_trunc part
+GRAINS = {
+    "regulatory.reactor_power_daily": "day",
+    "regulatory.reactor_power_weekly": "week",
+    "regulatory.reactor_power_monthly": "month",
+}
+
+
+def ensure_history(con: duckdb.DuckDBPyConnection):
+    con.execute("CREATE SCHEMA IF NOT EXISTS regulatory")
+    con.execute(f"CREATE TABLE IF NOT EXISTS {HISTORY} ({HISTORY_COLUMNS})")
+
+
+def merge_history(con: duckdb.DuckDBPyConnection, source: str) -> tuple[int, int]:
+    """Merge a (ReportDt, Unit, Power) table into the history: (inserted, revised).
+
+    Dates and units touched are left in the temp table ``history_touched`` for
+    :func:`refresh_downsamples`.
+    """
+    ensure_history(con)
+    con.execute("BEGIN TRANSACTION")
+    try:
+        con.execute(f"""
+            CREATE OR REPLACE TEMP TABLE history_incoming AS
+            SELECT DISTINCT ON (ReportDt::DATE, Unit)
+                ReportDt::DATE AS report_date, Unit AS unit, Power::SMALLINT AS power_pct
+            FROM {source}
+            WHERE ReportDt IS NOT NULL AND Unit IS NOT NULL
+            ORDER BY ReportDt::DATE, Unit
+        """)
+        first, last = con.execute("SELECT MIN(report_date), MAX(report_date) FROM history_incoming").fetchone()
+        newest = con.execute(f"SELECT MAX(report_date) FROM {HISTORY}").fetchone()[0]
+        if first is None:  # empty file
+            first = last = date.min
+        # Only the history rows inside the incoming date range are read
+        con.execute(f"""
+            CREATE OR REPLACE TEMP TABLE history_touched AS
+            SELECT i.report_date, i.unit, i.power_pct, h.report_date IS NULL AS is_new
+            FROM history_incoming i
+            LEFT JOIN (
+                SELECT * FROM {HISTORY}
+                WHERE report_date BETWEEN DATE '{first}' AND DATE '{last}'
+            ) h USING (report_date, unit)
+            WHERE h.report_date IS NULL OR h.power_pct IS DISTINCT FROM i.power_pct
+        """)
+        con.execute(f"""
+            UPDATE {HISTORY} h
+            SET power_pct = t.power_pct, loaded_at = current_timestamp::TIMESTAMP
+            FROM history_touched t
+            WHERE NOT t.is_new AND h.report_date = t.report_date AND h.unit = t.unit
+        """)
+        con.execute(f"""
+            INSERT INTO {HISTORY}
+            SELECT report_date, unit, power_pct, current_timestamp::TIMESTAMP
+            FROM history_touched
+            WHERE is_new
+            ORDER BY report_date, unit
+        """)
+        inserted, revised, backfilled = con.execute(
+            "SELECT COUNT(*) FILTER (is_new), COUNT(*) FILTER (NOT is_new), COUNT(*) FILTER (is_new AND report_date < ?)"
+            " FROM history_touched",
+            [newest],
+        ).fetchone()
+        if backfilled:
+            cluster_history(con)
+        con.execute("DROP TABLE history_incoming")
+        con.execute("COMMIT")
+    except Exception:
+        con.execute("ROLLBACK")
+        raise
+    return inserted, revised
+
+
+def cluster_history(con: duckdb.DuckDBPyConnection):
+    """Rebuild the history in (report_date, unit) order.
+
+    The rows go into a fresh table: deleting and re-inserting in place would
+    reuse row groups whose zone maps still span the old dates.
+    """
+    sorted_table = f"{HISTORY}_sorted"
+    con.execute(f"CREATE OR REPLACE TABLE {sorted_table} ({HISTORY_COLUMNS})")
+    con.execute(f"INSERT INTO {sorted_table} SELECT * FROM {HISTORY} ORDER BY report_date, unit")
+    con.execute(f"DROP TABLE {HISTORY}")
+    con.execute(f"ALTER TABLE {sorted_table} RENAME TO {HISTORY.split('.')[1]}")
+
+
+def _downsample(part: str, where: str = "") -> str:
+    return f"""
+        SELECT
+            date_trunc('{part}', report_date)::DATE AS period_start,
+            unit,
+            COUNT(*) AS days_reported,
+            ROUND(AVG(power_pct) / 100, 4) AS capacity_factor,
+            MIN(power_pct) AS min_power_pct,
+            MAX(power_pct) AS max_power_pct,
+            COUNT(*) FILTER (power_pct = 0) AS outage_days
+        FROM {HISTORY}
+        {where}
+        GROUP BY GROUPING SETS ((period_start, unit), (period_start))
+    """
+
+
+def refresh_downsamples(con: duckdb.DuckDBPyConnection, full: bool = False):
+    """Recompute the periods touched by the last merge, or everything if ``full``."""
+    for table, part in GRAINS.items():
+        exists = con.execute(
+            "SELECT COUNT(*) FROM duckdb_tables() WHERE schema_name || '.' || table_name = ?", [table]
+        ).fetchone()[0]
+        if full or not exists:
+            con.execute(f"CREATE OR REPLACE TABLE {table} AS {_downsample(part)} ORDER BY period_start, unit")
+            continue
+        first = con.execute(f"SELECT MIN(date_trunc('{part}', report_date))::DATE FROM history_touched").fetchone()[0]
+        if first is None:
+            continue
+        periods = f"(SELECT DISTINCT date_trunc('{part}', report_date)::DATE FROM history_touched)"
+        # The literal lower bound lets the history scan skip older row groups
+        where = f"WHERE report_date >= DATE '{first}' AND date_trunc('{part}', report_date)::DATE IN {periods}"
+        con.execute("BEGIN TRANSACTION")
+        try:
+            con.execute(f"DELETE FROM {table} WHERE period_start IN {periods}")
+            con.execute(f"INSERT INTO {table} {_downsample(part, where)} ORDER BY period_start, unit")
+            con.execute("COMMIT")
+        except Exception:
+            con.execute("ROLLBACK")
+            raise
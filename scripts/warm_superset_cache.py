@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Warm Superset's chart data cache for a dashboard after a seed run.
+
+Logs in through the REST API, lists the dashboard's charts and asks Superset
+to recompute each one (``PUT /api/v1/chart/warm_up_cache``). The recomputed
+results overwrite whatever is in DATA_CACHE_CONFIG, so the first viewer
+after a reseed gets fresh data from the cache instead of waiting on DuckDB.
+
+With ``--measure`` it also times a dashboard render (every chart's data
+request, in parallel as the browser would) cold (``force=true``, cache
+bypassed) and warm (served from the cache). With GLOBAL_ASYNC_QUERIES a
+cache miss is answered with a job instead of data; the job is polled until
+its result can be fetched, so a cold render includes the query.
+
+Usage:
+    python scripts/warm_superset_cache.py [--dashboard power-plants] [--measure]
+"""
+
+import argparse
+import http.cookiejar
+import json
+import os
+import sys
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+SUPERSET_URL = os.getenv("SUPERSET_URL", "http://localhost:8088")
+SUPERSET_USERNAME = os.getenv("SUPERSET_USERNAME", "admin")
+SUPERSET_PASSWORD = os.getenv("SUPERSET_ADMIN_PASSWORD", "admin")
+ASYNC_POLL_SECONDS = 0.2
+
+
+class SupersetClient:
+    """Minimal Superset REST client: JWT login plus CSRF token for writes."""
+
+    def __init__(self, base_url: str, timeout: float = 120):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar())
+        )
+        self.headers = {"Content-Type": "application/json", "Accept": "application/json"}
+
+    def request(self, method: str, path: str, body: dict | None = None) -> dict:
+        data = json.dumps(body).encode() if body is not None else None
+        req = urllib.request.Request(self.base_url + path, data=data, method=method, headers=self.headers)
+        with self.opener.open(req, timeout=self.timeout) as resp:
+            return json.loads(resp.read() or b"{}")
+
+    def login(self, username: str, password: str):
+        token = self.request("POST", "/api/v1/security/login", {
+            "username": username, "password": password, "provider": "db", "refresh": False,
+        })["access_token"]
+        self.headers["Authorization"] = f"Bearer {token}"
+        self.headers["X-CSRFToken"] = self.request("GET", "/api/v1/security/csrf_token/")["result"]
+
+    def dashboard_charts(self, dashboard: str) -> tuple[int, list[dict]]:
+        dashboard_id = self.request("GET", f"/api/v1/dashboard/{dashboard}")["result"]["id"]
+        charts = self.request("GET", f"/api/v1/dashboard/{dashboard}/charts")["result"]
+        return dashboard_id, charts
+
+    def warm_up(self, chart_id: int, dashboard_id: int) -> dict:
+        try:
+            result = self.request("PUT", "/api/v1/chart/warm_up_cache", {
+                "chart_id": chart_id, "dashboard_id": dashboard_id,
+            })["result"]
+            return result[0] if result else {}
+        except urllib.error.HTTPError as e:
+            if e.code not in (404, 405):
+                raise
+        # Superset < 3.0 only has the legacy endpoint
+        return self.request("GET", f"/superset/warm_up_cache/?slice_id={chart_id}&dashboard_id={dashboard_id}")
+
+    def wait_for_job(self, job: dict) -> dict:
+        """Poll the async event stream until ``job`` finishes, then fetch its result."""
+        deadline = time.monotonic() + self.timeout
+        last_id = None
+        while time.monotonic() < deadline:
+            query = f"?last_id={last_id}" if last_id else ""
+            for event in self.request("GET", f"/api/v1/async_event/{query}").get("result", []):
+                last_id = event["id"]
+                if event.get("job_id") != job["job_id"]:
+                    continue
+                if event["status"] == "done":
+                    return self.request("GET", event["result_url"])
+                if event["status"] == "error":
+                    raise RuntimeError(f"async job {job['job_id']} failed: {event.get('errors')}")
+            time.sleep(ASYNC_POLL_SECONDS)
+        raise TimeoutError(f"async job {job['job_id']} did not finish in {self.timeout:.0f}s")
+
+    def chart_data(self, chart_id: int, force: bool) -> bool:
+        """Fetch one chart's data; returns True if it was served from the cache."""
+        response = self.request("GET", f"/api/v1/chart/{chart_id}/data/?force={str(force).lower()}")
+        if "result" not in response and "job_id" in response:
+            # Async query (202): computed by a worker, so not from the cache
+            self.wait_for_job(response)
+            return False
+        results = response.get("result") or []
+        return bool(results) and all(r.get("is_cached") for r in results)
+
+
+def render(client: SupersetClient, chart_ids: list[int], force: bool) -> tuple[float, int]:
+    """Load all charts concurrently like a dashboard does: (seconds, charts served from cache)."""
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(chart_ids) or 1) as pool:
+        cached = list(pool.map(lambda cid: client.chart_data(cid, force), chart_ids))
+    return time.perf_counter() - start, sum(cached)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Warm Superset's cache for a dashboard")
+    parser.add_argument("--dashboard", default="power-plants", help="Dashboard slug or id")
+    parser.add_argument("--url", default=SUPERSET_URL, help="Superset base URL")
+    parser.add_argument("--measure", action="store_true", help="Time cold vs. warm dashboard renders")
+    parser.add_argument("--rounds", type=int, default=3, help="Render repetitions for --measure")
+    args = parser.parse_args()
+
+    client = SupersetClient(args.url)
+    try:
+        client.login(SUPERSET_USERNAME, SUPERSET_PASSWORD)
+    except (urllib.error.URLError, OSError) as e:
+        # Superset isn't running - not an error for a seed run
+        print(f"Superset not reachable at {args.url} ({e}), skipping cache warm-up")
+        return
+
+    dashboard_id, charts = client.dashboard_charts(args.dashboard)
+    print(f"Warming {len(charts)} charts on dashboard '{args.dashboard}'...")
+    start = time.perf_counter()
+    failed = 0
+    for chart in charts:
+        chart_start = time.perf_counter()
+        try:
+            result = client.warm_up(chart["id"], dashboard_id)
+            error = result.get("viz_error")
+        except urllib.error.HTTPError as e:
+            error = f"HTTP {e.code}"
+        failed += bool(error)
+        status = f"FAILED: {error}" if error else "ok"
+        print(f"  {chart['slice_name']:<40} {time.perf_counter() - chart_start:>7.2f}s  {status}")
+    print(f"Warmed {len(charts) - failed}/{len(charts)} charts in {time.perf_counter() - start:.2f}s")
+
+    if args.measure:
+        chart_ids = [c["id"] for c in charts]
+        print(f"\n{'render':<8} {'seconds':>8} {'cached':>8}")
+        for label, force in (("cold", True), ("warm", False)):
+            times = []
+            for _ in range(args.rounds):
+                seconds, cached = render(client, chart_ids, force)
+                times.append(seconds)
+            print(f"{label:<8} {min(times):>8.3f} {cached:>5}/{len(chart_ids)}")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
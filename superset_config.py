@@ -81,6 +81,133 @@ OVERRIDE_HTTP_HEADERS = {
 # Allow file-based databases (DuckDB, SQLite)
 PREVENT_UNSAFE_DB_CONNECTIONS = False
 
+# =============================================================================
+# Caching
+# =============================================================================
+
+# "filesystem" (default, under superset_home), "redis" (any Redis-compatible
+# server at SUPERSET_CACHE_REDIS_URL) or "null" to disable caching
+CACHE_BACKEND = os.environ.get('SUPERSET_CACHE_BACKEND', 'filesystem')
+CACHE_REDIS_URL = os.environ.get('SUPERSET_CACHE_REDIS_URL', 'redis://redis:6379/0')
+CACHE_DIR = os.environ.get('SUPERSET_CACHE_DIR', '/app/superset_home/cache')
+
+# Default timeouts in seconds. Chart data can live for a day: the seed
+# run re-warms the power-plants dashboard with force=true after every load,
+# and datasets can set a shorter cache_timeout (see setup_superset.py).
+DATA_CACHE_TIMEOUT = int(os.environ.get('SUPERSET_DATA_CACHE_TIMEOUT', 86400))
+METADATA_CACHE_TIMEOUT = int(os.environ.get('SUPERSET_METADATA_CACHE_TIMEOUT', 86400))
+STATE_CACHE_TIMEOUT = int(os.environ.get('SUPERSET_STATE_CACHE_TIMEOUT', 7 * 86400))
+
+
+def cache_config(prefix, timeout):
+    """Flask-Caching config for one Superset cache on the selected backend."""
+    config = {"CACHE_DEFAULT_TIMEOUT": timeout, "CACHE_KEY_PREFIX": f"fissio_{prefix}_"}
+    if CACHE_BACKEND == "redis":
+        config.update({"CACHE_TYPE": "RedisCache", "CACHE_REDIS_URL": CACHE_REDIS_URL})
+    elif CACHE_BACKEND == "filesystem":
+        config.update({
+            "CACHE_TYPE": "FileSystemCache",
+            "CACHE_DIR": os.path.join(CACHE_DIR, prefix),
+            "CACHE_THRESHOLD": 10000,  # files per cache before the oldest are pruned
+        })
+    else:
+        config.update({"CACHE_TYPE": "NullCache"})
+    return config
+
+
+# Per-dataset chart data timeouts, applied as SqlaTable.cache_timeout by
+# setup_superset.py. Reactor status changes daily; the plant tables only on reseed.
+DATASET_CACHE_TIMEOUTS = {
+    "plants.global_power_plants": DATA_CACHE_TIMEOUT,
+    "plants.us_nuclear_plants": DATA_CACHE_TIMEOUT,
+    "plants.us_plants_summary": DATA_CACHE_TIMEOUT,
+    "regulatory.nrc_reactor_status": 3600,
+}
+
+# Dataset/database metadata, dashboard thumbnails etc.
+CACHE_CONFIG = cache_config("metadata", METADATA_CACHE_TIMEOUT)
+# Chart query results - what dashboards actually read on every load
+DATA_CACHE_CONFIG = cache_config("data", DATA_CACHE_TIMEOUT)
+# Native filter and explore state (must outlive sessions, or shared links break)
+FILTER_STATE_CACHE_CONFIG = cache_config("filter_state", STATE_CACHE_TIMEOUT)
+EXPLORE_FORM_DATA_CACHE_CONFIG = cache_config("explore_form_data", STATE_CACHE_TIMEOUT)
+
+# =============================================================================
+# Async Query Execution (Celery)
+# =============================================================================
+
+# SQL Lab queries on databases with allow_run_async (Fissio DuckDB) and, with
+# GLOBAL_ASYNC_QUERIES, dashboard chart queries run on Celery workers instead
+# of gunicorn threads. The two kinds go to separate queues/workers so a heavy
+# analyst query can't hold up dashboard rendering.
+REDIS_URL = os.environ.get('SUPERSET_REDIS_URL', 'redis://redis:6379')
+SQLLAB_QUEUE = "sql_lab"
+CHARTS_QUEUE = "async_charts"
+
+
+class CeleryConfig:
+    broker_url = f"{REDIS_URL}/1"
+    result_backend = f"{REDIS_URL}/1"
+    imports = ("superset.sql_lab", "superset.tasks.async_queries", "superset.tasks.cache")
+    task_routes = {
+        "sql_lab.get_sql_results": {"queue": SQLLAB_QUEUE},
+        "load_chart_data_into_cache": {"queue": CHARTS_QUEUE},
+        "load_explore_json_into_cache": {"queue": CHARTS_QUEUE},
+    }
+    task_default_queue = CHARTS_QUEUE
+    # Long queries shouldn't make a worker reserve tasks it can't start
+    worker_prefetch_multiplier = 1
+    task_acks_late = True
+    task_annotations = {"sql_lab.get_sql_results": {"rate_limit": "100/s"}}
+
+
+CELERY_CONFIG = CeleryConfig
+
+# Where finished SQL Lab result sets are stored for the browser to fetch
+if CACHE_BACKEND == "redis":
+    from cachelib.redis import RedisCache
+    RESULTS_BACKEND = RedisCache.from_url(f"{REDIS_URL}/2", key_prefix="fissio_results_")
+else:
+    from cachelib.file import FileSystemCache
+    RESULTS_BACKEND = FileSystemCache(os.path.join(CACHE_DIR, "sqllab_results"), threshold=500)
+RESULTS_BACKEND_USE_MSGPACK = True
+
+# Async SQL Lab queries may run far longer than a web request
+SQLLAB_ASYNC_TIME_LIMIT_SEC = int(os.environ.get('SUPERSET_SQLLAB_ASYNC_TIME_LIMIT', 3600))
+# Synchronous queries (databases without allow_run_async) keep the web timeout
+SQLLAB_TIMEOUT = 300
+
+# Dashboard charts load asynchronously: the web request only enqueues the
+# query, the browser polls for completion and reads the result from
+# DATA_CACHE_CONFIG (so this needs a real cache backend).
+GLOBAL_ASYNC_QUERIES = (
+    os.environ.get('SUPERSET_GLOBAL_ASYNC_QUERIES', 'true').lower() == 'true' and CACHE_BACKEND != "null"
+)
+FEATURE_FLAGS["GLOBAL_ASYNC_QUERIES"] = GLOBAL_ASYNC_QUERIES
+GLOBAL_ASYNC_QUERIES_TRANSPORT = "polling"
+GLOBAL_ASYNC_QUERIES_POLLING_DELAY = 500  # ms
+GLOBAL_ASYNC_QUERIES_JWT_SECRET = os.environ.get(
+    'SUPERSET_ASYNC_JWT_SECRET', 'fissio_async_queries_jwt_secret_change_me_32b'
+)
+GLOBAL_ASYNC_QUERIES_JWT_COOKIE_SECURE = False
+GLOBAL_ASYNC_QUERIES_REDIS_STREAM_PREFIX = "fissio-async-events-"
+# Superset < 4.1 reads the Redis connection from here...
+_redis_host, _, _redis_port = REDIS_URL.removeprefix("redis://").partition(":")
+GLOBAL_ASYNC_QUERIES_REDIS_CONFIG = {
+    "host": _redis_host,
+    "port": int(_redis_port or 6379),
+    "db": 3,
+    "password": "",
+    "ssl": False,
+}
+# ...newer releases from a cache-style config
+GLOBAL_ASYNC_QUERIES_CACHE_BACKEND = {
+    "CACHE_TYPE": "RedisCache",
+    "CACHE_REDIS_HOST": _redis_host,
+    "CACHE_REDIS_PORT": int(_redis_port or 6379),
+    "CACHE_REDIS_DB": 3,
+}
+
 # =============================================================================
 # Misc Settings
 # =============================================================================